@@ -3,22 +3,19 @@ Fundamental Analysis Agent
 Responsible for deep fundamental analysis of stocks
 """
 
-from crewai import Agent, LLM
+from crewai import Agent
 
-from config import settings
+from agents.llm import create_llm
 from tools.analysis import get_fundamental_metrics
 from tools.market_data import get_stock_info
 from tools.institutional import get_promoter_holdings, get_mutual_fund_holdings
+from tools.compact import agent_tools
 
 
 def create_fundamental_analyst_agent() -> Agent:
     """Create the Fundamental Analyst Agent."""
     
-    llm = LLM(
-        model=settings.llm_model,
-        api_key=settings.mistral_api_key,
-        temperature=0.4,
-    )
+    llm = create_llm(temperature=0.4)
     
     return Agent(
         role="Fundamental Research Analyst",
@@ -46,12 +43,12 @@ def create_fundamental_analyst_agent() -> Agent:
 
         You provide ratings: Strong Buy, Buy, Hold, Sell, Strong Sell based on
         the fundamental data available from your tools.""",
-        tools=[
+        tools=agent_tools(
             get_fundamental_metrics,
             get_stock_info,
             get_promoter_holdings,
             get_mutual_fund_holdings,
-        ],
+        ),
         llm=llm,
         verbose=True,
         allow_delegation=False,
@@ -0,0 +1,168 @@
+"""
+Agent LLM
+Builds the Mistral LLM used by every agent, with a persistent prompt-level
+response cache under data/cache/llm so identical prompts (re-run analyses,
+market-wide summaries) are answered without another API call.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import litellm
+from crewai import LLM
+from litellm.caching.base_cache import BaseCache
+from litellm.caching.caching import CacheMode
+
+from config import settings
+
+# Fetch times embedded in prompts (tool outputs, prefetched data) do not
+# change the answer, so they are masked before hashing
+_TIMESTAMP_RE = re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", _TIMESTAMP_RE.sub("<ts>", text)).strip()
+
+
+def response_cache_key(model: str, messages: list, temperature: Any = None, tools: Optional[list] = None) -> str:
+    """Hash of the normalized messages, model, temperature and tool names."""
+    payload = {
+        "model": model,
+        "temperature": temperature,
+        "tools": sorted(
+            str(tool.get("function", {}).get("name", tool)) if isinstance(tool, dict) else str(tool)
+            for tool in tools or []
+        ),
+        "messages": [
+            [message.get("role"), _normalize(str(message.get("content", "")))]
+            if isinstance(message, dict) else _normalize(str(message))
+            for message in messages
+        ],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+class DiskResponseCache(BaseCache):
+    """litellm cache backend storing one JSON file per response.
+
+    Entries expire after `ttl` seconds; beyond `max_entries` the least
+    recently written files are removed.
+    """
+
+    def __init__(self, directory: Path, ttl: float, max_entries: int):
+        super().__init__(default_ttl=int(ttl))
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get_cache(self, key, **kwargs):
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry["stored_at"] > self.ttl:
+            path.unlink(missing_ok=True)
+            return None
+        return entry["value"]
+
+    def set_cache(self, key, value, **kwargs):
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            try:
+                tmp_path.write_text(json.dumps({"stored_at": time.time(), "value": value}, default=str))
+                os.replace(tmp_path, path)
+            except Exception:
+                tmp_path.unlink(missing_ok=True)
+                return
+            self._prune()
+
+    def _prune(self) -> None:
+        files = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for path in files[: max(len(files) - self.max_entries, 0)]:
+            path.unlink(missing_ok=True)
+
+    async def async_get_cache(self, key, **kwargs):
+        return self.get_cache(key, **kwargs)
+
+    async def async_set_cache(self, key, value, **kwargs):
+        self.set_cache(key, value, **kwargs)
+
+    async def async_set_cache_pipeline(self, cache_list, **kwargs):
+        for key, value in cache_list:
+            self.set_cache(key, value, **kwargs)
+
+    async def batch_cache_write(self, key, value, **kwargs):
+        self.set_cache(key, value, **kwargs)
+
+    async def disconnect(self):
+        pass
+
+    def clear(self) -> None:
+        """Delete every stored response."""
+        with self._lock:
+            for path in self.directory.glob("*.json"):
+                path.unlink(missing_ok=True)
+
+
+class ResponseCache(litellm.Cache):
+    """Opt-in litellm cache keyed by `response_cache_key`.
+
+    Only calls passing cache={"use-cache": True} (the agents' LLMs) are
+    cached; other litellm users in the process are unaffected.
+    """
+
+    def __init__(self, backend: DiskResponseCache):
+        super().__init__(type="local", mode=CacheMode.default_off)
+        self.cache = backend
+
+    def get_cache_key(self, **kwargs) -> str:
+        return response_cache_key(
+            kwargs.get("model", ""),
+            kwargs.get("messages") or [],
+            kwargs.get("temperature"),
+            kwargs.get("tools"),
+        )
+
+
+_setup_lock = threading.Lock()
+
+
+def enable_response_cache() -> ResponseCache:
+    """Install the shared response cache as `litellm.cache` (once)."""
+    with _setup_lock:
+        if not isinstance(litellm.cache, ResponseCache):
+            litellm.cache = ResponseCache(DiskResponseCache(
+                settings.cache_dir / "llm",
+                ttl=settings.llm_cache_ttl_minutes * 60,
+                max_entries=settings.llm_cache_max_entries,
+            ))
+        return litellm.cache
+
+
+def create_llm(temperature: float) -> LLM:
+    """The agents' LLM, answering repeated prompts from the response cache
+    unless LLM_CACHE_ENABLED is off."""
+    params = {}
+    if settings.llm_cache_enabled:
+        enable_response_cache()
+        params["cache"] = {"use-cache": True}
+    return LLM(
+        model=settings.llm_model,
+        api_key=settings.mistral_api_key,
+        temperature=temperature,
+        **params,
+    )
@@ -3,26 +3,24 @@ Market Data Collection Agent
 Responsible for gathering real-time and historical market data
 """
 
-from crewai import Agent, LLM
+from crewai import Agent
 
-from config import settings
+from agents.llm import create_llm
 from tools.market_data import (
     get_stock_price,
     get_stock_info,
     get_historical_data,
     get_index_data,
     get_nse_stock_quote,
+    get_batch_quotes,
 )
+from tools.compact import agent_tools
 
 
 def create_market_data_agent() -> Agent:
     """Create the Market Data Collection Agent."""
     
-    llm = LLM(
-        model=settings.llm_model,
-        api_key=settings.mistral_api_key,
-        temperature=0.3,  # Lower temperature for factual data
-    )
+    llm = create_llm(temperature=0.3)  # Lower temperature for factual data
     
     return Agent(
         role="Market Data Analyst",
@@ -36,6 +34,7 @@ def create_market_data_agent() -> Agent:
         - Historical OHLCV data with returns and volatility statistics
         - Major index levels (NIFTY50, SENSEX, BANKNIFTY, NIFTYIT)
         - NSE-specific data including delivery percentages (when available)
+        - Batch quotes for NIFTY50 or a whole sector in one request
 
         You are meticulous about data accuracy. When a tool returns "N/A"
         or an error, report it as unavailable rather than guessing.
@@ -45,13 +44,14 @@ def create_market_data_agent() -> Agent:
 
         Your role is foundational - other analysts depend on the accuracy
         of your data to make their assessments.""",
-        tools=[
+        tools=agent_tools(
             get_stock_price,
             get_stock_info,
             get_historical_data,
             get_index_data,
             get_nse_stock_quote,
-        ],
+            get_batch_quotes,
+        ),
         llm=llm,
         verbose=True,
         allow_delegation=False,
@@ -3,9 +3,9 @@ News Analysis Agent
 Responsible for gathering and analyzing news from multiple sources
 """
 
-from crewai import Agent, LLM
+from crewai import Agent
 
-from config import settings
+from agents.llm import create_llm
 from tools.news_scraper import (
     scrape_et_rss_news,
     scrape_economic_times_news,
@@ -13,16 +13,13 @@ from tools.news_scraper import (
     get_stock_news,
     get_market_news_headlines,
 )
+from tools.compact import agent_tools
 
 
 def create_news_analyst_agent() -> Agent:
     """Create the News Analyst Agent."""
 
-    llm = LLM(
-        model=settings.llm_model,
-        api_key=settings.mistral_api_key,
-        temperature=0.4,
-    )
+    llm = create_llm(temperature=0.4)
 
     return Agent(
         role="News & Sentiment Analyst",
@@ -49,13 +46,13 @@ def create_news_analyst_agent() -> Agent:
         You classify overall news sentiment as: Highly Positive, Positive,
         Neutral, Negative, or Highly Negative, with clear reasoning based
         on the actual headlines collected.""",
-        tools=[
+        tools=agent_tools(
             scrape_et_rss_news,
             scrape_economic_times_news,
             scrape_google_news,
             get_stock_news,
             get_market_news_headlines,
-        ],
+        ),
         llm=llm,
         verbose=True,
         allow_delegation=False,
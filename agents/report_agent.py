@@ -3,21 +3,18 @@ Report Writer Agent
 Responsible for creating comprehensive research reports
 """
 
-from crewai import Agent, LLM
+from crewai import Agent
 
-from config import settings
+from agents.llm import create_llm
 from tools.market_data import get_stock_price
 from tools.analysis import calculate_technical_indicators
+from tools.compact import agent_tools
 
 
 def create_report_writer_agent() -> Agent:
     """Create the Report Writer Agent."""
 
-    llm = LLM(
-        model=settings.llm_model,
-        api_key=settings.mistral_api_key,
-        temperature=0.3,
-    )
+    llm = create_llm(temperature=0.3)
 
     return Agent(
         role="Research Report Writer",
@@ -68,7 +65,7 @@ def create_report_writer_agent() -> Agent:
         5. If data for a section is unavailable, write "Data not available"
            rather than guessing.
         6. Always include a standard investment disclaimer at the end.""",
-        tools=[get_stock_price, calculate_technical_indicators],
+        tools=agent_tools(get_stock_price, calculate_technical_indicators),
         llm=llm,
         verbose=True,
         allow_delegation=False,
@@ -3,21 +3,18 @@ Investment Strategist Agent
 Synthesizes all research into actionable recommendations
 """
 
-from crewai import Agent, LLM
+from crewai import Agent
 
-from config import settings
+from agents.llm import create_llm
 from tools.institutional import get_fii_dii_data, get_bulk_block_deals
 from tools.market_data import get_index_data, get_stock_price
+from tools.compact import agent_tools
 
 
 def create_investment_strategist_agent() -> Agent:
     """Create the Investment Strategist Agent."""
     
-    llm = LLM(
-        model=settings.llm_model,
-        api_key=settings.mistral_api_key,
-        temperature=0.4,
-    )
+    llm = create_llm(temperature=0.4)
     
     return Agent(
         role="Chief Investment Strategist",
@@ -61,12 +58,12 @@ def create_investment_strategist_agent() -> Agent:
            not present in the analysis from other agents.
         4. If you lack data for a recommendation dimension, state that data
            is unavailable rather than estimating.""",
-        tools=[
+        tools=agent_tools(
             get_fii_dii_data,
             get_bulk_block_deals,
             get_index_data,
             get_stock_price,
-        ],
+        ),
         llm=llm,
         verbose=True,
         allow_delegation=False,
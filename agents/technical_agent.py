@@ -3,21 +3,19 @@ Technical Analysis Agent
 Responsible for chart analysis and technical trading signals
 """
 
-from crewai import Agent, LLM
+from crewai import Agent
 
-from config import settings
+from agents.llm import create_llm
 from tools.analysis import calculate_technical_indicators, analyze_price_action
 from tools.market_data import get_historical_data
+from tools.screener import screen_stocks
+from tools.compact import agent_tools
 
 
 def create_technical_analyst_agent() -> Agent:
     """Create the Technical Analyst Agent."""
     
-    llm = LLM(
-        model=settings.llm_model,
-        api_key=settings.mistral_api_key,
-        temperature=0.3,
-    )
+    llm = create_llm(temperature=0.3)
     
     return Agent(
         role="Technical Analyst",
@@ -35,6 +33,8 @@ def create_technical_analyst_agent() -> Agent:
         - Volume: Current vs 20-day average volume ratio
         - Support/Resistance: Pivot points (R1/R2, S1/S2), swing highs/lows
         - Price Action: 5-day and 20-day price changes, trend classification
+        - Screener: the same signal rules across NIFTY 50 or a sector, to
+          compare the stock with its peers
 
         You understand Indian market context:
         - Circuit limit behaviors
@@ -47,11 +47,12 @@ def create_technical_analyst_agent() -> Agent:
         You provide clear, actionable signals with specific price levels
         for entry, stop-loss, and targets derived from the support/resistance
         data. You always mention the timeframe for your analysis.""",
-        tools=[
+        tools=agent_tools(
             calculate_technical_indicators,
             analyze_price_action,
             get_historical_data,
-        ],
+            screen_stocks,
+        ),
         llm=llm,
         verbose=True,
         allow_delegation=False,
@@ -3,12 +3,13 @@ Streamlit Web UI for Stock Research Assistant
 Beautiful dashboard for Indian stock market analysis
 """
 import html as html_module
+import queue
 import streamlit as st
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import pandas as pd
 import plotly.graph_objects as go
-import yfinance as yf
 
 # Must be first Streamlit command
 st.set_page_config(
@@ -19,7 +20,7 @@ st.set_page_config(
 )
 
 # Import tools after streamlit config
-from tools.market_data import get_stock_price, get_stock_info, get_historical_data, get_index_data, get_trending_stocks
+from tools.market_data import get_stock_price, get_stock_info, get_historical_data, get_index_data, get_trending_stocks, get_quotes
 from tools.news_scraper import get_stock_news
 from tools.analysis import calculate_technical_indicators, get_fundamental_metrics, analyze_price_action
 from tools.institutional import get_fii_dii_data, get_bulk_block_deals
@@ -430,25 +431,27 @@ def _fetch_chart_data(symbol: str, period: str) -> pd.DataFrame:
     closing price so the chart endpoint matches the header price.
     """
     from tools.market_data import _get_nse_symbol
+    from tools.price_store import get_ohlcv
     from datetime import timedelta, time as dt_time
 
     MARKET_CLOSE = dt_time(15, 30)
 
-    # (yfinance period, interval, timedelta to shift candle to end-of-interval)
+    # (yfinance period, interval, timedelta to shift candle to end-of-interval,
+    #  max age in seconds of stored intraday bars so the live candle stays current)
     period_map = {
-        "1D": ("5d", "5m", timedelta(minutes=5)),
-        "1W": ("5d", "5m", timedelta(minutes=5)),
-        "1M": ("1mo", "30m", timedelta(minutes=30)),
-        "3M": ("3mo", "1h", timedelta(hours=1)),
-        "6M": ("6mo", "1d", None),
-        "1Y": ("1y", "1d", None),
-        "5Y": ("5y", "1d", None),
+        "1D": ("5d", "5m", timedelta(minutes=5), 60),
+        "1W": ("5d", "5m", timedelta(minutes=5), 60),
+        "1M": ("1mo", "30m", timedelta(minutes=30), 300),
+        "3M": ("3mo", "1h", timedelta(hours=1), 600),
+        "6M": ("6mo", "1d", None, None),
+        "1Y": ("1y", "1d", None, None),
+        "5Y": ("5y", "1d", None, None),
     }
-    yf_period, interval, shift = period_map.get(period, ("1y", "1d", None))
+    yf_period, interval, shift, max_age = period_map.get(period, ("1y", "1d", None, None))
 
     try:
-        ticker = yf.Ticker(_get_nse_symbol(symbol))
-        df = ticker.history(period=yf_period, interval=interval)
+        yahoo_symbol = _get_nse_symbol(symbol)
+        df = get_ohlcv(yahoo_symbol, period=yf_period, interval=interval, max_age=max_age)
 
         if df.empty:
             return df
@@ -478,7 +481,7 @@ def _fetch_chart_data(symbol: str, period: str) -> pd.DataFrame:
         # (15-min candles miss the closing auction.)
         if shift is not None:
             try:
-                daily = ticker.history(period=yf_period, interval="1d")
+                daily = get_ohlcv(yahoo_symbol, period=yf_period, interval="1d")
                 if daily.index.tz is not None:
                     daily.index = daily.index.tz_convert("Asia/Kolkata").tz_localize(None)
                 daily_close_map = {d.date(): row["Close"] for d, row in daily.iterrows()}
@@ -1597,16 +1600,35 @@ def render_ai_analysis(symbol: str):
                 st.error("❌ Mistral API key not configured. Please add MISTRAL_API_KEY to your .env file.")
                 return
             
-            from crews.research_crew import analyze_stock_sync
-            
-            with st.spinner(f"🔬 AI agents analyzing {symbol}... This may take 2-3 minutes."):
-                report = analyze_stock_sync(symbol, "full")
-            
-            st.success("✅ Analysis complete!")
+            from crews.research_crew import TASK_LABELS, analyze_stock_sync
+
+            # The crew runs on a worker thread; this (script) thread renders
+            # each agent's section as soon as it is finished
+            finished = queue.Queue()
+            with st.status(f"🔬 AI agents analyzing {symbol}... This may take 2-3 minutes.", expanded=True) as status:
+                with ThreadPoolExecutor(max_workers=1) as pool:
+                    analysis = pool.submit(
+                        analyze_stock_sync, symbol, "full",
+                        on_task_complete=lambda output, done, total: finished.put((output, done, total)),
+                    )
+                    while not (analysis.done() and finished.empty()):
+                        try:
+                            output, done, total = finished.get(timeout=0.5)
+                        except queue.Empty:
+                            continue
+                        label = TASK_LABELS.get(output.agent, output.agent)
+                        status.update(label=f"🔬 Analyzing {symbol}: {done}/{total} agents finished")
+                        st.markdown(f"**✅ {label}**")
+                        if done < total:  # the final report is shown below
+                            with st.container(border=True):
+                                st.markdown(_clean_report_markdown(output.raw))
+                    report = analysis.result()
+                status.update(label="✅ Analysis complete!", state="complete", expanded=False)
 
             # Store report in session state for download
             st.session_state[f"report_{symbol}"] = report
             st.session_state[f"report_time_{symbol}"] = datetime.now().strftime("%Y-%m-%d_%H-%M")
+            st.session_state.pop(f"report_saved_at_{symbol}", None)
 
             st.divider()
             cleaned = _clean_report_markdown(report)
@@ -1616,11 +1638,29 @@ def render_ai_analysis(symbol: str):
         except Exception as e:
             st.error(f"Error during AI analysis: {e}")
     
+    # Fall back to a recent report saved by any earlier run (bot, CLI, app)
+    if f"report_{symbol}" not in st.session_state:
+        from config import settings
+        from crews.report_store import latest_report
+        stored = latest_report(symbol, "full", max_age_minutes=settings.report_fallback_max_age_minutes)
+        if stored:
+            created = datetime.fromisoformat(stored["created_at"])
+            st.session_state[f"report_{symbol}"] = stored["report"]
+            st.session_state[f"report_time_{symbol}"] = created.strftime("%Y-%m-%d_%H-%M")
+            st.session_state[f"report_saved_at_{symbol}"] = created
+
     # Show stored report and download buttons
     if f"report_{symbol}" in st.session_state:
         report = st.session_state[f"report_{symbol}"]
         report_time = st.session_state.get(f"report_time_{symbol}", datetime.now().strftime("%Y-%m-%d_%H-%M"))
 
+        saved_at = st.session_state.get(f"report_saved_at_{symbol}")
+        if saved_at is not None:
+            st.info(
+                f"🕒 Saved report from **{saved_at:%d %b %Y, %H:%M}**, not from this session. "
+                "Run a new analysis for current data."
+            )
+
         with st.expander(f"📄 View Report ({report_time})", expanded=True):
             cleaned = _clean_report_markdown(report)
             st.markdown(cleaned)
@@ -1717,18 +1757,24 @@ def main():
         cols = st.columns(5)
         popular = ["RELIANCE", "TCS", "HDFCBANK", "INFY", "ICICIBANK"]
         
+        # One batched download for all five
+        try:
+            quotes = get_quotes(popular)
+        except Exception:
+            quotes = {}
+        
         for i, stock in enumerate(popular):
             with cols[i]:
-                try:
-                    price_data = json.loads(get_stock_price.run(stock))
-                    change = price_data.get("change_percent", 0)
+                quote = quotes.get(stock)
+                if quote:
+                    change = quote["change_percent"]
                     trend = "🟢" if change >= 0 else "🔴"
                     st.metric(
                         f"{trend} {stock}",
-                        f"₹{price_data.get('current_price', 0):,.2f}",
+                        f"₹{quote['price']:,.2f}",
                         f"{change:+.2f}%"
                     )
-                except Exception:
+                else:
                     st.metric(stock, "—", help="Price data temporarily unavailable")
 
 
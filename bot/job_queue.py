@@ -0,0 +1,185 @@
+"""
+Analysis Job Queue
+Runs the bot's crew analyses on a fixed number of workers instead of one
+thread per request. Waiting jobs are ordered by priority (quick reports
+before full ones, then first come first served), report their queue
+position as it changes, and can be cancelled. A job for an analysis that
+is already running attaches to it without taking a worker.
+"""
+
+import asyncio
+import itertools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from config import settings
+from crews.research_crew import claim_analysis, join_analysis
+
+# Lower runs first; a quick crew takes a fraction of a full one
+PRIORITIES = {"quick": 0, "technical-only": 0, "full": 1}
+
+
+class JobCancelled(Exception):
+    """The job was cancelled before it finished."""
+
+
+class AnalysisJob:
+    """One analysis request.
+
+    `updates` receives ("position", n) while the job waits, ("running", None)
+    when a worker picks it up and ("task", TaskOutput) as each crew task
+    finishes. `result` resolves to the report, or raises JobCancelled or the
+    analysis error.
+    """
+
+    def __init__(self, job_id: int, user_id: Any, symbol: str, analysis_type: str):
+        self.id = job_id
+        self.user_id = user_id
+        self.symbol = symbol
+        self.analysis_type = analysis_type
+        self.priority = PRIORITIES.get(analysis_type, PRIORITIES["full"])
+        self.state = "queued"  # queued, running, done, failed, cancelled
+        self.position: Optional[int] = None
+        self.updates: asyncio.Queue = asyncio.Queue()
+        self._loop = asyncio.get_running_loop()
+        self.result: asyncio.Future = self._loop.create_future()
+        self._cancelled = threading.Event()
+
+    @property
+    def sort_key(self) -> tuple:
+        return (self.priority, self.id)
+
+    @property
+    def active(self) -> bool:
+        return self.state in ("queued", "running")
+
+    def _emit(self, kind: str, value: Any) -> None:
+        self._loop.call_soon_threadsafe(self.updates.put_nowait, (kind, value))
+
+    def _task_complete(self, output, completed: int, total: int) -> None:
+        """Crew progress callback (crew threads); stops a cancelled crew here."""
+        if self._cancelled.is_set():
+            raise JobCancelled(f"Analysis of {self.symbol} cancelled")
+        self._emit("task", output)
+
+    def _finish(self, state: str, report: Optional[str] = None, error: Optional[BaseException] = None) -> None:
+        self.state = state
+        if self.result.done():
+            return
+        if error is not None:
+            self.result.set_exception(error)
+        else:
+            self.result.set_result(report)
+
+
+class AnalysisQueue:
+    """Bounded pool of crew workers fed from a priority queue."""
+
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None):
+        self.workers = workers or settings.bot_analysis_workers
+        self.max_pending = max_pending or settings.bot_analysis_queue_size
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="analysis")
+        self._ids = itertools.count(1)
+        self._waiting: list[AnalysisJob] = []
+        self._running: set[AnalysisJob] = set()
+        self._busy = 0  # workers running a crew (jobs attached to a run take none)
+
+    @property
+    def pending(self) -> int:
+        return len(self._waiting)
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+    def active_job(self, user_id: Any) -> Optional[AnalysisJob]:
+        """The user's queued or running job, if any."""
+        for job in [*self._running, *self._waiting]:
+            if job.user_id == user_id and job.active:
+                return job
+        return None
+
+    def submit(self, user_id: Any, symbol: str, analysis_type: str = "full") -> AnalysisJob:
+        """Queue an analysis; must be called from the event loop.
+
+        Raises:
+            asyncio.QueueFull: `max_pending` jobs are already waiting
+        """
+        if len(self._waiting) >= self.max_pending:
+            raise asyncio.QueueFull(f"{len(self._waiting)} analyses already waiting")
+        job = AnalysisJob(next(self._ids), user_id, symbol, analysis_type)
+        self._waiting.append(job)
+        self._dispatch()
+        return job
+
+    def cancel(self, job: AnalysisJob) -> bool:
+        """Cancel a job. A waiting job is dropped at once; a running crew
+        stops when its current task finishes. Returns False if the job had
+        already finished."""
+        if not job.active:
+            return False
+        job._cancelled.set()
+        if job in self._waiting:
+            self._waiting.remove(job)
+            job._finish("cancelled", error=JobCancelled(f"Analysis of {job.symbol} cancelled"))
+            self._dispatch()
+        return True
+
+    def _dispatch(self) -> None:
+        """Start waiting jobs while workers are free, then publish positions.
+
+        Jobs for an analysis already running start at once and wait for it
+        without a worker, so a second request for a symbol never holds up
+        other symbols.
+        """
+        self._waiting.sort(key=lambda job: job.sort_key)
+        for job in list(self._waiting):
+            report = join_analysis(job.symbol, job.analysis_type, on_task_complete=job._task_complete)
+            lead = None
+            if report is None:
+                if self._busy >= self.workers:
+                    continue
+                report, lead = claim_analysis(job.symbol, job.analysis_type, on_task_complete=job._task_complete)
+                if lead is not None:
+                    # Busy until the crew ends, even if this job is cancelled
+                    # while other jobs stay attached to the run
+                    self._busy += 1
+            self._waiting.remove(job)
+            self._running.add(job)
+            job.state = "running"
+            job.position = None
+            job._emit("running", None)
+            asyncio.get_running_loop().create_task(self._run(job, report, lead))
+        for position, job in enumerate(self._waiting, start=1):
+            if job.position != position:
+                job.position = position
+                job._emit("position", position)
+
+    async def _run(self, job: AnalysisJob, report: Future, lead: Optional[Callable[[], None]]) -> None:
+        if lead is not None:
+            worker = job._loop.run_in_executor(self._executor, lead)
+            worker.add_done_callback(self._worker_done)
+        try:
+            report = await asyncio.wrap_future(report)
+        except Exception as e:
+            report, error = None, e
+        else:
+            error = None
+        finally:
+            self._running.discard(job)
+        # A crew cancelled during its last task still finishes; drop its report
+        if job._cancelled.is_set():
+            job._finish("cancelled", error=JobCancelled(f"Analysis of {job.symbol} cancelled"))
+        elif error is not None:
+            job._finish("failed", error=error)
+        else:
+            job._finish("done", report=report)
+        self._dispatch()
+
+    def _worker_done(self, worker: asyncio.Future) -> None:
+        # The run's error already reached its jobs through their report futures
+        if not worker.cancelled():
+            worker.exception()
+        self._busy -= 1
+        self._dispatch()
@@ -26,10 +26,15 @@ from telegram.ext import (
 from telegram.constants import ParseMode, ChatAction
 
 from config import settings, NIFTY50_STOCKS, SECTORS
-from crews.research_crew import analyze_stock_sync
+from bot.job_queue import AnalysisJob, AnalysisQueue, JobCancelled
+from crews.research_crew import ANALYSIS_AGENTS, TASK_LABELS
 from tools.market_data import get_stock_price, get_index_data, get_stock_info
-from tools.news_scraper import get_stock_news
+from tools.news_scraper import get_stock_news_async
 from tools.analysis import calculate_technical_indicators, get_fundamental_metrics
+from tools.indicators import SIGNAL_RULES
+from tools.screener import screen_stocks
+from tools.async_tools import run_tool_async
+from tools.prewarm import next_prewarm, prewarm
 
 # Configure logging
 logging.basicConfig(
@@ -50,6 +55,7 @@ class StockResearchBot:
         """Initialize the bot with the given token."""
         self.token = token
         self.application = None
+        self.jobs = AnalysisQueue()
     
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /start command."""
@@ -77,6 +83,7 @@ I'm your intelligent research companion for Indian stock markets (NSE/BSE).
 /fundamental `SYMBOL` - Fundamental metrics
 /news `SYMBOL` - Latest news
 /market - Market overview
+/screen - Technical screener
 /nifty50 - NIFTY 50 stocks list
 /help - Detailed help
 
@@ -119,10 +126,13 @@ Just type a stock symbol or use any command to get started! 🚀
 
 **Available Commands:**
 
-🔹 `/analyze SYMBOL` 
+🔹 `/analyze SYMBOL [quick]`
    Complete AI-powered research report
-   Example: `/analyze RELIANCE`
-   ⏱️ Takes 2-3 minutes
+   Example: `/analyze RELIANCE` or `/analyze TCS quick`
+   ⏱️ Takes 2-3 minutes (quick: about a minute)
+
+🔹 `/cancel`
+   Cancel your queued or running analysis
 
 🔹 `/quick SYMBOL`
    Quick price and basic info
@@ -148,6 +158,11 @@ Just type a stock symbol or use any command to get started! 🚀
    Overall market snapshot
    NIFTY, SENSEX, FII/DII activity
 
+🔹 `/screen [SECTOR] [RULES]`
+   Scan NIFTY 50 or a sector for technical signals
+   Example: `/screen IT rsi_oversold`
+   ⏱️ 10 seconds
+
 🔹 `/nifty50`
    List of all NIFTY 50 stocks
 
@@ -169,7 +184,7 @@ NIFTY 50, NIFTY Next 50, NIFTY 500, and more.
         await update.message.reply_text(help_text, parse_mode=ParseMode.MARKDOWN)
     
     async def analyze_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-        """Handle /analyze command - Full AI analysis."""
+        """Handle /analyze command - Full AI analysis (`/analyze SYMBOL quick` for a quick report)."""
         reply_target = self._get_reply_message(update)
         if not context.args:
             await reply_target.reply_text(
@@ -180,8 +195,18 @@ NIFTY 50, NIFTY Next 50, NIFTY 500, and more.
             return
 
         symbol = context.args[0].upper().strip()
+        analysis_type = "quick" if len(context.args) > 1 and context.args[1].lower() == "quick" else "full"
         user_id = update.effective_user.id
 
+        active = self.jobs.active_job(user_id)
+        if active:
+            await reply_target.reply_text(
+                f"⏳ Your analysis of {active.symbol} is still {active.state}.\n\n"
+                "Use /cancel to stop it and start another.",
+                parse_mode=ParseMode.MARKDOWN,
+            )
+            return
+
         # Rate limiting
         now = datetime.now().timestamp()
         if user_id in user_last_request:
@@ -195,19 +220,22 @@ NIFTY 50, NIFTY Next 50, NIFTY 500, and more.
                 )
                 return
 
+        try:
+            job = self.jobs.submit(user_id, symbol, analysis_type)
+        except asyncio.QueueFull:
+            await reply_target.reply_text(
+                "🚦 Too many analyses are queued right now. Please try again in a few minutes.\n\n"
+                f"Use `/quick {symbol}` for instant results!",
+                parse_mode=ParseMode.MARKDOWN,
+            )
+            return
+
         user_last_request[user_id] = now
 
         # Send initial message
+        status_text = self._analysis_status(job, [])
         status_msg = await reply_target.reply_text(
-            f"🔬 **Analyzing {symbol}...**\n\n"
-            "⏳ This comprehensive analysis may take 2-3 minutes.\n\n"
-            "Our AI agents are working on:\n"
-            "📊 Market Data Collection\n"
-            "📰 News & Sentiment Analysis\n"
-            "💰 Fundamental Research\n"
-            "📈 Technical Analysis\n"
-            "🎯 Investment Strategy\n\n"
-            "_Please wait..._",
+            status_text,
             parse_mode=ParseMode.MARKDOWN,
         )
         
@@ -218,21 +246,33 @@ NIFTY 50, NIFTY Next 50, NIFTY 500, and more.
         )
         
         try:
-            # Run the analysis in a thread to not block
-            loop = asyncio.get_event_loop()
-            report = await loop.run_in_executor(
-                None,
-                analyze_stock_sync,
-                symbol,
-                "full",
-            )
+            # Queue position changes and finished agents arrive as job
+            # updates and are reflected in the status message
+            done_roles: list[str] = []
+            while True:
+                next_update = asyncio.ensure_future(job.updates.get())
+                await asyncio.wait({job.result, next_update}, return_when=asyncio.FIRST_COMPLETED)
+                if not next_update.done():
+                    next_update.cancel()
+                    break
+                kind, value = next_update.result()
+                if kind == "task":
+                    done_roles.append(value.agent)
+                text = self._analysis_status(job, done_roles)
+                if text != status_text:
+                    await self._edit_status(status_msg, text)
+                    status_text = text
+            report = await job.result
             
             # Delete status message
             await status_msg.delete()
             
             # Send report (may need to split if too long)
             await self._send_long_message(update, report)
-            
+
+        except JobCancelled:
+            await self._edit_status(status_msg, f"🛑 Analysis of {symbol} cancelled.")
+
         except Exception as e:
             logger.error(f"Analysis error for {symbol}: {e}")
             await status_msg.edit_text(
@@ -241,6 +281,19 @@ NIFTY 50, NIFTY Next 50, NIFTY 500, and more.
                 "Please try again or check if the symbol is correct.",
                 parse_mode=ParseMode.MARKDOWN,
             )
+
+    async def cancel_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Handle /cancel command - Cancel the user's queued or running analysis."""
+        job = self.jobs.active_job(update.effective_user.id)
+        if not job or not self.jobs.cancel(job):
+            await update.message.reply_text("ℹ️ You have no analysis in progress.")
+            return
+        if job.state == "cancelled":
+            await update.message.reply_text(f"🛑 Removed {job.symbol} from the queue.")
+        else:
+            await update.message.reply_text(
+                f"🛑 Stopping the analysis of {job.symbol} after the current agent finishes."
+            )
     
     async def quick_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /quick command - Quick price check."""
@@ -261,9 +314,13 @@ NIFTY 50, NIFTY Next 50, NIFTY 500, and more.
         )
 
         try:
-            # Get price data
-            price_data = json.loads(get_stock_price.run(symbol))
-            info_data = json.loads(get_stock_info.run(symbol))
+            # Get price data (both lookups run off the event loop, concurrently)
+            price_json, info_json = await asyncio.gather(
+                run_tool_async(get_stock_price, symbol),
+                run_tool_async(get_stock_info, symbol),
+            )
+            price_data = json.loads(price_json)
+            info_data = json.loads(info_json)
 
             if "error" in price_data:
                 await reply_target.reply_text(
@@ -345,7 +402,7 @@ _Updated: {datetime.now().strftime('%H:%M:%S IST')}_
         )
 
         try:
-            tech_data = json.loads(calculate_technical_indicators.run(symbol))
+            tech_data = json.loads(await run_tool_async(calculate_technical_indicators, symbol))
 
             if "error" in tech_data:
                 await reply_target.reply_text(f"❌ Error: {tech_data['error']}")
@@ -426,7 +483,7 @@ _Updated: {datetime.now().strftime('%H:%M:%S IST')}_
         )
 
         try:
-            fund_data = json.loads(get_fundamental_metrics.run(symbol))
+            fund_data = json.loads(await run_tool_async(get_fundamental_metrics, symbol))
 
             if "error" in fund_data:
                 await reply_target.reply_text(f"❌ Error: {fund_data['error']}")
@@ -514,7 +571,7 @@ _Analysis as of {datetime.now().strftime('%H:%M:%S IST')}_
         )
         
         try:
-            news_data = json.loads(get_stock_news.run(symbol, 5))
+            news_data = json.loads(await get_stock_news_async(symbol, 5))
             
             articles = news_data.get("articles", [])
             
@@ -559,7 +616,7 @@ _Analysis as of {datetime.now().strftime('%H:%M:%S IST')}_
         )
 
         try:
-            indices_data = json.loads(get_index_data.run("ALL"))
+            indices_data = json.loads(await run_tool_async(get_index_data, "ALL"))
             
             message = "🏦 **Indian Market Overview**\n\n"
             
@@ -616,6 +673,54 @@ _Analysis as of {datetime.now().strftime('%H:%M:%S IST')}_
             logger.error(f"Market overview error: {e}")
             await reply_target.reply_text(f"❌ Error: {str(e)[:100]}")
     
+    async def screen_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Handle /screen command - Technical screener over NIFTY 50 or a sector."""
+        reply_target = self._get_reply_message(update)
+        args = list(context.args or [])
+
+        # "/screen rsi_oversold" screens NIFTY 50; otherwise the first arg is the universe
+        universe = "NIFTY50"
+        if args and args[0].lower() not in SIGNAL_RULES:
+            universe = args.pop(0).upper()
+        criteria = ",".join(args)
+
+        await context.bot.send_chat_action(
+            chat_id=update.effective_chat.id,
+            action=ChatAction.TYPING,
+        )
+
+        try:
+            result = json.loads(await run_tool_async(screen_stocks, universe, criteria, 10))
+
+            if "error" in result:
+                await reply_target.reply_text(f"❌ Error: {result['error']}")
+                return
+
+            signal_emoji = {"BULLISH": "🟢", "BEARISH": "🔴", "NEUTRAL": "🟡"}
+            message = (
+                f"🔎 **{result['universe']} Screener**\n"
+                f"{result['matches_count']} of {result['scanned']} stocks match\n\n"
+            )
+
+            for i, match in enumerate(result["matches"], 1):
+                emoji = signal_emoji.get(match["overall_signal"], "🟡")
+                price = f"₹{match['price']:,.2f}" if match["price"] is not None else "N/A"
+                message += f"{emoji} **{i}. {match['symbol']}** {price} | RSI {match['rsi_14']}\n"
+                for sig in match["signals"][:3]:
+                    message += f"   • {sig['indicator']}: {sig['signal']}\n"
+                message += "\n"
+
+            if not result["matches"]:
+                message += "_No stocks match right now._\n\n"
+
+            message += f"---\n_Scanned at {datetime.now().strftime('%H:%M:%S IST')}_"
+
+            await reply_target.reply_text(message, parse_mode=ParseMode.MARKDOWN)
+
+        except Exception as e:
+            logger.error(f"Screener error: {e}")
+            await reply_target.reply_text(f"❌ Error: {str(e)[:100]}")
+
     async def nifty50_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /nifty50 command - List NIFTY 50 stocks."""
         message = "📊 **NIFTY 50 Stocks**\n\n"
@@ -723,6 +828,36 @@ _Analysis as of {datetime.now().strftime('%H:%M:%S IST')}_
                 parse_mode=ParseMode.MARKDOWN,
             )
     
+    @staticmethod
+    def _analysis_status(job: AnalysisJob, done_roles: list[str]) -> str:
+        """Status message for an analysis job: queue position, then finished agents."""
+        if job.state == "queued":
+            return (
+                f"🕒 **{job.symbol} analysis queued** (position {job.position or 1})\n\n"
+                "Other analyses are running; yours starts automatically.\n\n"
+                "_Use /cancel to leave the queue._"
+            )
+        roles = ANALYSIS_AGENTS.get(job.analysis_type, ANALYSIS_AGENTS["full"])
+        steps = "\n".join(
+            f"{'✅' if role in done_roles else '⏳'} {TASK_LABELS[role]}" for role in roles
+        )
+        return (
+            f"🔬 **Analyzing {job.symbol}...** ({len(done_roles)}/{len(roles)})\n\n"
+            f"⏳ This {'quick' if job.analysis_type == 'quick' else 'comprehensive'} analysis "
+            f"may take {'about a minute' if job.analysis_type == 'quick' else '2-3 minutes'}.\n\n"
+            "Our AI agents are working on:\n"
+            f"{steps}\n\n"
+            "_Please wait..._"
+        )
+
+    @staticmethod
+    async def _edit_status(status_msg, text: str) -> None:
+        """Best-effort status update; a failed edit must not stop the analysis."""
+        try:
+            await status_msg.edit_text(text, parse_mode=ParseMode.MARKDOWN)
+        except Exception as e:
+            logger.debug(f"Status update failed: {e}")
+
     def _format_nifty50_list(self) -> str:
         """Format NIFTY 50 list for display."""
         message = "📊 **NIFTY 50 Stocks**\n\n"
@@ -765,16 +900,39 @@ _Analysis as of {datetime.now().strftime('%H:%M:%S IST')}_
             BotCommand("start", "Start the bot"),
             BotCommand("help", "Show help guide"),
             BotCommand("analyze", "Full AI analysis for a stock"),
+            BotCommand("cancel", "Cancel your running analysis"),
             BotCommand("quick", "Quick price check"),
             BotCommand("technical", "Technical analysis"),
             BotCommand("fundamental", "Fundamental analysis"),
             BotCommand("news", "Latest news for a stock"),
             BotCommand("market", "Market overview"),
+            BotCommand("screen", "Screen stocks for technical signals"),
             BotCommand("nifty50", "List NIFTY 50 stocks"),
             BotCommand("sectors", "Stocks by sector"),
         ]
         await application.bot.set_my_commands(commands)
     
+    def schedule_prewarm(self) -> None:
+        """Schedule the next NIFTY 50 cache pre-warm on the job queue."""
+        job_queue = self.application.job_queue
+        if job_queue is None:
+            logger.warning("Cache pre-warm not scheduled: install python-telegram-bot[job-queue]")
+            return
+        job_queue.run_once(self.prewarm_job, when=next_prewarm(), name="prewarm")
+    
+    async def prewarm_job(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Refresh the NIFTY 50 tool caches, then schedule the next run."""
+        try:
+            summary = await asyncio.to_thread(prewarm)
+            logger.info(
+                f"Pre-warmed {summary['symbols']} stocks in {summary['seconds']}s "
+                f"({len(summary['failed'])}/{summary['calls']} calls failed)"
+            )
+        except Exception as e:
+            logger.error(f"Pre-warm error: {e}")
+        finally:
+            self.schedule_prewarm()
+    
     def run(self) -> None:
         """Run the bot."""
         # Build application
@@ -784,11 +942,13 @@ _Analysis as of {datetime.now().strftime('%H:%M:%S IST')}_
         self.application.add_handler(CommandHandler("start", self.start))
         self.application.add_handler(CommandHandler("help", self.help_command))
         self.application.add_handler(CommandHandler("analyze", self.analyze_command))
+        self.application.add_handler(CommandHandler("cancel", self.cancel_command))
         self.application.add_handler(CommandHandler("quick", self.quick_command))
         self.application.add_handler(CommandHandler("technical", self.technical_command))
         self.application.add_handler(CommandHandler("fundamental", self.fundamental_command))
         self.application.add_handler(CommandHandler("news", self.news_command))
         self.application.add_handler(CommandHandler("market", self.market_command))
+        self.application.add_handler(CommandHandler("screen", self.screen_command))
         self.application.add_handler(CommandHandler("nifty50", self.nifty50_command))
         self.application.add_handler(CommandHandler("sectors", self.sectors_command))
         self.application.add_handler(CallbackQueryHandler(self.handle_callback))
@@ -800,6 +960,10 @@ _Analysis as of {datetime.now().strftime('%H:%M:%S IST')}_
         # Set up commands menu
         self.application.post_init = self.setup_commands
         
+        # Keep NIFTY 50 data warm before and during market hours
+        if settings.prewarm_enabled:
+            self.schedule_prewarm()
+        
         # Run the bot
         logger.info("Starting Stock Research Bot...")
         self.application.run_polling(allowed_updates=Update.ALL_TYPES)
@@ -18,17 +18,80 @@ class Settings(BaseSettings):
     mistral_api_key: str = Field(default="", env="MISTRAL_API_KEY")
     llm_model: str = Field(default="mistral/mistral-large-latest", env="LLM_MODEL")
     llm_temperature: float = Field(default=0.7, env="LLM_TEMPERATURE")
+    # Persistent agent response cache (data/cache/llm)
+    llm_cache_enabled: bool = Field(default=True, env="LLM_CACHE_ENABLED")
+    llm_cache_ttl_minutes: int = Field(default=60, env="LLM_CACHE_TTL_MINUTES")
+    llm_cache_max_entries: int = Field(default=1000, env="LLM_CACHE_MAX_ENTRIES")
     
     # ==========================================
     # Telegram Bot Configuration
     # ==========================================
     telegram_bot_token: str = Field(default="", env="TELEGRAM_BOT_TOKEN")
     telegram_admin_ids: str = Field(default="", env="TELEGRAM_ADMIN_IDS")
+    # Crew analyses the bot runs at once; further /analyze requests queue up
+    bot_analysis_workers: int = Field(default=2, env="BOT_ANALYSIS_WORKERS")
+    bot_analysis_queue_size: int = Field(default=20, env="BOT_ANALYSIS_QUEUE_SIZE")
     
     # ==========================================
     # Cache Configuration
     # ==========================================
+    # Defaults for every tool cache namespace
     cache_ttl_minutes: int = Field(default=15, env="CACHE_TTL_MINUTES")
+    cache_max_size: int = Field(default=200, env="CACHE_MAX_SIZE")
+    # Per-namespace overrides ({namespace}_cache_ttl_minutes / _max_size)
+    news_cache_ttl_minutes: int = Field(default=10, env="NEWS_CACHE_TTL_MINUTES")
+    news_cache_max_size: int = Field(default=100, env="NEWS_CACHE_MAX_SIZE")
+    profile_cache_max_size: int = Field(default=500, env="PROFILE_CACHE_MAX_SIZE")
+    institutional_cache_ttl_minutes: int = Field(default=30, env="INSTITUTIONAL_CACHE_TTL_MINUTES")
+    institutional_cache_max_size: int = Field(default=100, env="INSTITUTIONAL_CACHE_MAX_SIZE")
+    index_cache_ttl_minutes: int = Field(default=1, env="INDEX_CACHE_TTL_MINUTES")
+    # Streaming indicator state per symbol (re-seeded from history when evicted)
+    indicator_state_cache_ttl_minutes: int = Field(default=1440, env="INDICATOR_STATE_CACHE_TTL_MINUTES")
+    indicator_state_cache_max_size: int = Field(default=500, env="INDICATOR_STATE_CACHE_MAX_SIZE")
+    # Finished research reports; repeat requests within the window get the same report
+    report_cache_ttl_minutes: int = Field(default=30, env="REPORT_CACHE_TTL_MINUTES")
+    report_cache_max_size: int = Field(default=50, env="REPORT_CACHE_MAX_SIZE")
+    # Saved reports kept per symbol and analysis type under data/reports (older ones are deleted)
+    report_retention: int = Field(default=20, env="REPORT_RETENTION")
+    # Oldest saved report the dashboard offers when there is none from this session
+    report_fallback_max_age_minutes: int = Field(default=1440, env="REPORT_FALLBACK_MAX_AGE_MINUTES")
+    ohlcv_disk_cache: bool = Field(default=True, env="OHLCV_DISK_CACHE")
+    
+    # ==========================================
+    # Cache Pre-warm
+    # ==========================================
+    # Refresh NIFTY 50 tool caches from the bot (needs python-telegram-bot[job-queue])
+    prewarm_enabled: bool = Field(default=True, env="PREWARM_ENABLED")
+    # Pre-open warm-up (HH:MM, IST), then every N minutes while the market is open (0 = pre-open only)
+    prewarm_preopen_time: str = Field(default="09:00", env="PREWARM_PREOPEN_TIME")
+    prewarm_interval_minutes: int = Field(default=15, env="PREWARM_INTERVAL_MINUTES")
+    # Include per-stock news (one scrape of every source per symbol), a few symbols at a time
+    prewarm_news: bool = Field(default=True, env="PREWARM_NEWS")
+    prewarm_news_workers: int = Field(default=2, env="PREWARM_NEWS_WORKERS")
+    
+    # ==========================================
+    # Async Tools
+    # ==========================================
+    # Threads available to yfinance/NSE tools awaited from async code (the bot)
+    tool_worker_threads: int = Field(default=8, env="TOOL_WORKER_THREADS")
+    # Total time get_stock_news waits for its sources before returning partial results
+    news_deadline_seconds: float = Field(default=15.0, env="NEWS_DEADLINE_SECONDS")
+    
+    # ==========================================
+    # Crew Execution
+    # ==========================================
+    # Run news, fundamental and technical analysis concurrently in full reports
+    crew_parallel_tasks: bool = Field(default=True, env="CREW_PARALLEL_TASKS")
+    # Fetch every task's tool outputs up front and hand them to the agents
+    crew_prefetch_data: bool = Field(default=True, env="CREW_PREFETCH_DATA")
+    # Send agents compact tool output (no indentation/empty fields, short keys)
+    compact_tool_output: bool = Field(default=True, env="COMPACT_TOOL_OUTPUT")
+    
+    # ==========================================
+    # NSE Session
+    # ==========================================
+    # Homepage cookies are reused until this old, or until NSE answers 401/403
+    nse_cookie_ttl_minutes: int = Field(default=5, env="NSE_COOKIE_TTL_MINUTES")
     
     # ==========================================
     # Rate Limiting
@@ -60,6 +123,19 @@ class Settings(BaseSettings):
                 ids.append(int(item))
         return ids
     
+    def cache_settings(self, namespace: str) -> tuple[int, int]:
+        """Return (ttl_minutes, max_size) for a cache namespace.
+
+        Uses `{namespace}_cache_ttl_minutes` / `{namespace}_cache_max_size`
+        when defined, falling back to the global cache defaults.
+        """
+        ttl = getattr(self, f"{namespace}_cache_ttl_minutes", None)
+        max_size = getattr(self, f"{namespace}_cache_max_size", None)
+        return (
+            ttl if ttl is not None else self.cache_ttl_minutes,
+            max_size if max_size is not None else self.cache_max_size,
+        )
+    
     def ensure_dirs(self):
         """Create necessary directories if they don't exist."""
         self.data_dir.mkdir(parents=True, exist_ok=True)
@@ -148,6 +224,9 @@ TECHNICAL_CONFIG = {
     "bollinger_period": 20,
     "bollinger_std": 2,
     "atr_period": 14,
+    # Swing points: bars on each side a swing high/low must exceed
+    "swing_left_bars": 2,
+    "swing_right_bars": 2,
 }
 
 # Fundamental Analysis Thresholds
@@ -2,6 +2,8 @@
 Crews package for Stock Research Assistant
 """
 
+from crews.prefetch import prefetch_data
+from crews.report_store import latest_report, list_reports, load_report, save_report
 from crews.research_crew import (
     create_stock_research_crew,
     analyze_stock,
@@ -12,4 +14,9 @@ __all__ = [
     "create_stock_research_crew",
     "analyze_stock",
     "analyze_stock_sync",
+    "prefetch_data",
+    "save_report",
+    "load_report",
+    "latest_report",
+    "list_reports",
 ]
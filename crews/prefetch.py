@@ -0,0 +1,97 @@
+"""
+Data Prefetch
+Runs the tool calls every research task needs before the crew starts, in
+parallel, so agents reason over the results instead of fetching them one
+LLM round trip at a time.
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Optional
+
+from config import settings
+from tools.analysis import analyze_price_action, calculate_technical_indicators, get_fundamental_metrics
+from tools.compact import agent_output
+from tools.institutional import (
+    get_bulk_block_deals,
+    get_fii_dii_data,
+    get_mutual_fund_holdings,
+    get_promoter_holdings,
+)
+from tools.market_data import get_index_data, get_nse_stock_quote, get_stock_info, get_stock_price
+from tools.news_scraper import get_market_news_headlines, get_stock_news
+
+# Tool calls per section: (tool, takes the symbol)
+SECTIONS = {
+    "market": [(get_stock_price, True), (get_stock_info, True), (get_nse_stock_quote, True), (get_index_data, False)],
+    "news": [(get_stock_news, True), (get_market_news_headlines, False)],
+    "fundamental": [(get_fundamental_metrics, True), (get_promoter_holdings, True), (get_mutual_fund_holdings, True)],
+    "technical": [(calculate_technical_indicators, True), (analyze_price_action, True)],
+    "strategy": [(get_fii_dii_data, False), (get_bulk_block_deals, True)],
+}
+
+# Sections each analysis type needs (see create_stock_research_crew)
+ANALYSIS_SECTIONS = {
+    "full": ["market", "news", "fundamental", "technical", "strategy"],
+    "quick": ["market", "technical"],
+    "technical-only": ["market", "technical"],
+}
+
+
+def prefetch_data(symbol: str, analysis_type: str = "full") -> dict:
+    """Fetch the tool outputs an analysis will need, all at once.
+
+    Args:
+        symbol: Stock symbol (e.g., 'RELIANCE')
+        analysis_type: 'full', 'quick', or 'technical-only'
+
+    Returns:
+        Dict with 'symbol', 'fetched_at' and 'sections', mapping each section
+        name to {tool name: output as agents receive it (see tools.compact)}. Tools report their own
+        failures as error JSON; an exception raised anyway is recorded the
+        same way so one source cannot stop the others.
+    """
+    symbol = symbol.upper().strip()
+    calls = [
+        (section, tool, (symbol,) if takes_symbol else ())
+        for section in ANALYSIS_SECTIONS.get(analysis_type, ANALYSIS_SECTIONS["full"])
+        for tool, takes_symbol in SECTIONS[section]
+    ]
+
+    with ThreadPoolExecutor(max_workers=settings.tool_worker_threads, thread_name_prefix="prefetch") as pool:
+        futures = [pool.submit(tool.run, *args) for _, tool, args in calls]
+
+    sections: dict[str, dict[str, str]] = {}
+    for (section, tool, _), future in zip(calls, futures):
+        try:
+            output = agent_output(future.result())
+        except Exception as e:
+            output = json.dumps({"error": str(e), "DATA_UNAVAILABLE": True})
+        sections.setdefault(section, {})[tool.name] = output
+
+    return {"symbol": symbol, "fetched_at": datetime.now().isoformat(timespec="seconds"), "sections": sections}
+
+
+def format_data_block(data: Optional[dict], *sections: str, tools: Optional[list[str]] = None) -> str:
+    """Text block with the prefetched outputs of `sections`, for a task description.
+
+    `tools` limits the block to those tool names. Returns an empty string
+    when there is no data, so tasks read exactly as before.
+    """
+    if not data:
+        return ""
+    outputs = [
+        f"[{name}]\n{output}"
+        for section in sections
+        for name, output in data["sections"].get(section, {}).items()
+        if tools is None or name in tools
+    ]
+    if not outputs:
+        return ""
+    return (
+        f"\n\n        PREFETCHED DATA for {data['symbol']} (tool outputs fetched at {data['fetched_at']}):\n"
+        + "\n".join(outputs)
+        + "\n\n        These are the outputs of the named tools. Use them directly instead of "
+        "calling those tools again; call a tool only for data not included here."
+    )
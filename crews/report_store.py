@@ -0,0 +1,185 @@
+"""
+Report Store
+Persists every generated research report under data/reports, one Markdown
+file per report, with an index.json of metadata (symbol, analysis type,
+creation time, model, hash of the data the agents saw) and the latest report
+per symbol and analysis type. The bot, the dashboard and the CLI run in
+separate processes; each reloads the index when another one has written it,
+and saves serialize on a lock file so none of them loses another's entry.
+Only the newest `report_retention` reports per symbol and type are kept.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+from config import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are serialized within this process only
+    fcntl = None
+
+_reports_dir: Path = settings.reports_dir
+_lock = threading.Lock()
+# In-memory copy of index.json and the mtime it was read at
+_index: dict = {"reports": {}, "latest": {}}
+_index_mtime: Optional[float] = None
+
+
+def _index_path() -> Path:
+    return _reports_dir / "index.json"
+
+
+def _latest_key(symbol: str, analysis_type: str) -> str:
+    return f"{symbol.upper().strip()}:{analysis_type}"
+
+
+def _load_index(force: bool = False) -> dict:
+    """The index, re-read only when the file changed (or always, with `force`). Caller holds the lock."""
+    global _index, _index_mtime
+    path = _index_path()
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        _index, _index_mtime = {"reports": {}, "latest": {}}, None
+        return _index
+    if force or mtime != _index_mtime:
+        try:
+            _index = json.loads(path.read_text())
+        except (OSError, ValueError):
+            _index = {"reports": {}, "latest": {}}
+        _index_mtime = mtime
+    return _index
+
+
+@contextmanager
+def _index_lock():
+    """Exclusive access to the index for this thread and, via index.lock, other processes."""
+    with _lock:
+        if fcntl is None:
+            yield
+            return
+        _reports_dir.mkdir(parents=True, exist_ok=True)
+        with open(_reports_dir / "index.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _prune(index: dict, symbol: str, analysis_type: str) -> None:
+    """Delete all but the newest `report_retention` reports for a symbol and type. Caller holds the lock."""
+    reports = sorted(
+        (meta for meta in index["reports"].values()
+         if meta["symbol"] == symbol and meta["analysis_type"] == analysis_type),
+        key=lambda meta: meta["id"].rsplit("_", 1)[-1],
+        reverse=True,
+    )
+    for meta in reports[max(settings.report_retention, 1):]:
+        (_reports_dir / meta["path"]).unlink(missing_ok=True)
+        del index["reports"][meta["id"]]
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(text)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def data_hash(data: Optional[dict]) -> Optional[str]:
+    """Short hash of prefetched tool outputs (see crews.prefetch), ignoring fetch time."""
+    if not data:
+        return None
+    payload = json.dumps(data.get("sections", {}), sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def save_report(symbol: str, analysis_type: str, report: str, data: Optional[dict] = None) -> dict:
+    """Store a report and return its metadata.
+
+    Args:
+        symbol: Stock symbol the report covers
+        analysis_type: 'full', 'quick', or 'technical-only'
+        report: Markdown report text
+        data: Prefetched tool outputs the agents worked from, if any
+
+    Returns:
+        Metadata dict with 'id', 'symbol', 'analysis_type', 'created_at',
+        'model', 'data_hash' and 'path' (relative to the reports directory)
+    """
+    symbol = symbol.upper().strip()
+    created = datetime.now()
+    safe_symbol = re.sub(r"[^A-Za-z0-9._-]", "_", symbol)
+    report_id = f"{safe_symbol}_{analysis_type}_{created:%Y%m%d-%H%M%S-%f}"
+    meta = {
+        "id": report_id,
+        "symbol": symbol,
+        "analysis_type": analysis_type,
+        "created_at": created.isoformat(timespec="seconds"),
+        "model": settings.llm_model,
+        "data_hash": data_hash(data),
+        "path": f"{safe_symbol}/{report_id}.md",
+    }
+    global _index_mtime
+    with _index_lock():
+        _write_atomic(_reports_dir / meta["path"], report)
+        index = _load_index(force=True)
+        index["reports"][report_id] = meta
+        index["latest"][_latest_key(symbol, analysis_type)] = report_id
+        _prune(index, symbol, analysis_type)
+        _write_atomic(_index_path(), json.dumps(index, indent=2))
+        _index_mtime = _index_path().stat().st_mtime
+    return meta
+
+
+def load_report(report_id: str) -> Optional[dict]:
+    """Metadata plus the report text under 'report', or None if unknown or missing."""
+    with _lock:
+        meta = _load_index()["reports"].get(report_id)
+    if meta is None:
+        return None
+    try:
+        text = (_reports_dir / meta["path"]).read_text()
+    except OSError:
+        return None
+    return {**meta, "report": text}
+
+
+def latest_report(symbol: str, analysis_type: str = "full", max_age_minutes: Optional[float] = None) -> Optional[dict]:
+    """The newest stored report for a symbol and analysis type (see load_report).
+
+    With `max_age_minutes`, an older report counts as missing.
+    """
+    with _lock:
+        index = _load_index()
+        report_id = index["latest"].get(_latest_key(symbol, analysis_type))
+        meta = index["reports"].get(report_id) if report_id else None
+    if meta is None:
+        return None
+    if max_age_minutes is not None:
+        age = datetime.now() - datetime.fromisoformat(meta["created_at"])
+        if age > timedelta(minutes=max_age_minutes):
+            return None
+    return load_report(report_id)
+
+
+def list_reports(symbol: Optional[str] = None, limit: int = 20) -> list[dict]:
+    """Metadata of stored reports, newest first, optionally for one symbol."""
+    with _lock:
+        reports = list(_load_index()["reports"].values())
+    if symbol:
+        reports = [meta for meta in reports if meta["symbol"] == symbol.upper().strip()]
+    reports.sort(key=lambda meta: meta["id"].rsplit("_", 1)[-1], reverse=True)
+    return reports[:limit]
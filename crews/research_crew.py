@@ -3,9 +3,14 @@ Stock Research Crew
 Orchestrates all agents to produce comprehensive stock analysis
 """
 
+import functools
+import itertools
+import threading
+from concurrent.futures import Future
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Optional
 from crewai import Crew, Task, Process
+from crewai.tasks.task_output import TaskOutput
 
 # ---------------------------------------------------------------------------
 # Patch: Mistral API returns content as list of blocks (text, reference)
@@ -33,6 +38,10 @@ def _patched_extract_reasoning_content(message: dict):
 _llm_resp._extract_reasoning_content = _patched_extract_reasoning_content
 # ---------------------------------------------------------------------------
 
+from config import settings
+from crews.prefetch import format_data_block, prefetch_data
+from crews.report_store import latest_report, save_report
+from tools.cache import get_cache
 from agents.market_data_agent import market_data_agent
 from agents.news_agent import news_analyst_agent
 from agents.fundamental_agent import fundamental_analyst_agent
@@ -40,19 +49,72 @@ from agents.technical_agent import technical_analyst_agent
 from agents.strategist_agent import investment_strategist_agent
 from agents.report_agent import report_writer_agent
 
+# Progress label for each agent's task, in task order
+TASK_LABELS = {
+    market_data_agent.role: "📊 Market Data Collection",
+    news_analyst_agent.role: "📰 News & Sentiment Analysis",
+    fundamental_analyst_agent.role: "💰 Fundamental Research",
+    technical_analyst_agent.role: "📈 Technical Analysis",
+    investment_strategist_agent.role: "🎯 Investment Strategy",
+    report_writer_agent.role: "📝 Research Report",
+}
 
-def create_stock_research_crew(symbol: str, analysis_type: str = "full") -> Crew:
+# Agents whose tasks each analysis type runs (see create_stock_research_crew)
+ANALYSIS_AGENTS = {
+    "full": list(TASK_LABELS),
+    "quick": [market_data_agent.role, technical_analyst_agent.role, report_writer_agent.role],
+    "technical-only": [market_data_agent.role, technical_analyst_agent.role],
+}
+
+# on_task_complete(output, tasks completed, total tasks)
+TaskProgressCallback = Callable[[TaskOutput, int, int], None]
+
+
+def _task_progress(on_task_complete: TaskProgressCallback, total: int) -> Callable[[TaskOutput], None]:
+    """Crew task callback counting completions for `on_task_complete`.
+
+    Parallel (async) tasks finish on their own threads, so the count is
+    taken under a lock.
+    """
+    lock = threading.Lock()
+    completed = 0
+
+    def callback(output: TaskOutput) -> None:
+        nonlocal completed
+        with lock:
+            completed += 1
+            count = completed
+        on_task_complete(output, count, total)
+
+    return callback
+
+
+def create_stock_research_crew(
+    symbol: str,
+    analysis_type: str = "full",
+    data: Optional[dict] = None,
+    on_task_complete: Optional[TaskProgressCallback] = None,
+) -> Crew:
     """
     Create a research crew for analyzing a stock.
+
+    In a full analysis, news, fundamental and technical analysis depend only
+    on the market data task, so they run concurrently (unless
+    CREW_PARALLEL_TASKS is off); strategy waits for all three.
     
     Args:
         symbol: Stock symbol (e.g., 'RELIANCE', 'TCS')
         analysis_type: 'full', 'quick', or 'technical-only'
+        data: Optional prefetched tool outputs (see crews.prefetch); each
+            task description then carries the sections it needs
+        on_task_complete: Optional callback run as each task finishes, with
+            the task output, the number of tasks completed and the total
         
     Returns:
         Configured Crew ready to execute
     """
     symbol = symbol.upper().strip()
+    parallel = analysis_type == "full" and settings.crew_parallel_tasks
     
     # ==========================================
     # Task 1: Collect Market Data
@@ -71,7 +133,7 @@ def create_stock_research_crew(symbol: str, analysis_type: str = "full") -> Crew
 
         IMPORTANT: Report the exact numbers returned by each tool call.
         If a tool returns an error, state "data unavailable" for that section.
-        Do not estimate or guess any data points.""",
+        Do not estimate or guess any data points.""" + format_data_block(data, "market"),
         expected_output=f"""A comprehensive market data report for {symbol} including:
         - Current price (exact value from Get Stock Price tool)
         - Day's trading range (open, high, low from tool output)
@@ -97,13 +159,14 @@ def create_stock_research_crew(symbol: str, analysis_type: str = "full") -> Crew
 
         Classify overall news sentiment and highlight the top 5 most important
         news items. Look for: earnings announcements, management changes,
-        contract wins, regulatory issues, analyst upgrades/downgrades.""",
+        contract wins, regulatory issues, analyst upgrades/downgrades.""" + format_data_block(data, "news"),
         expected_output=f"""A news analysis report for {symbol} containing:
         - List of recent news articles with sentiment assessment per headline
         - Overall sentiment assessment (Bullish/Bearish/Neutral)
         - Key news highlights that could impact price
         - Any red flags or positive catalysts identified""",
         agent=news_analyst_agent,
+        async_execution=parallel,
     )
     
     # ==========================================
@@ -125,8 +188,8 @@ def create_stock_research_crew(symbol: str, analysis_type: str = "full") -> Crew
         - Review growth trends (earnings growth, revenue growth)
         - Analyze promoter and institutional holding patterns
 
-        Only report metrics that your tools return. If a metric is "N/A",
-        note it as unavailable. Use the market data from the previous task.""",
+        Only report metrics that your tools return. If a metric is "N/A" or
+        missing, note it as unavailable. Use the market data from the previous task.""" + format_data_block(data, "fundamental"),
         expected_output=f"""A fundamental analysis report for {symbol} including:
         - Valuation assessment with specific metrics from tool output
         - Profitability analysis
@@ -136,6 +199,7 @@ def create_stock_research_crew(symbol: str, analysis_type: str = "full") -> Crew
         - Overall fundamental rating (Strong Buy to Strong Sell)""",
         agent=fundamental_analyst_agent,
         context=[market_data_task],
+        async_execution=parallel,
     )
     
     # ==========================================
@@ -158,7 +222,7 @@ def create_stock_research_crew(symbol: str, analysis_type: str = "full") -> Crew
 
         Derive entry, stop-loss, and target prices from the support/resistance
         levels provided by the tools. Do not reference indicators (Stochastic,
-        ADX, Fibonacci, candlestick patterns) that are not in your tool output.""",
+        ADX, Fibonacci, candlestick patterns) that are not in your tool output.""" + format_data_block(data, "technical"),
         expected_output=f"""A technical analysis report for {symbol} containing:
         - Current trend assessment (short/medium/long term)
         - Key indicator readings (RSI, MACD, Bollinger Bands, ATR)
@@ -168,6 +232,7 @@ def create_stock_research_crew(symbol: str, analysis_type: str = "full") -> Crew
         - Volume analysis""",
         agent=technical_analyst_agent,
         context=[market_data_task],
+        async_execution=parallel,
     )
     
     # ==========================================
@@ -190,7 +255,7 @@ def create_stock_research_crew(symbol: str, analysis_type: str = "full") -> Crew
         - Key risks to monitor
         - Trigger points for review
         
-        Think from the perspective of an Indian retail investor with moderate risk appetite.""",
+        Think from the perspective of an Indian retail investor with moderate risk appetite.""" + format_data_block(data, "strategy"),
         expected_output=f"""An investment strategy report for {symbol} containing:
         - Clear recommendation (Buy/Hold/Sell)
         - Conviction level (High/Medium/Low)
@@ -206,12 +271,18 @@ def create_stock_research_crew(symbol: str, analysis_type: str = "full") -> Crew
     # ==========================================
     # Task 6: Write Final Report
     # ==========================================
+    if data:
+        price_source = f"""take the verified current price of {symbol} from the
+        prefetched "Get Stock Price" output below"""
+    else:
+        price_source = f"""call "Get Stock Price" for {symbol} to get the
+        verified current price"""
+
     report_task = Task(
         description=f"""Create a comprehensive, well-structured research report for {symbol}:
 
         STEP 1 - VERIFY DATA (MANDATORY):
-        Before writing anything, call "Get Stock Price" for {symbol} to get the
-        verified current price. This is your ground truth. Every price mention
+        Before writing anything, {price_source}. This is your ground truth. Every price mention
         in the report must be consistent with this verified price.
 
         STEP 2 - Compile all findings from the other agents:
@@ -245,7 +316,9 @@ def create_stock_research_crew(symbol: str, analysis_type: str = "full") -> Crew
         5. Do not introduce new statistics or price targets beyond what the
            analysis contains.
 
-        End with a clear action statement and a standard investment disclaimer.""",
+        End with a clear action statement and a standard investment disclaimer.""" + format_data_block(
+            data, "market", tools=["Get Stock Price"]
+        ),
         expected_output=f"""A professional research report for {symbol} with:
         - Current price verified against Get Stock Price tool output
         - Clear markdown structure with section headings
@@ -265,7 +338,7 @@ def create_stock_research_crew(symbol: str, analysis_type: str = "full") -> Crew
         tasks = [market_data_task, technical_task, report_task]
     elif analysis_type == "technical-only":
         tasks = [market_data_task, technical_task]
-    else:  # full analysis
+    else:  # full analysis (news, fundamental, technical run side by side)
         tasks = [
             market_data_task,
             news_analysis_task,
@@ -275,6 +348,13 @@ def create_stock_research_crew(symbol: str, analysis_type: str = "full") -> Crew
             report_task,
         ]
     
+    # Per-task callbacks: crew-level task_callback is looked up through the
+    # (shared) agents, so concurrent analyses would report to each other
+    if on_task_complete:
+        progress = _task_progress(on_task_complete, len(tasks))
+        for task in tasks:
+            task.callback = progress
+
     # ==========================================
     # Create and return the crew
     # ==========================================
@@ -295,7 +375,11 @@ def create_stock_research_crew(symbol: str, analysis_type: str = "full") -> Crew
     return crew
 
 
-async def analyze_stock(symbol: str, analysis_type: str = "full") -> str:
+async def analyze_stock(
+    symbol: str,
+    analysis_type: str = "full",
+    on_task_complete: Optional[TaskProgressCallback] = None,
+) -> str:
     """
     Run complete stock analysis and return the report.
 
@@ -305,32 +389,199 @@ async def analyze_stock(symbol: str, analysis_type: str = "full") -> str:
     Args:
         symbol: Stock symbol (e.g., 'RELIANCE')
         analysis_type: 'full', 'quick', or 'technical-only'
+        on_task_complete: Optional progress callback (see
+            create_stock_research_crew); it runs on the crew's threads
 
     Returns:
         Formatted research report string
     """
     import asyncio
-    return await asyncio.to_thread(analyze_stock_sync, symbol, analysis_type)
+    return await asyncio.to_thread(analyze_stock_sync, symbol, analysis_type, on_task_complete)
+
 
+class _SharedRun:
+    """An analysis in progress that later callers for the same symbol attach to.
 
-def analyze_stock_sync(symbol: str, analysis_type: str = "full") -> str:
+    Every attached progress callback receives all task completions, including
+    those from before it attached. A callback that raises (e.g. a cancelled
+    bot job) detaches that caller alone; the crew is stopped only once every
+    caller has detached.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._events: list[tuple] = []
+        self._listeners: dict[int, Optional[TaskProgressCallback]] = {}
+        self._detached: dict[int, Exception] = {}
+        self._futures: dict[int, Future] = {}
+        self._done = False
+        self._result: Optional[str] = None
+        self._error: Optional[BaseException] = None
+
+    def _notify(self, token: int, callback: Optional[TaskProgressCallback], event: tuple) -> None:
+        """Deliver one event; caller holds the lock."""
+        if callback is None:
+            return
+        try:
+            callback(*event)
+        except Exception as e:
+            self._listeners.pop(token, None)
+            self._detached[token] = e
+            self._futures[token].set_exception(e)
+
+    def _resolve(self, future: Future) -> None:
+        if self._error is not None:
+            future.set_exception(self._error)
+        else:
+            future.set_result(self._result)
+
+    def attach(self, callback: Optional[TaskProgressCallback]) -> Future:
+        """Listen for task completions.
+
+        Returns a future for the shared report, or the error that ended the
+        run or detached this caller.
+        """
+        with self._lock:
+            token = next(self._ids)
+            future = self._futures[token] = Future()
+            self._listeners[token] = callback
+            for event in self._events:
+                self._notify(token, callback, event)
+            if self._done and not future.done():
+                self._resolve(future)
+            return future
+
+    def publish(self, output: TaskOutput, completed: int, total: int) -> None:
+        """The crew's progress callback."""
+        with self._lock:
+            event = (output, completed, total)
+            self._events.append(event)
+            for token, callback in list(self._listeners.items()):
+                self._notify(token, callback, event)
+            if not self._listeners:
+                raise list(self._detached.values())[-1]
+
+    def finish(self, result: Optional[str] = None, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self._done = True
+            self._result, self._error = result, error
+            for future in self._futures.values():
+                if not future.done():
+                    self._resolve(future)
+
+
+# Finished reports by (symbol, analysis type), served for REPORT_CACHE_TTL_MINUTES
+_reports = get_cache("report")
+_runs_lock = threading.Lock()
+_runs: dict[tuple, _SharedRun] = {}
+
+
+def _run_key(symbol: str, analysis_type: str) -> tuple:
+    return (symbol.upper().strip(), analysis_type)
+
+
+def join_analysis(
+    symbol: str,
+    analysis_type: str = "full",
+    on_task_complete: Optional[TaskProgressCallback] = None,
+) -> Optional[Future]:
+    """Attach to the analysis of `symbol` already running, if any.
+
+    Takes no thread: the returned future resolves to the shared report (see
+    analyze_stock_sync) when the run finishes. None if no such analysis is
+    running.
+    """
+    with _runs_lock:
+        run = _runs.get(_run_key(symbol, analysis_type))
+    return run.attach(on_task_complete) if run is not None else None
+
+
+def claim_analysis(
+    symbol: str,
+    analysis_type: str = "full",
+    on_task_complete: Optional[TaskProgressCallback] = None,
+) -> tuple[Future, Optional[Callable[[], None]]]:
+    """Attach to the running analysis of `symbol`, or register a new one.
+
+    Returns a future for the caller's report and, when this call registered
+    the run, the function that runs it (blocking; call it on a worker
+    thread). Callers arriving before it is called attach to the same run.
+    """
+    key = _run_key(symbol, analysis_type)
+    with _runs_lock:
+        run = _runs.get(key)
+        leader = run is None
+        if leader:
+            run = _runs[key] = _SharedRun()
+    future = run.attach(on_task_complete)
+    return future, (functools.partial(_lead, run, key) if leader else None)
+
+
+def _lead(run: _SharedRun, key: tuple) -> None:
+    """Produce the report of a registered run and hand it to every caller."""
+    try:
+        report = _reports.get(key)
+        if report is None:
+            # Reports saved by an earlier run (or another process) count as well
+            stored = latest_report(*key, max_age_minutes=settings.report_cache_ttl_minutes)
+            report = stored["report"] if stored is not None else None
+        if report is None:
+            report = _run_analysis(*key, run.publish)
+            _reports.set(key, report)
+    except BaseException as e:
+        run.finish(error=e)
+        raise
+    else:
+        run.finish(result=report)
+    finally:
+        with _runs_lock:
+            _runs.pop(key, None)
+
+
+def analyze_stock_sync(
+    symbol: str,
+    analysis_type: str = "full",
+    on_task_complete: Optional[TaskProgressCallback] = None,
+) -> str:
     """
     Synchronous version of stock analysis.
+
+    Every new report is saved to the report store (data/reports). A report
+    finished within REPORT_CACHE_TTL_MINUTES, in memory or in the store, is
+    returned as is, and a request for a symbol whose analysis is already
+    running waits for that run instead of starting another crew. Tool outputs
+    are prefetched before kickoff unless CREW_PREFETCH_DATA is off.
     
     Args:
         symbol: Stock symbol (e.g., 'RELIANCE')
         analysis_type: 'full', 'quick', or 'technical-only'
+        on_task_complete: Optional progress callback (see
+            create_stock_research_crew), so callers can show each section
+            as soon as its agent finishes; callers attached to a running
+            analysis first receive the tasks it has already finished
         
     Returns:
         Formatted research report string
     """
-    crew = create_stock_research_crew(symbol, analysis_type)
+    future, lead = claim_analysis(symbol, analysis_type, on_task_complete)
+    if lead is not None:
+        lead()
+    return future.result()
+
+
+def _run_analysis(symbol: str, analysis_type: str, on_task_complete: TaskProgressCallback) -> str:
+    """Prefetch, run the crew, extract the final report and store it."""
+    data = prefetch_data(symbol, analysis_type) if settings.crew_prefetch_data else None
+    crew = create_stock_research_crew(symbol, analysis_type, data=data, on_task_complete=on_task_complete)
     result = crew.kickoff()
     
     # Extract the final output
     if hasattr(result, 'raw'):
-        return result.raw
+        report = result.raw
     elif hasattr(result, 'output'):
-        return result.output
+        report = result.output
     else:
-        return str(result)
+        report = str(result)
+    save_report(symbol, analysis_type, report, data=data)
+    return report
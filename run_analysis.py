@@ -20,6 +20,7 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.markdown import Markdown
 
 from config import settings
+from crews.report_store import latest_report
 from crews.research_crew import analyze_stock_sync
 
 
@@ -76,6 +77,9 @@ def run_analysis(symbol: str, analysis_type: str = "full"):
         console.print(report)
     
     console.print("\n" + "=" * 60)
+    stored = latest_report(symbol, analysis_type)
+    if stored:
+        console.print(f"[dim]📁 Saved as {settings.reports_dir / stored['path']} ({stored['created_at']})[/dim]")
     console.print("[dim]⚠️ Disclaimer: For educational purposes only. Not financial advice.[/dim]")
 
 
@@ -113,6 +117,83 @@ def quick_check(symbol: str):
         console.print(f"[red]❌ Error: {e}[/red]")
 
 
+def run_screen(universe: str = "NIFTY50", criteria: str = "", limit: int = 20):
+    """Screen a universe for technical signals and print the ranked matches."""
+    import json
+    from rich.table import Table
+    from tools.screener import screen_stocks
+
+    console.print(f"\n🔎 Screening [bold]{universe}[/bold]"
+                  f"{f' for {criteria}' if criteria else ''}...\n")
+
+    try:
+        result = json.loads(screen_stocks.run(universe, criteria, limit))
+    except Exception as e:
+        console.print(f"[red]❌ Error: {e}[/red]")
+        return
+
+    if "error" in result:
+        console.print(f"[red]❌ Error: {result['error']}[/red]")
+        return
+
+    table = Table(title=f"{result['universe']}: {result['matches_count']} of {result['scanned']} stocks match")
+    table.add_column("#", justify="right")
+    table.add_column("Symbol", style="cyan")
+    table.add_column("Price", justify="right")
+    table.add_column("RSI", justify="right")
+    table.add_column("Vol x", justify="right")
+    table.add_column("Overall")
+    table.add_column("Signals")
+
+    for i, match in enumerate(result["matches"], 1):
+        table.add_row(
+            str(i),
+            match["symbol"],
+            f"₹{match['price']:,.2f}" if match["price"] is not None else "N/A",
+            f"{match['rsi_14']:.1f}" if match["rsi_14"] is not None else "N/A",
+            f"{match['volume_ratio']:.2f}" if match["volume_ratio"] is not None else "N/A",
+            match["overall_signal"],
+            ", ".join(s["signal"] for s in match["signals"]),
+        )
+
+    console.print(table)
+    if result["missing"]:
+        console.print(f"[dim]No data: {', '.join(result['missing'])}[/dim]")
+
+
+def print_prewarm(summary: dict):
+    """Print the outcome of one cache pre-warm run."""
+    from tools.prewarm import IST
+
+    failed = summary["failed"]
+    console.print(f"✅ Warmed {summary['symbols']} stocks ({summary['calls']} calls) "
+                  f"in {summary['seconds']}s at {datetime.now(IST):%H:%M} IST")
+    if failed:
+        console.print(f"[dim]Failed ({len(failed)}): {', '.join(failed)}[/dim]")
+
+
+def run_prewarm(schedule: bool = False):
+    """Pre-warm NIFTY 50 caches once, or on the pre-warm schedule until interrupted."""
+    from tools.prewarm import next_prewarm, prewarm, run_scheduler
+
+    if not schedule:
+        console.print("\n🔥 Pre-warming NIFTY 50 caches...\n")
+        print_prewarm(prewarm())
+        return
+
+    console.print(f"\n🔥 Pre-warm scheduler started, next run at "
+                  f"[bold]{next_prewarm():%a %H:%M} IST[/bold] (Ctrl+C to stop)\n")
+
+    def on_run(summary: dict):
+        print_prewarm(summary)
+        console.print(f"[dim]Next run at {next_prewarm():%a %H:%M} IST[/dim]")
+
+    try:
+        run_scheduler(on_run)
+    except KeyboardInterrupt:
+        console.print("\n👋 Pre-warm scheduler stopped")
+
+
 def list_stocks():
     """List popular stocks."""
     from config import NIFTY50_STOCKS, SECTORS
@@ -139,6 +220,10 @@ Examples:
   python run_analysis.py TCS --quick       # Quick price check
   python run_analysis.py INFY --type quick # Quick AI analysis
   python run_analysis.py --list            # List stocks
+  python run_analysis.py --screen          # Screen NIFTY 50 for signals
+  python run_analysis.py --screen IT --criteria rsi_oversold,volume_spike
+  python run_analysis.py --prewarm         # Refresh NIFTY 50 caches once
+  python run_analysis.py --prewarm --schedule  # Pre-open and intraday refreshes
         """,
     )
     
@@ -167,6 +252,32 @@ Examples:
         help="List popular stocks",
     )
     
+    parser.add_argument(
+        "--screen", "-s",
+        nargs="?",
+        const="NIFTY50",
+        metavar="UNIVERSE",
+        help="Screen NIFTY50 (default), a sector, or comma-separated symbols for technical signals",
+    )
+    
+    parser.add_argument(
+        "--criteria",
+        default="",
+        help="Comma-separated screener rules that must all match (e.g., rsi_oversold,volume_spike)",
+    )
+    
+    parser.add_argument(
+        "--prewarm",
+        action="store_true",
+        help="Refresh cached prices, indicators, index data, FII/DII and news for NIFTY 50",
+    )
+    
+    parser.add_argument(
+        "--schedule",
+        action="store_true",
+        help="With --prewarm, keep running: pre-open warm-up, then refreshes during market hours",
+    )
+    
     args = parser.parse_args()
     
     console.print("\n[bold blue]🇮🇳 Stock Research Assistant[/bold blue]")
@@ -176,6 +287,14 @@ Examples:
         list_stocks()
         return
     
+    if args.screen:
+        run_screen(args.screen, args.criteria)
+        return
+    
+    if args.prewarm:
+        run_prewarm(args.schedule)
+        return
+    
     if not args.symbol:
         parser.print_help()
         console.print("\n[yellow]💡 Tip: Try 'python run_analysis.py RELIANCE'[/yellow]\n")
@@ -160,6 +160,18 @@ def sample_news_data() -> dict:
 # Mock Fixtures
 # ============================================================
 
+@pytest.fixture(autouse=True)
+def reset_shared_stores(tmp_path, monkeypatch):
+    """Start every test with empty tool caches, a private disk cache and report store."""
+    from tools.cache import clear_all_caches
+
+    monkeypatch.setattr("tools.price_store._disk_dir", tmp_path / "ohlcv")
+    monkeypatch.setattr("crews.report_store._reports_dir", tmp_path / "reports")
+    clear_all_caches()
+    yield
+    clear_all_caches()
+
+
 @pytest.fixture
 def mock_yfinance():
     """Mock yfinance to avoid real API calls in unit tests."""
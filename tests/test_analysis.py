@@ -286,6 +286,31 @@ class TestPriceActionAnalysis:
                 if isinstance(data["support"], (int, float)) and isinstance(data["resistance"], (int, float)):
                     assert data["support"] < data["resistance"], "Support must be below resistance"
 
+    @pytest.mark.unit
+    def test_swing_points_use_configured_window(self):
+        """Swing highs/lows beat the configured number of bars on each side."""
+        from tools.analysis import analyze_price_action, _cache
+
+        highs = [10, 12, 11, 15, 13, 12, 14, 18, 16, 17, 13, 12, 11]
+        df = pd.DataFrame({
+            "Open": highs,
+            "High": highs,
+            "Low": [h - 2 for h in highs],
+            "Close": [h - 1 for h in highs],
+            "Volume": [1000] * len(highs),
+        }, index=pd.bdate_range(end="2026-02-06", periods=len(highs)), dtype=float)
+
+        with patch("tools.analysis.get_ohlcv", return_value=df):
+            data = json.loads(analyze_price_action.func("RELIANCE"))
+            with patch.dict("tools.analysis.TECHNICAL_CONFIG", {"swing_left_bars": 1, "swing_right_bars": 1}):
+                _cache.clear()
+                narrow = json.loads(analyze_price_action.func("RELIANCE"))
+
+        assert data["swing_points"]["recent_swing_highs"] == [15.0, 18.0]
+        assert data["swing_points"]["recent_swing_lows"] == [10.0]
+        # Most recent three of 12, 15, 18, 17
+        assert narrow["swing_points"]["recent_swing_highs"] == [15.0, 18.0, 17.0]
+
 
 class TestPivotPointCalculation:
     """Tests for standard daily pivot point calculation."""
@@ -528,7 +553,7 @@ class TestFundamentalRating:
         mock_ticker = MagicMock()
         mock_ticker.info = info
 
-        with patch("tools.analysis.yf.Ticker", return_value=mock_ticker):
+        with patch("tools.company_profile.yf.Ticker", return_value=mock_ticker):
             result = json.loads(get_fundamental_metrics.func("TEST"))
 
         assert result["overall_rating"] == "STRONG BUY"
@@ -545,7 +570,7 @@ class TestFundamentalRating:
         mock_ticker = MagicMock()
         mock_ticker.info = info
 
-        with patch("tools.analysis.yf.Ticker", return_value=mock_ticker):
+        with patch("tools.company_profile.yf.Ticker", return_value=mock_ticker):
             result = json.loads(get_fundamental_metrics.func("TEST"))
 
         assert result["overall_rating"] == "BUY"
@@ -562,7 +587,7 @@ class TestFundamentalRating:
         mock_ticker = MagicMock()
         mock_ticker.info = info
 
-        with patch("tools.analysis.yf.Ticker", return_value=mock_ticker):
+        with patch("tools.company_profile.yf.Ticker", return_value=mock_ticker):
             result = json.loads(get_fundamental_metrics.func("TEST"))
 
         assert result["overall_rating"] == "HOLD"
@@ -583,7 +608,7 @@ class TestFundamentalRating:
         mock_ticker = MagicMock()
         mock_ticker.info = info
 
-        with patch("tools.analysis.yf.Ticker", return_value=mock_ticker):
+        with patch("tools.company_profile.yf.Ticker", return_value=mock_ticker):
             result = json.loads(get_fundamental_metrics.func("TEST"))
 
         assert result["overall_rating"] == "SELL"
@@ -600,7 +625,7 @@ class TestFundamentalRating:
         mock_ticker = MagicMock()
         mock_ticker.info = info
 
-        with patch("tools.analysis.yf.Ticker", return_value=mock_ticker):
+        with patch("tools.company_profile.yf.Ticker", return_value=mock_ticker):
             result = json.loads(get_fundamental_metrics.func("TEST"))
 
         assert result["overall_rating"] == "STRONG SELL"
@@ -615,7 +640,7 @@ class TestFundamentalRating:
         mock_ticker = MagicMock()
         mock_ticker.info = info
 
-        with patch("tools.analysis.yf.Ticker", return_value=mock_ticker):
+        with patch("tools.company_profile.yf.Ticker", return_value=mock_ticker):
             result = json.loads(get_fundamental_metrics.func("TEST"))
 
         assert result["overall_rating"] == "INSUFFICIENT DATA"
@@ -599,6 +599,58 @@ class TestRenderAIAnalysis:
         app_module.render_ai_analysis("RELIANCE")
         assert mock_st.download_button.called
 
+    @pytest.mark.unit
+    def test_render_ai_shows_latest_saved_report(self, app_module, mock_st):
+        """Without a report this session, the latest saved one is offered."""
+        from crews.report_store import save_report
+
+        save_report("INFY", "full", "# Saved INFY report")
+        mock_st.button.return_value = False
+        mock_st.columns.return_value = [MagicMock(), MagicMock()]
+
+        app_module.render_ai_analysis("INFY")
+
+        assert mock_st.session_state["report_INFY"] == "# Saved INFY report"
+        assert mock_st.download_button.called
+        assert "Saved report from" in mock_st.info.call_args.args[0]
+
+    @pytest.mark.unit
+    def test_render_ai_ignores_old_saved_report(self, app_module, mock_st):
+        """Saved reports older than the fallback window are not shown."""
+        from config import settings
+        from crews.report_store import save_report
+
+        save_report("WIPRO", "full", "# Old WIPRO report")
+        mock_st.button.return_value = False
+
+        with patch.object(settings, "report_fallback_max_age_minutes", -1):
+            app_module.render_ai_analysis("WIPRO")
+
+        assert "report_WIPRO" not in mock_st.session_state
+        assert not mock_st.download_button.called
+
+    @pytest.mark.unit
+    def test_render_ai_streams_sections(self, app_module, mock_st):
+        """Finished agents' sections render before the final report."""
+        from config import settings
+
+        def run_analysis(symbol, analysis_type, on_task_complete):
+            on_task_complete(MagicMock(agent="Technical Analyst", raw="RSI is neutral"), 1, 2)
+            on_task_complete(MagicMock(agent="Research Report Writer", raw="# Report"), 2, 2)
+            return "# Report"
+
+        mock_st.button.return_value = True
+        mock_st.columns.return_value = [MagicMock(), MagicMock()]
+        with patch.object(settings, "mistral_api_key", "test_key"), \
+             patch("crews.research_crew.analyze_stock_sync", side_effect=run_analysis):
+            app_module.render_ai_analysis("TCS")
+
+        rendered = [c.args[0] for c in mock_st.markdown.call_args_list if c.args]
+        assert "**✅ 📈 Technical Analysis**" in rendered
+        assert "RSI is neutral" in rendered
+        assert rendered.index("RSI is neutral") < rendered.index("**✅ 📝 Research Report**")
+        assert mock_st.session_state["report_TCS"] == "# Report"
+
 
 class TestRenderRangeBar:
     """Tests for _render_range_bar function."""
@@ -646,6 +698,16 @@ class TestFetchChartData:
         assert not result.empty
         assert "Close" in result.columns
 
+    @pytest.mark.unit
+    def test_intraday_chart_limits_bar_age(self, app_module):
+        """Intraday periods refetch stored bars after about a minute; daily ones use the store TTL."""
+        with patch('tools.price_store.get_ohlcv', return_value=pd.DataFrame()) as mock_get:
+            app_module._fetch_chart_data("RELIANCE", "1D")
+            app_module._fetch_chart_data("RELIANCE", "1Y")
+
+        assert mock_get.call_args_list[0].kwargs == {"period": "5d", "interval": "5m", "max_age": 60}
+        assert mock_get.call_args_list[1].kwargs == {"period": "1y", "interval": "1d", "max_age": None}
+
     @pytest.mark.unit
     def test_fetch_chart_data_returns_empty_on_error(self, app_module):
         with patch('yfinance.Ticker', side_effect=Exception("API error")):
@@ -709,9 +771,12 @@ class TestMainFunction:
     @patch('app.render_market_overview')
     def test_main_no_symbol(self, mock_overview, mock_sidebar, mock_header, app_module, mock_st):
         mock_st.columns.return_value = [MagicMock() for _ in range(5)]
-        with patch('app.get_stock_price') as mock_price:
-            mock_price.run.return_value = json.dumps({"current_price": 100, "change_percent": 1})
+        with patch('app.get_quotes') as mock_quotes:
+            mock_quotes.return_value = {
+                "TCS": {"price": 100, "previous_close": 99, "change": 1, "change_percent": 1, "volume": 10},
+            }
             app_module.main()
+        mock_quotes.assert_called_once()
         assert mock_header.called
         assert mock_sidebar.called
 
@@ -0,0 +1,243 @@
+"""
+Tests for the Async Tool Counterparts
+
+Tests cover:
+- Blocking tools run off the event loop
+- Async news scrapers over httpx.AsyncClient
+- Concurrent source fetching in get_stock_news_async
+- Bot handlers not blocking other users
+"""
+
+import asyncio
+import json
+import threading
+import time
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+
+
+SAMPLE_RSS = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel>
+    <item>
+        <title>Reliance Q3 Results: Net profit rises 15%</title>
+        <link>https://economictimes.indiatimes.com/articleshow/1.cms</link>
+        <description>Reliance Industries reported strong results</description>
+        <pubDate>Fri, 07 Feb 2026 10:30:00 +0530</pubDate>
+    </item>
+</channel></rss>
+"""
+
+
+def _async_client(text: str, status_code: int = 200, delay: float = 0.0):
+    """Patchable httpx.AsyncClient whose get() returns a canned response."""
+    response = MagicMock(status_code=status_code, text=text)
+
+    async def get(url):
+        await asyncio.sleep(delay)
+        return response
+
+    client = MagicMock()
+    client.get = AsyncMock(side_effect=get)
+    client.__aenter__ = AsyncMock(return_value=client)
+    client.__aexit__ = AsyncMock(return_value=False)
+    return MagicMock(return_value=client), client
+
+
+def _sync_client(text: str, status_code: int = 200, delay: float = 0.0):
+    """Patchable httpx.Client (used for the shared ET RSS feed) with a canned response."""
+    response = MagicMock(status_code=status_code, text=text)
+
+    def get(url):
+        time.sleep(delay)
+        return response
+
+    client_cls = MagicMock()
+    client = client_cls.return_value.__enter__.return_value
+    client.get = MagicMock(side_effect=get)
+    return client_cls, client
+
+
+class TestRunToolAsync:
+    """Tests for run_tool_async."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_runs_in_worker_thread(self):
+        from tools.async_tools import run_tool_async
+
+        tool = MagicMock()
+        tool.run.side_effect = lambda symbol: threading.current_thread().name
+
+        thread_name = await run_tool_async(tool, "TCS")
+
+        tool.run.assert_called_once_with("TCS")
+        assert thread_name.startswith("tool-worker")
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_slow_tool_does_not_block_loop(self):
+        from tools.async_tools import run_tool_async
+
+        tool = MagicMock()
+        tool.run.side_effect = lambda *args: time.sleep(0.3) or "{}"
+        ticks = []
+
+        async def ticker():
+            for _ in range(3):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.05)
+
+        start = time.monotonic()
+        await asyncio.gather(run_tool_async(tool, "SLOW"), ticker())
+
+        # The ticker kept running while the tool slept in its thread
+        assert ticks[-1] - start < 0.25
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_errors_propagate(self):
+        from tools.async_tools import run_tool_async
+
+        tool = MagicMock()
+        tool.run.side_effect = ConnectionError("API down")
+
+        with pytest.raises(ConnectionError):
+            await run_tool_async(tool, "TCS")
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_named_counterpart_wraps_tool(self):
+        from tools import async_tools
+
+        with patch.object(async_tools, "get_stock_price") as mock_price:
+            mock_price.run.return_value = json.dumps({"current_price": 100})
+            result = json.loads(await async_tools.get_stock_price_async("TCS"))
+
+        assert result["current_price"] == 100
+
+
+class TestAsyncNews:
+    """Tests for the httpx.AsyncClient news scrapers."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_et_rss_async_parses_and_caches(self):
+        from tools.news_scraper import scrape_et_rss_news_async, scrape_et_rss_news
+
+        client_cls, client = _sync_client(SAMPLE_RSS)
+        with patch("tools.news_scraper.httpx.Client", client_cls):
+            data = json.loads(await scrape_et_rss_news_async("RELIANCE", 5))
+
+        assert data["source"] == "Economic Times RSS"
+        assert data["articles_count"] == 1
+        # The sync tool now reads the same cache entry
+        with patch("httpx.Client") as sync_client:
+            assert json.loads(scrape_et_rss_news.func("RELIANCE", 5)) == data
+            sync_client.assert_not_called()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_et_rss_async_callers_share_one_download(self):
+        from tools.news_scraper import scrape_et_rss_news_async
+
+        client_cls, client = _sync_client(SAMPLE_RSS, delay=0.2)
+        with patch("tools.news_scraper.httpx.Client", client_cls):
+            results = await asyncio.gather(*(scrape_et_rss_news_async(s, 5) for s in ["RELIANCE", "TCS", "INFY"]))
+
+        assert client.get.call_count == 1
+        assert json.loads(results[0])["articles_count"] == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_async_error_result(self):
+        from tools.news_scraper import scrape_google_news_async
+
+        client = MagicMock()
+        client.get = AsyncMock(side_effect=ConnectionError("Timeout"))
+        data = json.loads(await scrape_google_news_async("TCS", 5, client=client))
+
+        assert data["error"] == "Timeout"
+        assert data["articles"] == []
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_stock_news_async_fetches_sources_concurrently(self):
+        from tools.news_scraper import get_stock_news_async
+
+        client_cls, client = _async_client(SAMPLE_RSS, delay=0.2)
+        rss_cls, rss_client = _sync_client(SAMPLE_RSS, delay=0.2)
+        with patch("tools.news_scraper.httpx.AsyncClient", client_cls), \
+             patch("tools.news_scraper.httpx.Client", rss_cls):
+            start = time.monotonic()
+            data = json.loads(await get_stock_news_async("RELIANCE", 5))
+            elapsed = time.monotonic() - start
+
+        assert client.get.call_count == 2
+        assert rss_client.get.call_count == 1
+        assert elapsed < 0.5  # three 0.2s requests in parallel, not in series
+        assert set(data["sources_status"]) == {"et_rss", "economic_times", "google_news"}
+        assert data["total_articles"] >= 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_stock_news_async_cancels_sources_past_deadline(self):
+        from tools import news_scraper
+
+        client_cls, client = _async_client(SAMPLE_RSS, delay=2.0)
+        rss_cls, _ = _sync_client(SAMPLE_RSS, delay=0.5)
+        with patch("tools.news_scraper.httpx.AsyncClient", client_cls), \
+             patch("tools.news_scraper.httpx.Client", rss_cls), \
+             patch.object(news_scraper.settings, "news_deadline_seconds", 0.1):
+            start = time.monotonic()
+            data = json.loads(await news_scraper.get_stock_news_async("RELIANCE", 5))
+            elapsed = time.monotonic() - start
+
+        assert elapsed < 1.0
+        assert set(data["sources_status"].values()) == {"timed out after 0.1s"}
+        assert data["articles"] == []
+
+
+class TestBotDoesNotBlock:
+    """A slow symbol should not stall other users."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_slow_technical_does_not_block_quick(self):
+        with patch.dict("os.environ", {"MISTRAL_API_KEY": "test"}):
+            from bot.telegram_bot import StockResearchBot
+            bot = StockResearchBot(token="12345:ABCtest")
+
+        def make_update():
+            update = MagicMock()
+            update.callback_query = None
+            update.message.reply_text = AsyncMock()
+            return update
+
+        def make_context(symbol):
+            context = MagicMock()
+            context.args = [symbol]
+            context.bot.send_chat_action = AsyncMock()
+            return context
+
+        slow_update, fast_update = make_update(), make_update()
+        finished = []
+
+        with patch("bot.telegram_bot.calculate_technical_indicators") as mock_tech, \
+             patch("bot.telegram_bot.get_stock_price") as mock_price, \
+             patch("bot.telegram_bot.get_stock_info") as mock_info:
+            mock_tech.run.side_effect = lambda *a: time.sleep(0.5) or json.dumps({"error": "slow"})
+            mock_price.run.return_value = json.dumps({"error": "x"})
+            mock_info.run.return_value = json.dumps({})
+
+            async def slow():
+                await bot.technical_command(slow_update, make_context("SLOW"))
+                finished.append("slow")
+
+            async def fast():
+                await asyncio.sleep(0.05)
+                await bot.quick_command(fast_update, make_context("FAST"))
+                finished.append("fast")
+
+            await asyncio.gather(slow(), fast())
+
+        assert finished == ["fast", "slow"]
@@ -0,0 +1,392 @@
+"""
+Tests for the Unified Tool Cache
+
+Tests cover:
+- TTL expiry and stale reads
+- LRU eviction
+- Hit/miss/eviction counters
+- Coalescing of concurrent misses (single-flight)
+- Forced reloads in a refreshing() context
+- Namespace registry sized from Settings
+- Tool modules sharing the registry
+"""
+
+import json
+import threading
+import time
+import pytest
+from unittest.mock import patch, MagicMock
+import numpy as np
+import pandas as pd
+
+
+class TestTTLCache:
+    """Tests for TTLCache."""
+
+    @pytest.mark.unit
+    def test_set_and_get(self):
+        from tools.cache import TTLCache
+
+        cache = TTLCache("test", ttl=60, max_size=10)
+        cache.set("a", {"x": 1})
+
+        assert cache.get("a") == {"x": 1}
+        assert "a" in cache
+        assert len(cache) == 1
+
+    @pytest.mark.unit
+    def test_expired_entry_is_a_miss_but_readable_stale(self):
+        from tools.cache import TTLCache
+
+        cache = TTLCache("test", ttl=60, max_size=10)
+        cache.set("a", 1)
+        cache._data["a"]["timestamp"] -= 61
+
+        assert cache.get("a") is None
+        assert cache.get_stale("a") == 1
+
+    @pytest.mark.unit
+    def test_max_age_tightens_ttl_per_lookup(self):
+        from tools.cache import TTLCache
+
+        cache = TTLCache("test", ttl=600, max_size=10)
+        cache.set("a", 1)
+        cache._data["a"]["timestamp"] -= 120
+
+        assert cache.get("a") == 1
+        assert cache.get("a", max_age=60) is None
+
+    @pytest.mark.unit
+    def test_lru_eviction(self):
+        from tools.cache import TTLCache
+
+        cache = TTLCache("test", ttl=60, max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", 3)
+
+        assert "b" not in cache
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    @pytest.mark.unit
+    def test_stats_counts_hits_and_misses(self):
+        from tools.cache import TTLCache
+
+        cache = TTLCache("test", ttl=60, max_size=10)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("a")
+        cache.get("missing")
+
+        stats = cache.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(0.667, abs=0.001)
+        assert stats["size"] == 1
+        assert stats["max_size"] == 10
+        assert stats["ttl_seconds"] == 60
+
+    @pytest.mark.unit
+    def test_clear_resets_entries_and_counters(self):
+        from tools.cache import TTLCache
+
+        cache = TTLCache("test", ttl=60, max_size=10)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.stats()["hits"] == 0
+
+    @pytest.mark.unit
+    def test_delete(self):
+        from tools.cache import TTLCache
+
+        cache = TTLCache("test", ttl=60, max_size=10)
+        cache.set("a", 1)
+        cache.delete("a")
+        cache.delete("missing")
+
+        assert "a" not in cache
+
+
+def _run_concurrently(fn, count: int) -> list:
+    """Call `fn` from `count` threads at once and collect results in order."""
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def worker(i):
+        barrier.wait()
+        results[i] = fn()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=10)
+    return results
+
+
+class TestSingleFlight:
+    """Tests for coalescing concurrent misses."""
+
+    @pytest.mark.unit
+    def test_concurrent_misses_share_one_load(self):
+        from tools.cache import TTLCache
+
+        cache = TTLCache("test", ttl=60, max_size=10)
+        calls = []
+
+        def loader():
+            calls.append(1)
+            time.sleep(0.1)  # keep the flight open while the others arrive
+            return {"price": 100}
+
+        results = _run_concurrently(lambda: cache.get_or_load("k", loader), 8)
+
+        assert len(calls) == 1
+        assert results == [{"price": 100}] * 8
+        assert cache.stats()["coalesced"] == 7
+
+    @pytest.mark.unit
+    def test_rejected_results_shared_but_not_cached(self):
+        from tools.cache import TTLCache
+
+        cache = TTLCache("test", ttl=60, max_size=10)
+        result = cache.get_or_load("k", lambda: {"error": "down"}, should_cache=lambda d: "error" not in d)
+
+        assert result == {"error": "down"}
+        assert "k" not in cache
+
+    @pytest.mark.unit
+    def test_loader_error_reaches_every_waiter(self):
+        from tools.cache import TTLCache
+
+        cache = TTLCache("test", ttl=60, max_size=10)
+
+        def loader():
+            time.sleep(0.1)
+            raise RuntimeError("API down")
+
+        def call():
+            try:
+                cache.get_or_load("k", loader)
+            except RuntimeError as e:
+                return str(e)
+
+        assert _run_concurrently(call, 4) == ["API down"] * 4
+        assert "k" not in cache
+
+    @pytest.mark.unit
+    def test_next_call_after_flight_loads_again(self):
+        from tools.cache import TTLCache
+
+        cache = TTLCache("test", ttl=60, max_size=10)
+        calls = []
+
+        def fn():
+            calls.append(1)
+            return len(calls)
+
+        assert cache.single_flight("k", fn) == 1
+        assert cache.single_flight("k", fn) == 2
+
+    @pytest.mark.unit
+    def test_concurrent_stock_price_calls_download_once(self, sample_historical_data):
+        from tools.market_data import get_stock_price
+
+        def slow_history(*args, **kwargs):
+            time.sleep(0.1)
+            return sample_historical_data
+
+        with patch("yfinance.Ticker") as mock_ticker:
+            mock_ticker.return_value.history.side_effect = slow_history
+            mock_ticker.return_value.info = {"marketCap": 1}
+            results = _run_concurrently(lambda: json.loads(get_stock_price.func("RELIANCE")), 6)
+
+        # One history download and one info lookup for six callers
+        assert mock_ticker.return_value.history.call_count == 1
+        assert mock_ticker.call_count == 2
+        assert all(r["symbol"] == "RELIANCE" for r in results)
+
+
+class TestRefreshing:
+    """Tests for the refreshing() context."""
+
+    @pytest.mark.unit
+    def test_fresh_entry_is_reloaded_once_with_new_timestamp(self):
+        from tools.cache import TTLCache, refreshing
+
+        cache = TTLCache("test", ttl=60, max_size=10)
+        cache.set("k", "old")
+        cache._data["k"]["timestamp"] -= 30
+        stored_at = cache._data["k"]["timestamp"]
+        loader = MagicMock(return_value="new")
+
+        with refreshing("test"):
+            assert cache.get("k") is None
+            assert cache.get_or_load("k", loader) == "new"
+            assert cache.get_or_load("k", loader) == "new"
+
+        loader.assert_called_once()
+        assert cache._data["k"]["timestamp"] > stored_at + 29
+
+    @pytest.mark.unit
+    def test_other_namespaces_and_callers_unaffected(self):
+        from tools.cache import TTLCache, refreshing
+
+        cache = TTLCache("test", ttl=60, max_size=10)
+        other = TTLCache("other", ttl=60, max_size=10)
+        cache.set("k", "old")
+        other.set("k", "kept")
+        seen_elsewhere = []
+
+        with refreshing("test"):
+            assert other.get("k") == "kept"
+            worker = threading.Thread(target=lambda: seen_elsewhere.append(cache.get("k")))
+            worker.start()
+            worker.join()
+
+        assert seen_elsewhere == ["old"]
+        assert cache.get("k") == "old"
+
+
+class TestRegistry:
+    """Tests for the namespace registry."""
+
+    @pytest.mark.unit
+    def test_same_namespace_returns_same_cache(self):
+        from tools.cache import get_cache
+
+        assert get_cache("market_data") is get_cache("market_data")
+
+    @pytest.mark.unit
+    def test_new_namespace_sized_from_settings(self):
+        from tools import cache as cache_module
+
+        with patch("tools.cache.settings") as mock_settings:
+            mock_settings.cache_settings.return_value = (3, 7)
+            cache = cache_module.get_cache("test_sized_namespace")
+        try:
+            assert cache.ttl == 180
+            assert cache.max_size == 7
+        finally:
+            cache_module._registry.pop("test_sized_namespace", None)
+
+    @pytest.mark.unit
+    def test_tool_namespaces_registered(self):
+        import tools.analysis  # noqa: F401
+        import tools.institutional  # noqa: F401
+        import tools.market_data  # noqa: F401
+        import tools.news_scraper  # noqa: F401
+        from tools.cache import cache_stats
+
+        stats = cache_stats()
+        for namespace in ("market_data", "news", "ohlcv", "profile", "analysis", "institutional"):
+            assert namespace in stats
+
+    @pytest.mark.unit
+    def test_clear_all_caches(self):
+        from tools.cache import get_cache, clear_all_caches
+
+        get_cache("market_data").set("k", 1)
+        get_cache("news").set("k", 1)
+        clear_all_caches()
+
+        assert len(get_cache("market_data")) == 0
+        assert len(get_cache("news")) == 0
+
+
+class TestToolResultCaching:
+    """Tools reuse results until their input data changes."""
+
+    @pytest.mark.unit
+    def test_fundamentals_computed_once(self):
+        from tools.analysis import get_fundamental_metrics
+
+        with patch("tools.company_profile.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.info = {"longName": "TCS", "trailingPE": 25}
+            first = get_fundamental_metrics.func("TCS")
+            mock_ticker.return_value.info = {"longName": "Changed", "trailingPE": 99}
+            second = get_fundamental_metrics.func("TCS")
+
+        assert first == second
+
+    @pytest.mark.unit
+    def test_fundamentals_recomputed_for_new_quote(self):
+        from tools.analysis import get_fundamental_metrics
+
+        profiles = [
+            {"longName": "TCS", "trailingPE": 25, "regularMarketTime": 1700000000},
+            {"longName": "TCS", "trailingPE": 26, "regularMarketTime": 1700000060},
+        ]
+        with patch("tools.analysis.get_company_profile", side_effect=profiles):
+            first = json.loads(get_fundamental_metrics.func("TCS"))
+            second = json.loads(get_fundamental_metrics.func("TCS"))
+
+        assert first["valuation"]["pe_ratio"] != second["valuation"]["pe_ratio"]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("tool_name, args", [
+        ("calculate_technical_indicators", ("TCS", "6mo")),
+        ("analyze_price_action", ("TCS",)),
+    ])
+    def test_price_tools_keyed_on_latest_bar(self, tool_name, args):
+        """Same bars reuse the result; a new or revised last bar recomputes it."""
+        import tools.analysis as analysis
+
+        days = 120
+        close = np.linspace(1000, 1200, days)
+        df = pd.DataFrame({
+            "Open": close, "High": close + 5, "Low": close - 5, "Close": close,
+            "Volume": np.full(days, 1e6),
+        }, index=pd.bdate_range(end="2026-02-06", periods=days))
+        revised = df.copy()
+        revised.iloc[-1, revised.columns.get_loc("Close")] += 3
+        new_bar = pd.concat([df, df.iloc[[-1]].set_axis([df.index[-1] + pd.offsets.BDay()])])
+
+        tool = getattr(analysis, tool_name)
+        with patch("tools.analysis.get_ohlcv", side_effect=[df, df, revised, new_bar]), \
+             patch("tools.analysis.datetime") as mock_datetime:
+            mock_datetime.now.side_effect = [MagicMock(isoformat=lambda i=i: str(i)) for i in range(4)]
+            results = [json.loads(tool.func(*args))["analysis_date"] for _ in range(4)]
+
+        # Computed on the first call, reused, then recomputed twice
+        assert results == ["0", "0", "1", "2"]
+
+    @pytest.mark.unit
+    def test_errors_not_cached(self):
+        from tools.analysis import get_fundamental_metrics
+        from tools.cache import get_cache
+
+        with patch("tools.company_profile.yf.Ticker", side_effect=Exception("API down")):
+            result = json.loads(get_fundamental_metrics.func("TCS"))
+
+        assert result["DATA_UNAVAILABLE"] is True
+        assert len(get_cache("analysis")) == 0
+
+    @pytest.mark.unit
+    def test_bulk_deals_fetched_once_for_all_symbols(self):
+        from tools.institutional import get_bulk_block_deals
+
+        mock_client = MagicMock()
+        mock_client.get.return_value.status_code = 200
+        mock_client.get.return_value.json.return_value = {
+            "BULK_DEALS_DATA": [
+                {"symbol": "RELIANCE", "clientName": "A", "buySell": "BUY",
+                 "quantityTraded": 100, "tradedPrice": 2500},
+                {"symbol": "TCS", "clientName": "B", "buySell": "SELL",
+                 "quantityTraded": 50, "tradedPrice": 3500},
+            ],
+        }
+
+        with patch("tools.institutional._get_nse_session", return_value=mock_client) as mock_session:
+            reliance = json.loads(get_bulk_block_deals.func("RELIANCE"))
+            tcs = json.loads(get_bulk_block_deals.func("TCS"))
+
+        assert mock_session.call_count == 1
+        assert [d["stock"] for d in reliance["deals"]] == ["RELIANCE"]
+        assert [d["stock"] for d in tcs["deals"]] == ["TCS"]
@@ -46,6 +46,27 @@ class TestRunAnalysisFunction:
 
         mock_sync.assert_called_once_with("RELIANCE", "full")
 
+    @pytest.mark.unit
+    @patch("run_analysis.console")
+    @patch("run_analysis.analyze_stock_sync", return_value="## Buy TCS")
+    @patch("run_analysis.settings")
+    def test_run_analysis_shows_saved_report(self, mock_settings, mock_sync, mock_console):
+        """The stored report's location is printed after the report."""
+        from pathlib import Path
+
+        mock_settings.mistral_api_key = "test-key-123"
+        mock_settings.reports_dir = Path("data/reports")
+        stored = {"path": "TCS/TCS_full_20260206-093000-000000.md", "created_at": "2026-02-06T09:30:00"}
+
+        from run_analysis import run_analysis
+
+        with patch("run_analysis.latest_report", return_value=stored) as mock_latest:
+            run_analysis("TCS", "full")
+
+        mock_latest.assert_called_once_with("TCS", "full")
+        printed_texts = [str(c) for c in mock_console.print.call_args_list]
+        assert any("TCS_full_20260206-093000-000000.md" in t for t in printed_texts)
+
     @pytest.mark.unit
     @patch("run_analysis.console")
     @patch("run_analysis.analyze_stock_sync", side_effect=ValueError("LLM timeout"))
@@ -146,6 +167,79 @@ class TestListStocksFunction:
         assert "NIFTY" in printed_texts or "Sector" in printed_texts
 
 
+class TestRunScreenFunction:
+    """Tests for the run_screen() function."""
+
+    @pytest.mark.unit
+    @patch("run_analysis.console")
+    def test_run_screen_prints_matches(self, mock_console):
+        """run_screen prints a table of ranked matches."""
+        from run_analysis import run_screen
+
+        result = {
+            "universe": "IT", "scanned": 8, "matches_count": 1, "missing": ["LTIM"],
+            "matches": [{
+                "symbol": "INFY", "price": 1450.5, "rsi_14": 27.3, "volume_ratio": 2.4,
+                "overall_signal": "NEUTRAL", "score": 2, "rules": ["rsi_oversold"],
+                "signals": [{"indicator": "RSI", "signal": "OVERSOLD - Potential Buy", "strength": "Strong"}],
+            }],
+        }
+        with patch("tools.screener.screen_stocks") as mock_screen:
+            mock_screen.run.return_value = json.dumps(result)
+            run_screen("IT", "rsi_oversold")
+
+        mock_screen.run.assert_called_once_with("IT", "rsi_oversold", 20)
+        table = mock_console.print.call_args_list[1][0][0]
+        assert table.row_count == 1
+        printed_texts = " ".join(str(c) for c in mock_console.print.call_args_list)
+        assert "LTIM" in printed_texts
+
+    @pytest.mark.unit
+    @patch("run_analysis.console")
+    def test_run_screen_error(self, mock_console):
+        """run_screen prints tool errors."""
+        from run_analysis import run_screen
+
+        with patch("tools.screener.screen_stocks") as mock_screen:
+            mock_screen.run.return_value = json.dumps({"error": "Unknown criteria: foo"})
+            run_screen("NIFTY50", "foo")
+
+        printed_texts = " ".join(str(c) for c in mock_console.print.call_args_list)
+        assert "Unknown criteria" in printed_texts
+
+
+class TestRunPrewarmFunction:
+    """Tests for the run_prewarm() function."""
+
+    @pytest.mark.unit
+    @patch("run_analysis.console")
+    def test_run_prewarm_once(self, mock_console):
+        """run_prewarm prints the summary and failed calls."""
+        from run_analysis import run_prewarm
+
+        summary = {"symbols": 50, "calls": 203, "failed": ["Get Stock Price(TCS)"], "seconds": 12.5}
+        with patch("tools.prewarm.prewarm", return_value=summary) as mock_prewarm:
+            run_prewarm()
+
+        mock_prewarm.assert_called_once_with()
+        printed_texts = " ".join(str(c) for c in mock_console.print.call_args_list)
+        assert "50 stocks" in printed_texts
+        assert "Get Stock Price(TCS)" in printed_texts
+
+    @pytest.mark.unit
+    @patch("run_analysis.console")
+    def test_run_prewarm_schedule_stops_on_interrupt(self, mock_console):
+        """Scheduled mode runs the scheduler until Ctrl+C."""
+        from run_analysis import run_prewarm
+
+        with patch("tools.prewarm.run_scheduler", side_effect=KeyboardInterrupt) as mock_scheduler:
+            run_prewarm(schedule=True)
+
+        mock_scheduler.assert_called_once()
+        printed_texts = " ".join(str(c) for c in mock_console.print.call_args_list)
+        assert "stopped" in printed_texts
+
+
 class TestMainFunction:
     """Tests for main() argparse dispatch."""
 
@@ -197,6 +291,34 @@ class TestMainFunction:
 
         mock_quick.assert_called_once_with("TCS")
 
+    @pytest.mark.unit
+    @patch("run_analysis.run_screen")
+    @patch("run_analysis.console")
+    def test_main_screen_flag(self, mock_console, mock_screen):
+        """main() with --screen dispatches to run_screen, defaulting to NIFTY50."""
+        from run_analysis import main
+
+        with patch("sys.argv", ["run_analysis.py", "--screen"]):
+            main()
+        with patch("sys.argv", ["run_analysis.py", "--screen", "IT", "--criteria", "rsi_oversold"]):
+            main()
+
+        assert mock_screen.call_args_list == [call("NIFTY50", ""), call("IT", "rsi_oversold")]
+
+    @pytest.mark.unit
+    @patch("run_analysis.run_prewarm")
+    @patch("run_analysis.console")
+    def test_main_prewarm_flag(self, mock_console, mock_prewarm):
+        """main() with --prewarm runs once, or on the schedule with --schedule."""
+        from run_analysis import main
+
+        with patch("sys.argv", ["run_analysis.py", "--prewarm"]):
+            main()
+        with patch("sys.argv", ["run_analysis.py", "--prewarm", "--schedule"]):
+            main()
+
+        assert mock_prewarm.call_args_list == [call(False), call(True)]
+
 
 # ---------------------------------------------------------------------------
 # run_bot.py tests
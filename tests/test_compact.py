@@ -0,0 +1,105 @@
+"""
+Tests for Compact Tool Output
+
+Tests cover:
+- Empty-field removal, key abbreviation and number rounding
+- Agent-facing tool copies
+- The COMPACT_TOOL_OUTPUT switch
+"""
+
+import json
+import pytest
+from unittest.mock import patch
+
+
+class TestCompactOutput:
+    """Tests for compact_output / compact_data."""
+
+    @pytest.mark.unit
+    def test_compacts_tool_result(self):
+        from tools.compact import compact_output
+
+        output = json.dumps({
+            "symbol": "TCS",
+            "current_price": 3456.789,
+            "change_percent": -0.012345,
+            "market_cap": 16500000000000.0,
+            "pe_ratio": "N/A",
+            "dividend": None,
+            "support_resistance": {"support_1": 3400.0, "resistance_1": 3512.567},
+            "signals": [],
+        }, indent=2)
+
+        compact = compact_output(output)
+
+        assert "\n" not in compact and ": " not in compact
+        assert json.loads(compact) == {
+            "symbol": "TCS",
+            "cur_price": 3456.79,
+            "chg_pct": -0.0123,
+            "mkt_cap": 16500000000000,
+            "sup_res": {"sup_1": 3400, "res_1": 3512.57},
+            "signals": [],
+        }
+
+    @pytest.mark.unit
+    def test_colliding_keys_keep_original_names(self):
+        from tools.compact import compact_data
+
+        assert compact_data({"current": 1, "cur": 2}) == {"current": 1, "cur": 2}
+        assert compact_data({"cur": 2, "current": 1}) == {"cur": 2, "current": 1}
+
+    @pytest.mark.unit
+    def test_lists_and_flags(self):
+        from tools.compact import compact_data
+
+        data = {"golden_cross": False, "levels": [1.005, None, 0.123456, 7], "news": [{"title": "x", "url": ""}]}
+
+        assert compact_data(data) == {"golden_cross": False, "levels": [1.0, 0.123, 7], "news": [{"title": "x"}]}
+
+    @pytest.mark.unit
+    def test_non_json_passes_through(self):
+        from tools.compact import compact_output
+
+        assert compact_output("Error: not json") == "Error: not json"
+
+
+class TestAgentTools:
+    """Tests for agent-facing tool copies."""
+
+    @pytest.mark.unit
+    def test_copy_compacts_and_original_stays_pretty(self):
+        from tools.compact import agent_tool
+        from tools.market_data import get_stock_price
+
+        result = {"symbol": "TCS", "current_price": 3456.5, "volume": None}
+        with patch("tools.market_data.get_stock_price.func", return_value=json.dumps(result, indent=2)):
+            agent_copy = agent_tool(get_stock_price)
+            compact = agent_copy.run("TCS")
+            pretty = get_stock_price.run("TCS")
+
+        assert agent_copy.name == get_stock_price.name
+        assert agent_copy.description == get_stock_price.description
+        assert compact == '{"symbol":"TCS","cur_price":3456.5}'
+        assert json.loads(pretty) == result
+
+    @pytest.mark.unit
+    def test_switch_off_returns_tool_output(self):
+        from config import settings
+        from tools.compact import agent_output
+
+        pretty = json.dumps({"current_price": 1.5}, indent=2)
+
+        with patch.object(settings, "compact_tool_output", False):
+            assert agent_output(pretty) == pretty
+
+    @pytest.mark.unit
+    def test_agents_get_compact_copies(self):
+        with patch.dict('os.environ', {'MISTRAL_API_KEY': 'test_key'}):
+            from agents.technical_agent import technical_analyst_agent
+            from tools.analysis import calculate_technical_indicators
+
+            names = [tool.name for tool in technical_analyst_agent.tools]
+
+            assert calculate_technical_indicators.name in names
+            assert calculate_technical_indicators not in technical_analyst_agent.tools
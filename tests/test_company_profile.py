@@ -0,0 +1,89 @@
+"""
+Tests for the Shared Company Profile
+
+Tests cover:
+- One info request shared by price, info, fundamentals and peers
+- Expiry
+- Empty responses and errors are not stored
+- Callers cannot mutate the shared entry
+"""
+
+import json
+import pytest
+from unittest.mock import patch, MagicMock
+
+
+class TestGetCompanyProfile:
+    """Tests for get_company_profile."""
+
+    @pytest.mark.unit
+    def test_info_fetched_once(self):
+        from tools.company_profile import get_company_profile
+
+        with patch("tools.company_profile.yf.Ticker") as mock_ticker:
+            info_prop = MagicMock(return_value={"longName": "Reliance"})
+            type(mock_ticker.return_value).info = property(lambda self: info_prop())
+
+            first = get_company_profile("RELIANCE.NS")
+            second = get_company_profile("RELIANCE.NS")
+
+        assert first == second == {"longName": "Reliance"}
+        assert info_prop.call_count == 1
+
+    @pytest.mark.unit
+    def test_expired_profile_refetched(self):
+        from tools.company_profile import get_company_profile, _profiles
+
+        with patch("tools.company_profile.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.info = {"longName": "TCS"}
+            get_company_profile("TCS.NS")
+            _profiles._data["TCS.NS"]["timestamp"] -= _profiles.ttl + 1
+            get_company_profile("TCS.NS")
+
+        assert mock_ticker.call_count == 2
+
+    @pytest.mark.unit
+    def test_empty_info_not_stored(self):
+        from tools.company_profile import get_company_profile, _profiles
+
+        with patch("tools.company_profile.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.info = {}
+            assert get_company_profile("BADSTOCK.NS") == {}
+
+        assert "BADSTOCK.NS" not in _profiles
+
+    @pytest.mark.unit
+    def test_error_propagates(self):
+        from tools.company_profile import get_company_profile
+
+        with patch("tools.company_profile.yf.Ticker", side_effect=Exception("API down")):
+            with pytest.raises(Exception, match="API down"):
+                get_company_profile("RELIANCE.NS")
+
+    @pytest.mark.unit
+    def test_returned_dict_is_a_copy(self):
+        from tools.company_profile import get_company_profile
+
+        with patch("tools.company_profile.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.info = {"sector": "Energy"}
+            get_company_profile("ONGC.NS")["sector"] = "Changed"
+            assert get_company_profile("ONGC.NS")["sector"] == "Energy"
+
+
+class TestToolsShareProfile:
+    """Price, info and fundamentals tools should share one info request."""
+
+    @pytest.mark.unit
+    def test_tools_share_one_info_request(self, mock_yfinance):
+        from tools.market_data import get_stock_price, get_stock_info, _cache
+        from tools.analysis import get_fundamental_metrics
+
+        info_prop = MagicMock(return_value=dict(mock_yfinance.return_value.info))
+        type(mock_yfinance.return_value).info = property(lambda self: info_prop())
+
+        _cache.clear()
+        assert "error" not in json.loads(get_stock_price.func("RELIANCE"))
+        assert "error" not in json.loads(get_stock_info.func("RELIANCE"))
+        assert "error" not in json.loads(get_fundamental_metrics.func("RELIANCE"))
+
+        assert info_prop.call_count == 1
@@ -264,3 +264,25 @@ class TestReportConfig:
         assert "include_charts" in REPORT_CONFIG
         assert "historical_years" in REPORT_CONFIG
         assert REPORT_CONFIG["historical_years"] > 0
+
+
+class TestCacheSettings:
+    """Tests for per-namespace cache settings."""
+
+    @pytest.mark.unit
+    def test_namespace_override(self):
+        """Test namespaces with their own fields use them."""
+        from config import Settings
+
+        settings = Settings(news_cache_ttl_minutes=5, news_cache_max_size=20, _env_file=None)
+        assert settings.cache_settings("news") == (5, 20)
+
+    @pytest.mark.unit
+    def test_falls_back_to_global_defaults(self):
+        """Test namespaces without overrides use the global cache settings."""
+        from config import Settings
+
+        settings = Settings(cache_ttl_minutes=7, cache_max_size=50, _env_file=None)
+        assert settings.cache_settings("market_data") == (7, 50)
+        # Partial override: profile only overrides its size
+        assert settings.cache_settings("profile") == (7, settings.profile_cache_max_size)
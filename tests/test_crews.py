@@ -5,6 +5,8 @@ Tests cover:
 - Crew creation
 - Task definitions
 - Task dependencies
+- Parallel execution of independent tasks
+- Prefetched tool outputs in task descriptions
 - Crew execution flow
 - Sync/async analysis functions
 - LiteLLM patch for Mistral content blocks
@@ -174,6 +176,43 @@ class TestTaskDependencies:
             assert tasks_with_context > 0
 
 
+class TestParallelExecution:
+    """Tests for running independent analysis tasks concurrently."""
+
+    @pytest.mark.unit
+    def test_full_analysis_runs_middle_tasks_in_parallel(self):
+        """News, fundamental and technical run async between market data and strategy."""
+        with patch.dict('os.environ', {'MISTRAL_API_KEY': 'test_key'}):
+            from crews.research_crew import create_stock_research_crew
+
+            crew = create_stock_research_crew("RELIANCE", "full")
+
+            assert [task.async_execution for task in crew.tasks] == [False, True, True, True, False, False]
+            strategy_task = crew.tasks[4]
+            assert set(map(id, strategy_task.context)) == set(map(id, crew.tasks[1:4]))
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("analysis_type", ["quick", "technical-only"])
+    def test_short_analyses_stay_sequential(self, analysis_type):
+        with patch.dict('os.environ', {'MISTRAL_API_KEY': 'test_key'}):
+            from crews.research_crew import create_stock_research_crew
+
+            crew = create_stock_research_crew("RELIANCE", analysis_type)
+
+            assert not any(task.async_execution for task in crew.tasks)
+
+    @pytest.mark.unit
+    def test_parallel_tasks_can_be_disabled(self):
+        with patch.dict('os.environ', {'MISTRAL_API_KEY': 'test_key'}):
+            from config import settings
+            from crews.research_crew import create_stock_research_crew
+
+            with patch.object(settings, "crew_parallel_tasks", False):
+                crew = create_stock_research_crew("RELIANCE", "full")
+
+            assert not any(task.async_execution for task in crew.tasks)
+
+
 class TestSyncAnalysis:
     """Tests for synchronous analysis function."""
     
@@ -259,6 +298,12 @@ class TestErrorHandling:
 class TestAnalyzeStockSync:
     """Tests for analyze_stock_sync function."""
 
+    @pytest.fixture(autouse=True)
+    def no_prefetch(self):
+        """Keep the prefetch stage offline."""
+        with patch("crews.research_crew.prefetch_data", return_value=None) as mock_prefetch:
+            yield mock_prefetch
+
     @pytest.mark.unit
     def test_sync_returns_raw(self):
         """Test that sync analysis returns result.raw when available."""
@@ -315,6 +360,265 @@ class TestAnalyzeStockSync:
                 assert "plain string result" in result
 
 
+class TestPrefetchedData:
+    """Tests for handing prefetched tool outputs to the tasks."""
+
+    @staticmethod
+    def _data():
+        return {
+            "symbol": "RELIANCE",
+            "fetched_at": "2026-02-06T09:30:00",
+            "sections": {
+                "market": {"Get Stock Price": '{"current_price":2456.5}', "Get Stock Info": '{"sector":"Energy"}'},
+                "news": {"Get Comprehensive Stock News": '{"total_articles":3}'},
+                "fundamental": {"Get Fundamental Metrics": '{"overall_rating":"Buy"}'},
+                "technical": {"Calculate Technical Indicators": '{"overall_signal":"BULLISH"}'},
+                "strategy": {"Get FII/DII Activity": '{"fii":1}'},
+            },
+        }
+
+    @pytest.mark.unit
+    def test_tasks_carry_their_sections(self):
+        with patch.dict('os.environ', {'MISTRAL_API_KEY': 'test_key'}):
+            from crews.research_crew import create_stock_research_crew
+
+            crew = create_stock_research_crew("RELIANCE", "full", data=self._data())
+            market, news, fundamental, technical, strategy, report = (t.description for t in crew.tasks)
+
+            assert '"sector":"Energy"' in market
+            assert '"total_articles":3' in news and '"sector"' not in news
+            assert '"overall_rating":"Buy"' in fundamental
+            assert '"overall_signal":"BULLISH"' in technical
+            assert '"fii":1' in strategy
+            # The report writer verifies the price from the bundle instead of calling the tool
+            assert '"current_price":2456.5' in report
+            assert '"sector"' not in report
+            assert 'call "Get Stock Price"' not in report
+
+    @pytest.mark.unit
+    def test_no_data_keeps_tool_instructions(self):
+        with patch.dict('os.environ', {'MISTRAL_API_KEY': 'test_key'}):
+            from crews.research_crew import create_stock_research_crew
+
+            crew = create_stock_research_crew("RELIANCE", "full")
+
+            assert not any("PREFETCHED DATA" in t.description for t in crew.tasks)
+            assert 'call "Get Stock Price"' in crew.tasks[-1].description
+
+    @pytest.mark.unit
+    def test_sync_prefetches_before_kickoff(self):
+        with patch.dict('os.environ', {'MISTRAL_API_KEY': 'test_key'}):
+            from config import settings
+            from crews.research_crew import analyze_stock_sync
+
+            with patch('crews.research_crew.prefetch_data', return_value=self._data()) as mock_prefetch, \
+                 patch('crews.research_crew.create_stock_research_crew') as mock_create:
+                mock_create.return_value.kickoff.return_value = "report"
+                analyze_stock_sync("RELIANCE", "quick")
+                with patch.object(settings, "crew_prefetch_data", False):
+                    analyze_stock_sync("TCS", "quick")
+
+            mock_prefetch.assert_called_once_with("RELIANCE", "quick")
+            assert mock_create.call_args_list[0].kwargs["data"] == self._data()
+            assert mock_create.call_args_list[1].kwargs["data"] is None
+
+
+class TestTaskProgress:
+    """Tests for reporting task completions while the crew runs."""
+
+    @pytest.mark.unit
+    def test_callback_counts_completed_tasks(self):
+        with patch.dict('os.environ', {'MISTRAL_API_KEY': 'test_key'}):
+            from crewai.tasks.task_output import TaskOutput
+            from crews.research_crew import TASK_LABELS, create_stock_research_crew
+
+            progress = []
+            crew = create_stock_research_crew(
+                "RELIANCE", "quick", on_task_complete=lambda output, done, total: progress.append((output.agent, done, total))
+            )
+            for task in crew.tasks:
+                task.callback(TaskOutput(description=task.description, agent=task.agent.role, raw="done"))
+
+            assert progress == [
+                ("Market Data Analyst", 1, 3),
+                ("Technical Analyst", 2, 3),
+                ("Research Report Writer", 3, 3),
+            ]
+            assert all(role in TASK_LABELS for role, _, _ in progress)
+
+    @pytest.mark.unit
+    def test_parallel_completions_counted_once_each(self):
+        with patch.dict('os.environ', {'MISTRAL_API_KEY': 'test_key'}):
+            from concurrent.futures import ThreadPoolExecutor
+            from crewai.tasks.task_output import TaskOutput
+            from crews.research_crew import create_stock_research_crew
+
+            counts = []
+            crew = create_stock_research_crew("RELIANCE", "full", on_task_complete=lambda output, done, total: counts.append(done))
+            outputs = [TaskOutput(description="d", agent=task.agent.role, raw="") for task in crew.tasks]
+            with ThreadPoolExecutor(max_workers=6) as pool:
+                list(pool.map(lambda pair: pair[0].callback(pair[1]), zip(crew.tasks, outputs)))
+
+            assert sorted(counts) == [1, 2, 3, 4, 5, 6]
+
+    @pytest.mark.unit
+    def test_no_callback_by_default(self):
+        with patch.dict('os.environ', {'MISTRAL_API_KEY': 'test_key'}):
+            from crews.research_crew import create_stock_research_crew
+
+            crew = create_stock_research_crew("RELIANCE", "quick")
+
+            assert all(task.callback is None for task in crew.tasks)
+
+    @pytest.mark.unit
+    def test_sync_passes_callback_to_crew(self):
+        with patch.dict('os.environ', {'MISTRAL_API_KEY': 'test_key'}):
+            from crews.research_crew import analyze_stock_sync
+
+            callback = MagicMock()
+            with patch('crews.research_crew.prefetch_data', return_value=None), \
+                 patch('crews.research_crew.create_stock_research_crew') as mock_create:
+                mock_create.return_value.kickoff.return_value = "report"
+                analyze_stock_sync("RELIANCE", "full", on_task_complete=callback)
+
+            output = MagicMock()
+            mock_create.call_args.kwargs["on_task_complete"](output, 1, 6)
+            callback.assert_called_once_with(output, 1, 6)
+
+
+class TestSharedAnalysis:
+    """Tests for reusing recent reports and attaching to running analyses."""
+
+    @pytest.fixture
+    def crew(self):
+        """Crew whose kickoff reports one task, then blocks until released."""
+        import threading
+
+        state = {"started": threading.Event(), "release": threading.Event(), "runs": 0}
+
+        def create(symbol, analysis_type, data=None, on_task_complete=None):
+            def kickoff():
+                state["runs"] += 1
+                on_task_complete(MagicMock(agent="Market Data Analyst"), 1, 2)
+                state["started"].set()
+                state["release"].wait(timeout=5)
+                on_task_complete(MagicMock(agent="Research Report Writer"), 2, 2)
+                return MagicMock(raw=f"{analysis_type} report {symbol}")
+            return MagicMock(kickoff=kickoff)
+
+        with patch.dict('os.environ', {'MISTRAL_API_KEY': 'test_key'}), \
+             patch('crews.research_crew.prefetch_data', return_value=None), \
+             patch('crews.research_crew.create_stock_research_crew', side_effect=create):
+            yield state
+        state["release"].set()
+
+    @staticmethod
+    def _attached(key, count):
+        import time
+        from crews import research_crew
+
+        deadline = time.time() + 5
+        while time.time() < deadline:
+            run = research_crew._runs.get(key)
+            if run is not None and len(run._listeners) + len(run._detached) >= count:
+                return
+            time.sleep(0.01)
+        raise AssertionError("caller did not attach")
+
+    @pytest.mark.unit
+    def test_recent_report_reused(self, crew):
+        from crews.research_crew import analyze_stock_sync
+        from tools.cache import get_cache
+
+        crew["release"].set()
+        assert analyze_stock_sync("tcs", "full") == "full report TCS"
+        assert analyze_stock_sync("TCS", "full") == "full report TCS"
+        assert analyze_stock_sync("TCS", "quick") == "quick report TCS"
+        assert crew["runs"] == 2
+
+        # Still fresh in the report store after a restart
+        get_cache("report").clear()
+        assert analyze_stock_sync("TCS", "full") == "full report TCS"
+        assert crew["runs"] == 2
+
+        from config import settings
+        get_cache("report").clear()
+        with patch.object(settings, "report_cache_ttl_minutes", 0):
+            analyze_stock_sync("TCS", "full")
+        assert crew["runs"] == 3
+
+    @pytest.mark.unit
+    def test_concurrent_callers_share_one_run(self, crew):
+        from concurrent.futures import ThreadPoolExecutor
+        from crews.research_crew import analyze_stock_sync
+
+        leader_events, follower_events = [], []
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(analyze_stock_sync, "TCS", "full", lambda o, done, total: leader_events.append(done))
+            crew["started"].wait(timeout=5)
+            follower = pool.submit(analyze_stock_sync, "TCS", "full", lambda o, done, total: follower_events.append(done))
+            self._attached(("TCS", "full"), 2)
+            crew["release"].set()
+
+            assert leader.result(timeout=5) == follower.result(timeout=5) == "full report TCS"
+
+        assert crew["runs"] == 1
+        # The follower also receives the task finished before it attached
+        assert leader_events == follower_events == [1, 2]
+
+    @pytest.mark.unit
+    def test_detached_caller_does_not_stop_shared_run(self, crew):
+        from concurrent.futures import ThreadPoolExecutor
+        from crews.research_crew import analyze_stock_sync
+
+        class Cancelled(Exception):
+            pass
+
+        def cancelled(output, done, total):
+            if done == 2:
+                raise Cancelled()
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(analyze_stock_sync, "TCS", "full", cancelled)
+            crew["started"].wait(timeout=5)
+            follower = pool.submit(analyze_stock_sync, "TCS", "full", None)
+            self._attached(("TCS", "full"), 2)
+            crew["release"].set()
+
+            with pytest.raises(Cancelled):
+                leader.result(timeout=5)
+            assert follower.result(timeout=5) == "full report TCS"
+
+    @pytest.mark.unit
+    def test_run_stops_when_every_caller_detaches(self, crew):
+        from crews.research_crew import analyze_stock_sync
+        from tools.cache import get_cache
+
+        def cancelled(output, done, total):
+            raise RuntimeError("cancelled")
+
+        crew["release"].set()
+        with pytest.raises(RuntimeError, match="cancelled"):
+            analyze_stock_sync("TCS", "full", cancelled)
+
+        assert ("TCS", "full") not in get_cache("report")
+
+    @pytest.mark.unit
+    def test_errors_reach_every_caller_and_are_not_cached(self):
+        from crews.research_crew import analyze_stock_sync, _runs
+        from tools.cache import get_cache
+
+        with patch.dict('os.environ', {'MISTRAL_API_KEY': 'test_key'}), \
+             patch('crews.research_crew.prefetch_data', return_value=None), \
+             patch('crews.research_crew.create_stock_research_crew') as mock_create:
+            mock_create.return_value.kickoff.side_effect = RuntimeError("API down")
+            with pytest.raises(RuntimeError, match="API down"):
+                analyze_stock_sync("TCS", "full")
+
+        assert len(get_cache("report")) == 0
+        assert not _runs
+
+
 class TestAnalyzeStockAsync:
     """Tests for async analyze_stock function."""
 
@@ -328,7 +632,7 @@ class TestAnalyzeStockAsync:
             with patch('crews.research_crew.analyze_stock_sync', return_value="async report") as mock_sync:
                 result = await analyze_stock("RELIANCE", "full")
                 assert result == "async report"
-                mock_sync.assert_called_once_with("RELIANCE", "full")
+                mock_sync.assert_called_once_with("RELIANCE", "full", None)
 
 
 class TestLiteLLMPatch:
@@ -0,0 +1,274 @@
+"""
+Tests for the Vectorized Indicator Engine
+
+Tests cover:
+- Agreement with per-Series pandas calculations
+- Symbols with different history lengths in one matrix
+- NaN for indicators without enough history
+- Batched universe tables
+- Streaming per-bar state (appends, intraday revisions, re-seeding)
+- Streamed indicators limited to the bars of each sliding window
+- Swing high/low detection for one or many symbols
+"""
+
+import pytest
+from unittest.mock import patch
+import pandas as pd
+import numpy as np
+
+
+def _frame(days: int, seed: int = 0, end: str = "2026-02-06") -> pd.DataFrame:
+    """Random-walk OHLCV frame of business days."""
+    rng = np.random.default_rng(seed)
+    close = 1000 + np.cumsum(rng.normal(0, 10, days))
+    return pd.DataFrame({
+        "Open": close,
+        "High": close + rng.uniform(0, 15, days),
+        "Low": close - rng.uniform(0, 15, days),
+        "Close": close,
+        "Volume": rng.integers(100_000, 1_000_000, days).astype(float),
+    }, index=pd.bdate_range(end=end, periods=days))
+
+
+def _table(frames: dict) -> pd.DataFrame:
+    from tools.indicators import FIELDS, compute_indicators, price_matrices
+
+    matrices = price_matrices(frames)
+    return compute_indicators(*(matrices[field] for field in FIELDS))
+
+
+class TestComputeIndicators:
+    """Tests for compute_indicators."""
+
+    @pytest.mark.unit
+    def test_matches_pandas_series_calculations(self):
+        df = _frame(120)
+        row = _table({"TCS": df}).loc["TCS"]
+        close = df["Close"]
+
+        delta = close.diff()
+        gain = delta.where(delta > 0, 0).rolling(14).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+        macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+        signal = macd.ewm(span=9, adjust=False).mean()
+
+        assert row["sma_20"] == pytest.approx(close.rolling(20).mean().iloc[-1])
+        assert row["sma_50"] == pytest.approx(close.rolling(50).mean().iloc[-1])
+        assert row["ema_26"] == pytest.approx(close.ewm(span=26, adjust=False).mean().iloc[-1])
+        assert row["rsi_14"] == pytest.approx((100 - 100 / (1 + gain / loss)).iloc[-1])
+        assert row["macd"] == pytest.approx(macd.iloc[-1])
+        assert row["macd_signal_prev"] == pytest.approx(signal.iloc[-2])
+        assert row["bb_upper"] == pytest.approx(
+            close.rolling(20).mean().iloc[-1] + 2 * close.rolling(20).std().iloc[-1]
+        )
+        assert row["recent_high"] == pytest.approx(df["High"].tail(20).max())
+        assert row["roc_10"] == pytest.approx((close.iloc[-1] / close.iloc[-11] - 1) * 100)
+
+    @pytest.mark.unit
+    def test_columns_match_single_symbol_runs(self):
+        """Shorter histories and missing sessions do not leak between symbols."""
+        long_df = _frame(260, seed=1)
+        short_df = _frame(80, seed=2)
+        gappy_df = _frame(150, seed=3)
+        gappy_df = gappy_df.drop(index=gappy_df.index[[-5, -30]])
+
+        combined = _table({"A": long_df, "B": short_df, "C": gappy_df})
+
+        for sym, df in {"A": long_df, "B": short_df, "C": gappy_df}.items():
+            single = _table({sym: df}).loc[sym]
+            pd.testing.assert_series_equal(combined.loc[sym], single, check_names=False)
+
+    @pytest.mark.unit
+    def test_short_history_gives_nan(self):
+        row = _table({"NEW": _frame(30)}).loc["NEW"]
+
+        assert row["bars"] == 30
+        assert np.isnan(row["sma_50"])
+        assert np.isnan(row["sma_200"])
+        assert not np.isnan(row["sma_20"])
+        assert not np.isnan(row["rsi_14"])
+
+    @pytest.mark.unit
+    def test_one_row_per_symbol(self):
+        from tools.indicators import INDICATOR_COLUMNS
+
+        table = _table({f"S{i}": _frame(100, seed=i) for i in range(50)})
+
+        assert table.shape == (50, len(INDICATOR_COLUMNS))
+        assert table["rsi_14"].between(0, 100).all()
+
+
+class TestIndicatorTable:
+    """Tests for get_indicator_table."""
+
+    @pytest.mark.unit
+    def test_uses_one_batched_download(self):
+        from tools.indicators import get_indicator_table
+
+        frames = {"RELIANCE.NS": _frame(120, seed=1), "TCS.NS": _frame(120, seed=2), "BAD.NS": pd.DataFrame()}
+
+        with patch("tools.indicators.get_ohlcv_batch", return_value=frames) as mock_batch:
+            table = get_indicator_table(["reliance", "TCS", "BAD"], period="6mo")
+
+        mock_batch.assert_called_once_with(["RELIANCE.NS", "TCS.NS", "BAD.NS"], period="6mo")
+        assert list(table.index) == ["RELIANCE", "TCS"]
+
+    @pytest.mark.unit
+    def test_accepts_symbols_with_suffix(self):
+        from tools.indicators import get_indicator_table
+
+        frames = {"TCS.NS": _frame(120, seed=2), "INFY.NS": _frame(120, seed=3)}
+
+        with patch("tools.indicators.get_ohlcv_batch", return_value=frames) as mock_batch:
+            table = get_indicator_table(["tcs.ns", "INFY"])
+
+        mock_batch.assert_called_once_with(["TCS.NS", "INFY.NS"], period="6mo")
+        assert list(table.index) == ["TCS", "INFY"]
+
+    @pytest.mark.unit
+    def test_empty_universe(self):
+        from tools.indicators import get_indicator_table, INDICATOR_COLUMNS
+
+        with patch("tools.indicators.get_ohlcv_batch", return_value={"X.NS": pd.DataFrame()}):
+            table = get_indicator_table(["X"])
+
+        assert table.empty
+        assert list(table.columns) == INDICATOR_COLUMNS
+
+
+class TestSwingPoints:
+    """Tests for swing_highs / swing_lows."""
+
+    @pytest.mark.unit
+    def test_strict_two_bar_window(self):
+        from tools.indicators import swing_highs, swing_lows
+
+        high = pd.Series([1, 3, 2, 5, 4, 4, 6, 6, 2, 1, 7, 3, 2], dtype=float)
+        low = -high
+
+        # 5 and 7 beat two bars on each side; the tied 6s do not
+        assert list(high[swing_highs(high)].index) == [3, 10]
+        assert list(low[swing_lows(low)].index) == [3, 10]
+
+    @pytest.mark.unit
+    def test_configurable_window(self):
+        from tools.indicators import swing_highs
+
+        high = pd.Series([1, 2, 3, 9, 1, 2, 1, 1, 1], dtype=float)
+
+        assert list(high[swing_highs(high, left=1, right=1)].index) == [3, 5]
+        assert list(high[swing_highs(high, left=3, right=1)].index) == [3]
+        assert not swing_highs(high, left=4, right=1).any()
+
+    @pytest.mark.unit
+    def test_matrix_matches_single_symbol_runs(self):
+        """Missing sessions and shorter histories are skipped per symbol."""
+        from tools.indicators import swing_highs, swing_lows
+
+        frames = {f"S{i}": _frame(60 + 20 * i, seed=i) for i in range(4)}
+        frames["S1"] = frames["S1"].drop(index=frames["S1"].index[[10, 11, 30]])
+        highs = pd.DataFrame({sym: df["High"] for sym, df in frames.items()})
+        lows = pd.DataFrame({sym: df["Low"] for sym, df in frames.items()})
+
+        high_mask = swing_highs(highs, left=3, right=2)
+        low_mask = swing_lows(lows, left=3, right=2)
+
+        assert high_mask.shape == highs.shape
+        for sym, df in frames.items():
+            expected_highs = df.index[swing_highs(df["High"], left=3, right=2).to_numpy()]
+            expected_lows = df.index[swing_lows(df["Low"], left=3, right=2).to_numpy()]
+            assert list(highs.index[high_mask[sym].to_numpy()]) == list(expected_highs)
+            assert list(lows.index[low_mask[sym].to_numpy()]) == list(expected_lows)
+
+
+class TestIndicatorState:
+    """Tests for the streaming IndicatorState."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("days", [1, 15, 60, 260])
+    def test_matches_vectorized_engine(self, days):
+        from tools.indicators import IndicatorState
+
+        df = _frame(days, seed=days)
+        state = IndicatorState.from_frame(df)
+
+        pd.testing.assert_series_equal(
+            state.snapshot(), _table({"X": df}).loc["X"], check_names=False, rtol=1e-9
+        )
+
+    @pytest.mark.unit
+    def test_streams_new_and_revised_bars(self):
+        from tools.indicators import IndicatorState
+
+        df = _frame(150, seed=4)
+        state = IndicatorState.from_frame(df.iloc[:100])
+
+        # Intraday version of bar 100, then the session closes and more bars arrive
+        last = df.index[99]
+        state.update(last, high=2000.0, low=500.0, close=1500.0, volume=5e6)
+        state.update_frame(df)
+
+        assert state.bars == 150
+        pd.testing.assert_series_equal(
+            state.snapshot(), _table({"X": df}).loc["X"], check_names=False, rtol=1e-9
+        )
+
+    @pytest.mark.unit
+    def test_rejects_older_bar(self):
+        from tools.indicators import IndicatorState
+
+        df = _frame(30)
+        state = IndicatorState.from_frame(df)
+
+        with pytest.raises(ValueError):
+            state.update(df.index[0], 1.0, 1.0, 1.0, 1.0)
+
+
+class TestLatestIndicators:
+    """Tests for latest_indicators."""
+
+    @pytest.mark.unit
+    def test_reuses_state_for_continued_history(self):
+        from tools.indicators import IndicatorState, latest_indicators
+
+        df = _frame(120, seed=5)
+
+        with patch.object(IndicatorState, "from_frame", wraps=IndicatorState.from_frame) as seed:
+            latest_indicators(("TCS", "6mo"), df.iloc[:-1])
+            row = latest_indicators(("TCS", "6mo"), df)
+
+        seed.assert_called_once()
+        assert row["price"] == pytest.approx(df["Close"].iloc[-1])
+        assert row["sma_50"] == pytest.approx(df["Close"].tail(50).mean())
+
+    @pytest.mark.unit
+    def test_reseeds_when_history_is_adjusted(self):
+        from tools.indicators import IndicatorState, latest_indicators
+
+        df = _frame(120, seed=6)
+        adjusted = df.copy()
+        adjusted[["Open", "High", "Low", "Close"]] /= 2
+
+        with patch.object(IndicatorState, "from_frame", wraps=IndicatorState.from_frame) as seed:
+            latest_indicators(("TCS", "6mo"), df)
+            row = latest_indicators(("TCS", "6mo"), adjusted)
+
+        assert seed.call_count == 2
+        assert row["sma_20"] == pytest.approx(adjusted["Close"].tail(20).mean())
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("window", [12, 125])
+    def test_sliding_windows_match_vectorized_engine(self, window):
+        """Bars streamed in earlier calls never leak into a shorter window (e.g. sma_200 over 6mo)."""
+        from tools.indicators import latest_indicators
+
+        df = _frame(400, seed=7)
+
+        for end in range(window, len(df) + 1, 5):
+            frame = df.iloc[end - window:end]
+            row = latest_indicators(("TCS", "6mo"), frame)
+            expected = _table({"X": frame}).loc["X"]
+
+            pd.testing.assert_series_equal(row, expected, check_names=False, rtol=1e-9)
+
+        assert np.isnan(row["sma_200"])
@@ -204,19 +204,101 @@ class TestFIIDIIData:
 class TestNSESession:
     """Tests for NSE session cookie handling."""
 
+    @staticmethod
+    def _client(*statuses):
+        """Patchable httpx.Client whose API calls return the given statuses in turn."""
+        client = MagicMock()
+        api_statuses = iter(statuses)
+
+        def get(url, **kwargs):
+            status = 200 if url == "https://www.nseindia.com" else next(api_statuses, 200)
+            return MagicMock(status_code=status)
+
+        client.get.side_effect = get
+        return MagicMock(return_value=client), client
+
+    @staticmethod
+    def _homepage_visits(client) -> int:
+        return sum(1 for c in client.get.call_args_list if c.args == ("https://www.nseindia.com",))
+
     @pytest.mark.unit
     def test_nse_session_visits_homepage(self):
-        """Test that _get_nse_session visits NSE homepage for cookies."""
-        from tools.institutional import _get_nse_session
+        """Test that the NSE session visits NSE homepage for cookies before the API."""
+        from tools.institutional import NSESession
+
+        client_cls, client = self._client()
+        with patch('httpx.Client', client_cls):
+            NSESession().get("https://www.nseindia.com/api/fiidiiTradeReact")
+
+        urls = [c.args[0] for c in client.get.call_args_list]
+        assert urls == ["https://www.nseindia.com", "https://www.nseindia.com/api/fiidiiTradeReact"]
+
+    @pytest.mark.unit
+    def test_nse_session_reuses_cookies_and_client(self):
+        """Repeated calls share one client and one homepage visit."""
+        from tools.institutional import NSESession
+
+        client_cls, client = self._client()
+        with patch('httpx.Client', client_cls):
+            session = NSESession()
+            for _ in range(5):
+                session.get("https://www.nseindia.com/api/fiidiiTradeReact")
+
+        assert client_cls.call_count == 1
+        assert self._homepage_visits(client) == 1
+        client.close.assert_not_called()
+
+    @pytest.mark.unit
+    def test_nse_session_refreshes_expired_cookies(self):
+        """Cookies older than the TTL are refreshed on the next call."""
+        from tools.institutional import NSESession
+
+        client_cls, client = self._client()
+        with patch('httpx.Client', client_cls):
+            session = NSESession(cookie_ttl=0)
+            session.get("https://www.nseindia.com/api/fiidiiTradeReact")
+            session.get("https://www.nseindia.com/api/fiidiiTradeReact")
+
+        assert self._homepage_visits(client) == 2
+
+    @pytest.mark.unit
+    def test_nse_session_refreshes_on_forbidden(self):
+        """A 403 refreshes the cookies and retries the request once."""
+        from tools.institutional import NSESession
+
+        client_cls, client = self._client(403, 200)
+        with patch('httpx.Client', client_cls):
+            response = NSESession().get("https://www.nseindia.com/api/fiidiiTradeReact")
 
-        with patch('httpx.Client') as mock_client_cls:
-            mock_client = MagicMock()
-            mock_client_cls.return_value = mock_client
+        assert response.status_code == 200
+        assert self._homepage_visits(client) == 2
+        client.cookies.clear.assert_called()
 
-            _get_nse_session()
+    @pytest.mark.unit
+    def test_nse_session_shared_between_threads(self):
+        """Concurrent first calls visit the homepage once."""
+        from concurrent.futures import ThreadPoolExecutor
+        from tools.institutional import NSESession
+
+        client_cls, client = self._client()
+        with patch('httpx.Client', client_cls):
+            session = NSESession()
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                statuses = list(pool.map(
+                    lambda _: session.get("https://www.nseindia.com/api/fiidiiTradeReact").status_code,
+                    range(16),
+                ))
+
+        assert statuses == [200] * 16
+        assert client_cls.call_count == 1
+        assert self._homepage_visits(client) == 1
+
+    @pytest.mark.unit
+    def test_tools_share_one_session(self):
+        """The NSE tools use the module's shared session."""
+        from tools.institutional import _get_nse_session
 
-            # Should have called get on the homepage
-            mock_client.get.assert_called_once_with("https://www.nseindia.com")
+        assert _get_nse_session() is _get_nse_session()
 
     @pytest.mark.unit
     def test_fii_dii_handles_nse_api_error(self):
@@ -549,8 +631,8 @@ class TestBulkBlockDeals:
         assert data.get("DATA_UNAVAILABLE") is True
 
     @pytest.mark.unit
-    def test_nse_session_close_error(self):
-        """Test that _get_nse_session client close error is handled gracefully."""
+    def test_nse_session_not_closed_by_tools(self):
+        """Test that tools leave the shared NSE session open for the next call."""
         from tools.institutional import get_fii_dii_data
 
         mock_client = MagicMock()
@@ -558,14 +640,10 @@ class TestBulkBlockDeals:
         mock_api_response.status_code = 200
         mock_api_response.json.return_value = SAMPLE_NSE_FII_DII_JSON
         mock_client.get.return_value = mock_api_response
-        mock_client.close = MagicMock(side_effect=Exception("close failed"))
 
         with patch("tools.institutional._get_nse_session", return_value=mock_client):
             result = get_fii_dii_data.func()
             data = json.loads(result)
 
-        # close() error propagates from finally block to outer except
-        # So we get an error response - verify it's handled gracefully
-        assert isinstance(data, dict)
-        assert "error" in data
-        assert "close failed" in data["error"]
+        assert "error" not in data
+        mock_client.close.assert_not_called()
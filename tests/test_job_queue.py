@@ -0,0 +1,193 @@
+"""
+Tests for the Bot Analysis Job Queue
+
+Tests cover:
+- Bounded workers and priority order (quick before full)
+- Jobs for a running analysis attach to it without a worker
+- Queue position updates
+- Cancelling waiting and running jobs
+- Queue size limit
+"""
+
+import asyncio
+import threading
+import pytest
+from unittest.mock import MagicMock, patch
+
+
+class FakeCrew:
+    """Crew run (research_crew._run_analysis) stand-in whose runs block until released."""
+
+    def __init__(self):
+        self.started: list[str] = []
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+
+    def __call__(self, symbol, analysis_type, on_task_complete):
+        with self._lock:
+            self.started.append(symbol)
+        self.release.wait(timeout=5)
+        on_task_complete(MagicMock(agent="Market Data Analyst"), 1, 2)
+        on_task_complete(MagicMock(agent="Research Report Writer"), 2, 2)
+        return f"report {symbol}"
+
+
+def _drain(job):
+    updates = []
+    while not job.updates.empty():
+        updates.append(job.updates.get_nowait())
+    return updates
+
+
+@pytest.fixture
+def crew():
+    fake = FakeCrew()
+    with patch("crews.research_crew._run_analysis", side_effect=fake):
+        yield fake
+    fake.release.set()
+
+
+class TestAnalysisQueue:
+    """Tests for AnalysisQueue scheduling."""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_runs_at_most_workers_jobs(self, crew):
+        from bot.job_queue import AnalysisQueue
+
+        queue = AnalysisQueue(workers=2, max_pending=10)
+        jobs = [queue.submit(user, symbol) for user, symbol in enumerate(["TCS", "INFY", "SBIN", "ITC"])]
+
+        assert queue.running == 2 and queue.pending == 2
+        assert [job.state for job in jobs] == ["running", "running", "queued", "queued"]
+        assert [job.position for job in jobs] == [None, None, 1, 2]
+
+        crew.release.set()
+        reports = await asyncio.wait_for(asyncio.gather(*(job.result for job in jobs)), timeout=5)
+
+        assert reports == ["report TCS", "report INFY", "report SBIN", "report ITC"]
+        assert all(job.state == "done" for job in jobs)
+        assert queue.running == 0 and queue.pending == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_shared_analysis_takes_one_worker(self, crew):
+        from bot.job_queue import AnalysisQueue
+
+        queue = AnalysisQueue(workers=2, max_pending=10)
+        first = queue.submit(1, "TCS")
+        second = queue.submit(2, "TCS")
+        other = queue.submit(3, "INFY")
+
+        # The second TCS request waits on the first run, leaving a worker for INFY
+        assert [job.state for job in (first, second, other)] == ["running"] * 3
+        assert queue.pending == 0
+        for _ in range(100):
+            if len(crew.started) == 2:
+                break
+            await asyncio.sleep(0.01)
+        assert sorted(crew.started) == ["INFY", "TCS"]
+
+        crew.release.set()
+        reports = await asyncio.wait_for(asyncio.gather(first.result, second.result, other.result), timeout=5)
+
+        assert reports == ["report TCS", "report TCS", "report INFY"]
+        assert crew.started.count("TCS") == 1
+        await asyncio.sleep(0)
+        assert [kind for kind, _ in _drain(second)].count("task") == 2
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_quick_jobs_jump_full_ones(self, crew):
+        from bot.job_queue import AnalysisQueue
+
+        queue = AnalysisQueue(workers=1, max_pending=10)
+        first = queue.submit(1, "TCS")
+        full = queue.submit(2, "INFY", "full")
+        quick = queue.submit(3, "SBIN", "quick")
+
+        assert (quick.position, full.position) == (1, 2)
+        await asyncio.sleep(0)
+        assert _drain(full) == [("position", 1), ("position", 2)]
+
+        crew.release.set()
+        await asyncio.wait_for(asyncio.gather(first.result, full.result, quick.result), timeout=5)
+
+        assert crew.started == ["TCS", "SBIN", "INFY"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_updates_report_start_and_tasks(self, crew):
+        from bot.job_queue import AnalysisQueue
+
+        queue = AnalysisQueue(workers=1, max_pending=10)
+        crew.release.set()
+        job = queue.submit(1, "TCS")
+        await asyncio.wait_for(job.result, timeout=5)
+        await asyncio.sleep(0)
+
+        kinds = [kind for kind, _ in _drain(job)]
+        assert kinds == ["running", "task", "task"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cancel_waiting_job(self, crew):
+        from bot.job_queue import AnalysisQueue, JobCancelled
+
+        queue = AnalysisQueue(workers=1, max_pending=10)
+        running = queue.submit(1, "TCS")
+        first = queue.submit(2, "INFY")
+        second = queue.submit(3, "SBIN")
+
+        assert queue.cancel(first)
+        assert first.state == "cancelled" and second.position == 1
+        with pytest.raises(JobCancelled):
+            await first.result
+
+        crew.release.set()
+        await asyncio.wait_for(asyncio.gather(running.result, second.result), timeout=5)
+        assert "INFY" not in crew.started
+        assert not queue.cancel(running)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cancel_running_job_stops_at_next_task(self, crew):
+        from bot.job_queue import AnalysisQueue, JobCancelled
+
+        queue = AnalysisQueue(workers=1, max_pending=10)
+        job = queue.submit(1, "TCS")
+
+        assert queue.cancel(job)
+        assert job.state == "running"
+        crew.release.set()
+        with pytest.raises(JobCancelled):
+            await asyncio.wait_for(job.result, timeout=5)
+        assert job.state == "cancelled"
+        assert queue.active_job(1) is None
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_failed_job_raises_error(self):
+        from bot.job_queue import AnalysisQueue
+
+        queue = AnalysisQueue(workers=1, max_pending=10)
+        with patch("crews.research_crew._run_analysis", side_effect=RuntimeError("API down")):
+            job = queue.submit(1, "TCS")
+            with pytest.raises(RuntimeError, match="API down"):
+                await asyncio.wait_for(job.result, timeout=5)
+
+        assert job.state == "failed"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_queue_full_rejected(self, crew):
+        from bot.job_queue import AnalysisQueue
+
+        queue = AnalysisQueue(workers=1, max_pending=1)
+        queue.submit(1, "TCS")
+        queue.submit(2, "INFY")
+
+        with pytest.raises(asyncio.QueueFull):
+            queue.submit(3, "SBIN")
+        assert queue.active_job(2).symbol == "INFY"
+        assert queue.active_job(3) is None
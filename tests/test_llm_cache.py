@@ -0,0 +1,118 @@
+"""
+Tests for the Agent LLM Response Cache
+
+Tests cover:
+- Cache key normalization (whitespace, timestamps, model, temperature)
+- Disk backend TTL and size limits
+- Agents' LLMs opting into the cache, and the LLM_CACHE_ENABLED switch
+"""
+
+import os
+import time
+import pytest
+from unittest.mock import patch
+
+
+def _messages(content):
+    return [{"role": "system", "content": "You are an analyst."}, {"role": "user", "content": content}]
+
+
+class TestResponseCacheKey:
+    """Tests for response_cache_key."""
+
+    @pytest.mark.unit
+    def test_whitespace_and_timestamps_ignored(self):
+        from agents.llm import response_cache_key
+
+        first = response_cache_key("mistral/m", _messages("Data fetched at 2026-10-17T10:00:00\n\nTCS  3456"), 0.3)
+        second = response_cache_key("mistral/m", _messages("Data fetched at 2026-10-17T11:42:05 TCS 3456"), 0.3)
+
+        assert first == second
+
+    @pytest.mark.unit
+    def test_content_model_and_temperature_matter(self):
+        from agents.llm import response_cache_key
+
+        key = response_cache_key("mistral/m", _messages("TCS 3456"), 0.3)
+
+        assert key != response_cache_key("mistral/m", _messages("TCS 3457"), 0.3)
+        assert key != response_cache_key("mistral/other", _messages("TCS 3456"), 0.3)
+        assert key != response_cache_key("mistral/m", _messages("TCS 3456"), 0.4)
+
+
+class TestDiskResponseCache:
+    """Tests for the on-disk cache backend."""
+
+    @pytest.mark.unit
+    def test_round_trip(self, tmp_path):
+        from agents.llm import DiskResponseCache
+
+        cache = DiskResponseCache(tmp_path, ttl=60, max_entries=10)
+        cache.set_cache("k", {"timestamp": 1.0, "response": "{}"})
+
+        assert cache.get_cache("k") == {"timestamp": 1.0, "response": "{}"}
+        assert cache.get_cache("missing") is None
+
+    @pytest.mark.unit
+    def test_expired_entry_is_dropped(self, tmp_path):
+        from agents.llm import DiskResponseCache
+
+        cache = DiskResponseCache(tmp_path, ttl=60, max_entries=10)
+        cache.set_cache("k", "v")
+
+        with patch("agents.llm.time.time", return_value=time.time() + 61):
+            assert cache.get_cache("k") is None
+        assert not (tmp_path / "k.json").exists()
+
+    @pytest.mark.unit
+    def test_oldest_entries_pruned(self, tmp_path):
+        from agents.llm import DiskResponseCache
+
+        cache = DiskResponseCache(tmp_path, ttl=60, max_entries=2)
+        for age, key in enumerate(["c", "b", "a"]):
+            cache.set_cache(key, key)
+            stamp = time.time() - 10 * (3 - age)
+            os.utime(tmp_path / f"{key}.json", (stamp, stamp))
+        cache.set_cache("d", "d")
+
+        assert sorted(p.stem for p in tmp_path.glob("*.json")) == ["a", "d"]
+
+    @pytest.mark.unit
+    def test_completion_served_from_cache(self, tmp_path):
+        import litellm
+        from agents.llm import DiskResponseCache, ResponseCache
+
+        def complete(content, reply, **kwargs):
+            response = litellm.completion(
+                model="mistral/mistral-large-latest", messages=_messages(content),
+                temperature=0.3, api_key="test_key", mock_response=reply, **kwargs,
+            )
+            return response.choices[0].message.content
+
+        with patch.object(litellm, "cache", ResponseCache(DiskResponseCache(tmp_path, ttl=60, max_entries=10))):
+            assert complete("as of 2026-10-17T10:00:00", "first", cache={"use-cache": True}) == "first"
+            assert complete("as of 2026-10-17T10:05:00", "second", cache={"use-cache": True}) == "first"
+            assert complete("as of 2026-10-17T10:00:00", "uncached") == "uncached"
+
+
+class TestCreateLLM:
+    """Tests for create_llm."""
+
+    @pytest.mark.unit
+    def test_agents_use_response_cache(self):
+        with patch.dict('os.environ', {'MISTRAL_API_KEY': 'test_key'}):
+            from agents import report_writer_agent, technical_analyst_agent
+
+            for agent in (report_writer_agent, technical_analyst_agent):
+                assert agent.llm.additional_params.get("cache") == {"use-cache": True}
+
+    @pytest.mark.unit
+    def test_switch_off_skips_cache(self):
+        from config import settings
+        from agents.llm import create_llm
+
+        with patch.object(settings, "llm_cache_enabled", False):
+            llm = create_llm(temperature=0.3)
+
+        assert "cache" not in llm.additional_params
+        assert llm.temperature == 0.3
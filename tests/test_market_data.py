@@ -60,42 +60,37 @@ class TestCacheValidity:
     
     @pytest.mark.unit
     def test_cache_miss_for_new_key(self):
-        """Test cache returns invalid for new key."""
-        from tools.market_data import _is_cache_valid, _cache
+        """Test cache returns nothing for new key."""
+        from tools.market_data import _cache
         
         # Clear cache
         _cache.clear()
         
-        result = _is_cache_valid("nonexistent_key")
-        assert result is False
+        result = _cache.get("nonexistent_key")
+        assert result is None
     
     @pytest.mark.unit
     def test_cache_hit_for_fresh_data(self):
-        """Test cache returns valid for fresh data."""
-        from tools.market_data import _is_cache_valid, _cache
+        """Test cache returns fresh data."""
+        from tools.market_data import _cache
         
         # Add fresh data to cache
-        _cache["test_key"] = {
-            "data": {"test": "data"},
-            "timestamp": datetime.now().timestamp()
-        }
+        _cache.set("test_key", {"test": "data"})
         
-        result = _is_cache_valid("test_key")
-        assert result is True
+        result = _cache.get("test_key")
+        assert result == {"test": "data"}
     
     @pytest.mark.unit
     def test_cache_expired_for_old_data(self):
-        """Test cache returns invalid for expired data."""
-        from tools.market_data import _is_cache_valid, _cache, _cache_ttl
+        """Test cache returns nothing for expired data."""
+        from tools.market_data import _cache
         
         # Add expired data to cache
-        _cache["old_key"] = {
-            "data": {"test": "data"},
-            "timestamp": datetime.now().timestamp() - _cache_ttl - 100
-        }
+        _cache.set("old_key", {"test": "data"})
+        _cache._data["old_key"]["timestamp"] -= _cache.ttl + 100
         
-        result = _is_cache_valid("old_key")
-        assert result is False
+        result = _cache.get("old_key")
+        assert result is None
 
 
 class TestGetStockPrice:
@@ -322,6 +317,55 @@ class TestGetIndexData:
         result_str = result.lower()
         assert "nifty" in result_str or "sensex" in result_str or "error" in result_str
     
+    @pytest.mark.unit
+    def test_all_indices_one_download_and_cached(self):
+        """Test that 'ALL' fetches every index in one request and caches the result."""
+        from tools.market_data import get_index_data
+        from config import INDIAN_INDICES
+
+        dates = pd.bdate_range(end=datetime.now().date(), periods=2)
+        raw = pd.concat({
+            symbol: pd.DataFrame(
+                {"Open": [1.0, 2.0], "High": [1.0, 2.0], "Low": [1.0, 2.0],
+                 "Close": [100.0, 101.0], "Volume": [0, 0]},
+                index=dates,
+            )
+            for symbol in INDIAN_INDICES.values()
+        }, axis=1)
+
+        with patch("tools.price_store.yf.download", return_value=raw) as mock_download:
+            first = json.loads(get_index_data.func("ALL"))
+            second = json.loads(get_index_data.func("all"))
+
+        assert mock_download.call_count == 1
+        assert set(INDIAN_INDICES) <= set(first)
+        assert first["SENSEX"]["change_percent"] == 1.0
+        assert first == second
+
+    @pytest.mark.unit
+    def test_index_history_older_than_index_ttl_is_topped_up(self):
+        """Test that index levels are not served from history older than the index TTL."""
+        from tools.market_data import get_index_data, _index_cache
+        from tools.price_store import _store
+
+        dates = pd.bdate_range(end=datetime.now().date(), periods=300)
+        hist = pd.DataFrame(
+            {"Open": 1.0, "High": 1.0, "Low": 1.0, "Close": 100.0, "Volume": 0},
+            index=dates,
+        )
+
+        with patch("tools.price_store.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.history.return_value = hist
+            get_index_data.func("NIFTY50")
+            # Age the stored bars past the index TTL (still fresh for the store)
+            _store._data[("^NSEI", "1d")]["timestamp"] -= _index_cache.ttl + 1
+            _index_cache.clear()
+            get_index_data.func("NIFTY50")
+
+        calls = mock_ticker.return_value.history.call_args_list
+        assert len(calls) == 2
+        assert "start" in calls[1].kwargs
+
     @pytest.mark.integration
     @pytest.mark.slow
     def test_real_index_data_fetch(self):
@@ -561,7 +605,8 @@ class TestGetPeerComparison:
             "marketCap": 500_000_000_000,
         }
 
-        with patch("tools.market_data.yf.Ticker", return_value=mock_ticker):
+        with patch("tools.company_profile.yf.Ticker", return_value=mock_ticker), \
+             patch("tools.price_store.yf.download", return_value=pd.DataFrame()):
             result = get_peer_comparison("RELIANCE", "ENERGY")
 
         assert isinstance(result, dict)
@@ -584,8 +629,100 @@ class TestGetPeerComparison:
         def side_effect(sym):
             raise ConnectionError("Network error")
 
-        with patch("tools.market_data.yf.Ticker", side_effect=side_effect):
+        with patch("tools.company_profile.yf.Ticker", side_effect=side_effect), \
+             patch("tools.price_store.yf.download", side_effect=ConnectionError("Network error")):
             result = get_peer_comparison("RELIANCE", "ENERGY")
 
         # All peers failed, should return empty
         assert result == {}
+
+    @pytest.mark.unit
+    def test_peer_prices_fetched_in_one_batch(self):
+        """Test that peer prices come from one batched download."""
+        from tools.market_data import get_peer_comparison
+
+        raw = pd.concat({
+            f"{peer}.NS": pd.DataFrame(
+                {"Open": [1.0, 2.0], "High": [1.0, 2.0], "Low": [1.0, 2.0],
+                 "Close": [100.0, 110.0], "Volume": [10, 20]},
+                index=pd.bdate_range(end=datetime.now().date(), periods=2),
+            )
+            for peer in ["ONGC", "BPCL", "NTPC", "POWERGRID"]
+        }, axis=1)
+
+        with patch("tools.company_profile.yf.Ticker") as mock_ticker, \
+             patch("tools.price_store.yf.download", return_value=raw) as mock_download:
+            mock_ticker.return_value.info = {"currentPrice": 1, "trailingPE": 10, "marketCap": 5}
+            result = get_peer_comparison("RELIANCE", "ENERGY")
+
+        assert mock_download.call_count == 1
+        assert set(result) == {"ONGC", "BPCL", "NTPC", "POWERGRID"}
+        assert result["ONGC"]["price"] == 110.0
+        assert result["ONGC"]["pe_ratio"] == 10
+
+
+class TestGetBatchQuotes:
+    """Tests for get_quotes / get_batch_quotes."""
+
+    @staticmethod
+    def _raw(symbols):
+        dates = pd.bdate_range(end=datetime.now().date(), periods=2)
+        return pd.concat({
+            f"{sym}.NS": pd.DataFrame(
+                {"Open": [1.0, 2.0], "High": [1.0, 2.0], "Low": [1.0, 2.0],
+                 "Close": [100.0, 105.0], "Volume": [10, 20]},
+                index=dates,
+            )
+            for sym in symbols
+        }, axis=1)
+
+    @pytest.mark.unit
+    def test_get_quotes_computes_change(self):
+        from tools.market_data import get_quotes
+
+        with patch("tools.price_store.yf.download", return_value=self._raw(["TCS", "INFY"])):
+            quotes = get_quotes(["tcs", "INFY"])
+
+        assert list(quotes) == ["TCS", "INFY"]
+        assert quotes["TCS"] == {
+            "price": 105.0,
+            "previous_close": 100.0,
+            "change": 5.0,
+            "change_percent": 5.0,
+            "volume": 20,
+        }
+
+    @pytest.mark.unit
+    def test_sector_universe_single_download(self):
+        from tools.market_data import get_batch_quotes
+        from config import SECTORS
+
+        with patch("tools.price_store.yf.download", return_value=self._raw(SECTORS["IT"][:3])) as mock_download:
+            data = json.loads(get_batch_quotes.func("it"))
+
+        assert mock_download.call_count == 1
+        assert data["universe"] == "IT"
+        assert data["columns"] == ["symbol", "price", "change", "change_percent", "volume"]
+        assert [row[0] for row in data["rows"]] == SECTORS["IT"][:3]
+        assert data["missing"] == SECTORS["IT"][3:]
+
+    @pytest.mark.unit
+    def test_custom_symbol_list(self):
+        from tools.market_data import get_batch_quotes
+
+        with patch("tools.price_store.yf.download", return_value=self._raw(["TCS"])):
+            data = json.loads(get_batch_quotes.func("TCS, WIPRO"))
+
+        assert data["universe"] == "CUSTOM"
+        assert data["rows"][0][:2] == ["TCS", 105.0]
+        assert data["missing"] == ["WIPRO"]
+
+    @pytest.mark.unit
+    def test_download_error_returns_data_unavailable(self):
+        from tools.market_data import get_batch_quotes
+
+        with patch("tools.price_store.yf.download", side_effect=Exception("API down")):
+            data = json.loads(get_batch_quotes.func("NIFTY50"))
+
+        assert data["DATA_UNAVAILABLE"] is True
+        assert "API down" in data["error"]
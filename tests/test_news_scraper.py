@@ -259,6 +259,71 @@ class TestRSSParsing:
             assert len(data["articles"]) <= 1
 
 
+class TestETRSSIndex:
+    """Tests for the shared ET RSS article index."""
+
+    @pytest.mark.unit
+    def test_feed_fetched_once_for_many_symbols(self):
+        """Every symbol is served from one feed download."""
+        from tools.news_scraper import scrape_et_rss_news
+
+        with patch('httpx.Client') as mock_client:
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            mock_response.text = SAMPLE_ET_RSS_XML
+            mock_get = mock_client.return_value.__enter__.return_value.get
+            mock_get.return_value = mock_response
+
+            reliance = json.loads(scrape_et_rss_news.func("RELIANCE", 5))
+            tcs = json.loads(scrape_et_rss_news.func("TCS", 5))
+            infy = json.loads(scrape_et_rss_news.func("INFY", 5))
+
+        assert mock_get.call_count == 1
+        assert [a["url"][-9:] for a in reliance["articles"]] == ["12345.cms"]
+        assert [a["url"][-9:] for a in tcs["articles"]] == ["12346.cms"]
+        assert infy["articles"] == []
+
+    @pytest.mark.unit
+    def test_lookup_matches_name_variations(self):
+        """Symbols split at digit boundaries match spaced names."""
+        from tools.news_scraper import _parse_et_rss
+
+        xml = SAMPLE_ET_RSS_XML.replace("Sensex rises 300 points", "Nifty 50 hits record high")
+        index = _parse_et_rss(xml)
+
+        assert [a["title"] for a in index.lookup("NIFTY50", 5)] == ["Market update: Nifty 50 hits record high"]
+        assert len(index.lookup("RELIANCE", 5)) == 1
+
+    @pytest.mark.unit
+    def test_lookup_respects_limit_and_feed_order(self):
+        """Lookups return at most `limit` articles in feed order."""
+        from tools.news_scraper import _parse_et_rss
+
+        index = _parse_et_rss(SAMPLE_ET_RSS_XML)
+
+        assert [a["url"][-9:] for a in index.lookup("CRORE", 5)] == ["12345.cms"]
+        assert len(index.lookup("S", 2)) == 2
+        assert [a["url"][-9:] for a in index.lookup("S", 2)] == ["12345.cms", "12346.cms"]
+
+    @pytest.mark.unit
+    def test_http_error_not_cached(self):
+        """A failed feed download is retried on the next call."""
+        from tools.news_scraper import scrape_et_rss_news
+
+        with patch('httpx.Client') as mock_client:
+            failed = MagicMock(status_code=503, text="")
+            ok = MagicMock(status_code=200, text=SAMPLE_ET_RSS_XML)
+            mock_get = mock_client.return_value.__enter__.return_value.get
+            mock_get.side_effect = [failed, ok]
+
+            first = json.loads(scrape_et_rss_news.func("RELIANCE", 5))
+            second = json.loads(scrape_et_rss_news.func("RELIANCE", 5))
+
+        assert first["articles"] == []
+        assert second["articles_count"] == 1
+        assert mock_get.call_count == 2
+
+
 class TestNewsAggregation:
     """Tests for get_stock_news aggregation function."""
 
@@ -286,6 +351,77 @@ class TestNewsAggregation:
             assert "economic_times" in data["sources_status"]
             assert "google_news" in data["sources_status"]
 
+    @pytest.mark.unit
+    def test_get_stock_news_fetches_sources_in_parallel(self):
+        """Latency follows the slowest source, not the sum."""
+        import time
+        from tools import news_scraper
+
+        def slow_source(delay):
+            source = MagicMock()
+            source.run.side_effect = lambda *args: time.sleep(delay) or json.dumps({"articles": []})
+            return source
+
+        with patch.object(news_scraper, "scrape_et_rss_news", slow_source(0.3)), \
+             patch.object(news_scraper, "scrape_economic_times_news", slow_source(0.3)), \
+             patch.object(news_scraper, "scrape_google_news", slow_source(0.3)):
+            start = time.monotonic()
+            data = json.loads(news_scraper.get_stock_news.func("RELIANCE", 5))
+            elapsed = time.monotonic() - start
+
+        assert elapsed < 0.7
+        assert set(data["sources_status"].values()) == {"success"}
+
+    @pytest.mark.unit
+    def test_get_stock_news_deadline_ignores_busy_callers(self):
+        """Concurrent calls beyond the tool pool size still meet the deadline."""
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        from tools import news_scraper
+
+        source = MagicMock()
+        source.run.side_effect = lambda *args: time.sleep(0.2) or json.dumps({"articles": []})
+
+        with patch.object(news_scraper, "scrape_et_rss_news", source), \
+             patch.object(news_scraper, "scrape_economic_times_news", source), \
+             patch.object(news_scraper, "scrape_google_news", source), \
+             patch.object(news_scraper.settings, "news_deadline_seconds", 0.5):
+            with ThreadPoolExecutor(max_workers=12) as callers:
+                results = list(callers.map(
+                    lambda symbol: json.loads(news_scraper.get_stock_news.func(symbol, 5)),
+                    [f"S{i}" for i in range(12)],
+                ))
+
+        # 36 source fetches of 0.2s would miss a 0.5s deadline queued on a small shared pool
+        assert all(set(r["sources_status"].values()) == {"success"} for r in results)
+
+    @pytest.mark.unit
+    def test_get_stock_news_returns_partial_results_at_deadline(self):
+        """A hung source is reported and the others' articles are returned."""
+        import threading
+        from tools import news_scraper
+
+        release = threading.Event()
+        article = {"title": "Reliance shares jump", "summary": "", "url": "u", "published": "", "source": "x"}
+
+        hung, fast_et, fast_google = MagicMock(), MagicMock(), MagicMock()
+        hung.run.side_effect = lambda *args: release.wait(5) and json.dumps({"articles": []})
+        fast_et.run.return_value = json.dumps({"articles": [article]})
+        fast_google.run.return_value = json.dumps({"articles": []})
+
+        try:
+            with patch.object(news_scraper, "scrape_economic_times_news", hung), \
+                 patch.object(news_scraper, "scrape_et_rss_news", fast_et), \
+                 patch.object(news_scraper, "scrape_google_news", fast_google), \
+                 patch.object(news_scraper.settings, "news_deadline_seconds", 0.2):
+                data = json.loads(news_scraper.get_stock_news.func("RELIANCE", 5))
+        finally:
+            release.set()
+
+        assert data["sources_status"]["economic_times"] == "timed out after 0.2s"
+        assert data["sources_status"]["et_rss"] == "success"
+        assert data["total_articles"] == 1
+
     @pytest.mark.integration
     @pytest.mark.slow
     def test_real_news_fetch(self, valid_symbol):
@@ -0,0 +1,111 @@
+"""
+Tests for the Data Prefetch Stage
+
+Tests cover:
+- Tool calls per analysis type
+- Parallel execution
+- Compact outputs and failure isolation
+- Data blocks for task descriptions
+"""
+
+import json
+import threading
+import pytest
+from unittest.mock import patch, MagicMock
+
+
+def _tool(name: str, output=None, side_effect=None) -> MagicMock:
+    tool = MagicMock()
+    tool.name = name
+    tool.run.return_value = output if output is not None else json.dumps({"tool": name}, indent=2)
+    tool.run.side_effect = side_effect
+    return tool
+
+
+class TestPrefetchData:
+    """Tests for prefetch_data."""
+
+    @pytest.mark.unit
+    def test_quick_analysis_fetches_market_and_technical(self):
+        from crews import prefetch
+
+        sections = {
+            name: [(_tool(f"{name} tool {i}"), takes_symbol) for i, takes_symbol in enumerate((True, False))]
+            for name in prefetch.SECTIONS
+        }
+        with patch.dict(prefetch.SECTIONS, sections):
+            data = prefetch.prefetch_data("reliance", "quick")
+
+        assert data["symbol"] == "RELIANCE"
+        assert list(data["sections"]) == ["market", "technical"]
+        assert data["sections"]["technical"]["technical tool 0"] == '{"tool":"technical tool 0"}'
+        sections["market"][0][0].run.assert_called_once_with("RELIANCE")
+        sections["market"][1][0].run.assert_called_once_with()
+        sections["news"][0][0].run.assert_not_called()
+
+    @pytest.mark.unit
+    def test_tools_run_concurrently(self):
+        from crews import prefetch
+
+        barrier = threading.Barrier(3, timeout=5)
+
+        def wait_for_all(*args):
+            barrier.wait()
+            return "{}"
+
+        tools = [(_tool(f"t{i}", side_effect=wait_for_all), True) for i in range(3)]
+        with patch.dict(prefetch.SECTIONS, {"market": tools[:1], "technical": tools[1:]}):
+            data = prefetch.prefetch_data("TCS", "technical-only")
+
+        # All three were in flight at once, otherwise the barrier would time out
+        assert len(data["sections"]["technical"]) == 2
+
+    @pytest.mark.unit
+    def test_failing_tool_is_isolated(self):
+        from crews import prefetch
+
+        ok = _tool("Get Stock Price", output="not json")
+        broken = _tool("Analyze Price Action", side_effect=RuntimeError("boom"))
+        with patch.dict(prefetch.SECTIONS, {"market": [(ok, True)], "technical": [(broken, True)]}):
+            data = prefetch.prefetch_data("TCS", "quick")
+
+        assert data["sections"]["market"]["Get Stock Price"] == "not json"
+        error = json.loads(data["sections"]["technical"]["Analyze Price Action"])
+        assert error["DATA_UNAVAILABLE"] is True
+        assert "boom" in error["error"]
+
+
+class TestFormatDataBlock:
+    """Tests for format_data_block."""
+
+    DATA = {
+        "symbol": "TCS",
+        "fetched_at": "2026-02-06T09:30:00",
+        "sections": {"market": {"Get Stock Price": '{"p":1}', "Get Stock Info": '{"s":2}'}},
+    }
+
+    @pytest.mark.unit
+    def test_block_lists_tool_outputs(self):
+        from crews.prefetch import format_data_block
+
+        block = format_data_block(self.DATA, "market")
+
+        assert "PREFETCHED DATA for TCS" in block
+        assert '[Get Stock Price]\n{"p":1}' in block
+        assert '[Get Stock Info]\n{"s":2}' in block
+
+    @pytest.mark.unit
+    def test_tool_filter(self):
+        from crews.prefetch import format_data_block
+
+        block = format_data_block(self.DATA, "market", tools=["Get Stock Price"])
+
+        assert "Get Stock Price" in block
+        assert "Get Stock Info" not in block
+
+    @pytest.mark.unit
+    def test_empty_without_data(self):
+        from crews.prefetch import format_data_block
+
+        assert format_data_block(None, "market") == ""
+        assert format_data_block(self.DATA, "news") == ""
@@ -0,0 +1,234 @@
+"""
+Tests for the Cache Pre-warm
+
+Tests cover:
+- Pre-open and market-hours schedule in IST, weekends skipped
+- Batch history download plus per-symbol and market-wide tool calls
+- Fresh cache entries reloaded with a new timestamp
+- Per-stock news on its own threads
+- Failed tool calls reported by name
+- Scheduler loop stops on request
+"""
+
+import json
+import threading
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+import numpy as np
+import pandas as pd
+
+from config import settings
+
+
+def _tool(name, output='{"ok": true}'):
+    tool = MagicMock()
+    tool.name = name
+    tool.run.return_value = output
+    return tool
+
+
+class TestSchedule:
+    """Tests for prewarm_times / next_prewarm."""
+
+    @pytest.mark.unit
+    def test_preopen_then_every_interval(self):
+        from tools.prewarm import prewarm_times
+
+        with patch.object(settings, "prewarm_preopen_time", "09:00"), \
+             patch.object(settings, "prewarm_interval_minutes", 60):
+            times = prewarm_times(datetime(2026, 2, 6).date())  # Friday
+
+        assert [f"{t:%H:%M}" for t in times] == [
+            "09:00", "09:15", "10:15", "11:15", "12:15", "13:15", "14:15", "15:15",
+        ]
+
+    @pytest.mark.unit
+    def test_zero_interval_is_preopen_only(self):
+        from tools.prewarm import prewarm_times
+
+        with patch.object(settings, "prewarm_interval_minutes", 0):
+            times = prewarm_times(datetime(2026, 2, 6).date())
+
+        assert len(times) == 1
+
+    @pytest.mark.unit
+    def test_weekend_has_no_runs(self):
+        from tools.prewarm import prewarm_times
+
+        assert prewarm_times(datetime(2026, 2, 7).date()) == []
+        assert prewarm_times(datetime(2026, 2, 8).date()) == []
+
+    @pytest.mark.unit
+    def test_next_prewarm(self):
+        from tools.prewarm import IST, next_prewarm
+
+        def ist(*args):
+            return datetime(*args, tzinfo=IST)
+
+        with patch.object(settings, "prewarm_preopen_time", "09:00"), \
+             patch.object(settings, "prewarm_interval_minutes", 15):
+            assert next_prewarm(ist(2026, 2, 6, 8, 0)) == ist(2026, 2, 6, 9, 0)
+            assert next_prewarm(ist(2026, 2, 6, 9, 0)) == ist(2026, 2, 6, 9, 15)
+            assert next_prewarm(ist(2026, 2, 6, 11, 20)) == ist(2026, 2, 6, 11, 30)
+            # After Friday's close the next run is Monday's pre-open
+            assert next_prewarm(ist(2026, 2, 6, 15, 31)) == ist(2026, 2, 9, 9, 0)
+
+    @pytest.mark.unit
+    def test_schedule_is_ist_on_a_utc_host(self):
+        """03:00 UTC is 08:30 IST, so the next run is the 09:00 IST pre-open (03:30 UTC)."""
+        from tools.prewarm import next_prewarm
+
+        with patch.object(settings, "prewarm_preopen_time", "09:00"), \
+             patch.object(settings, "prewarm_interval_minutes", 15):
+            slot = next_prewarm(datetime(2026, 2, 6, 3, 0, tzinfo=timezone.utc))
+
+        assert slot.astimezone(timezone.utc) == datetime(2026, 2, 6, 3, 30, tzinfo=timezone.utc)
+
+
+class TestPrewarm:
+    """Tests for prewarm()."""
+
+    @pytest.fixture
+    def tools(self):
+        tools = {
+            "SYMBOL_TOOLS": [_tool("Get Stock Price"), _tool("Calculate Technical Indicators")],
+            "MARKET_TOOLS": [_tool("Get Index Data"), _tool("Get FII DII Data")],
+        }
+        news = _tool("Get Comprehensive Stock News")
+        with patch("tools.prewarm.SYMBOL_TOOLS", tools["SYMBOL_TOOLS"]), \
+             patch("tools.prewarm.MARKET_TOOLS", tools["MARKET_TOOLS"]), \
+             patch("tools.prewarm.get_stock_news", news), \
+             patch("tools.prewarm.get_ohlcv_batch") as batch:
+            yield {**tools, "news": news, "batch": batch}
+
+    @pytest.mark.unit
+    def test_warms_every_symbol_and_market_tool(self, tools):
+        from tools.prewarm import prewarm
+
+        summary = prewarm(["tcs", "INFY"], news=True)
+
+        tools["batch"].assert_called_once_with(["TCS.NS", "INFY.NS"], period="1y")
+        price, indicators = tools["SYMBOL_TOOLS"]
+        assert sorted(c.args for c in price.run.call_args_list) == [("INFY",), ("TCS",)]
+        assert indicators.run.call_count == 2
+        assert tools["news"].run.call_count == 2
+        for tool in tools["MARKET_TOOLS"]:
+            tool.run.assert_called_once_with()
+        assert summary["symbols"] == 2
+        assert summary["calls"] == 8
+        assert summary["failed"] == []
+
+    @pytest.mark.unit
+    def test_defaults_to_nifty50_without_news(self, tools):
+        from config import NIFTY50_STOCKS
+        from tools.prewarm import prewarm
+
+        with patch.object(settings, "prewarm_news", False):
+            summary = prewarm()
+
+        assert summary["symbols"] == len(NIFTY50_STOCKS)
+        tools["news"].run.assert_not_called()
+
+    @pytest.mark.unit
+    def test_reports_failed_calls(self, tools):
+        from tools.prewarm import prewarm
+
+        price = tools["SYMBOL_TOOLS"][0]
+        price.run.side_effect = lambda symbol: json.dumps({"error": "No data"}) if symbol == "TCS" else "{}"
+        tools["MARKET_TOOLS"][1].run.side_effect = RuntimeError("NSE down")
+        tools["batch"].side_effect = RuntimeError("Yahoo down")
+
+        summary = prewarm(["TCS", "INFY"], news=False)
+
+        assert sorted(summary["failed"]) == ["Get FII DII Data", "Get Stock Price(TCS)"]
+
+
+class TestPrewarmRefresh:
+    """Pre-warm reloads entries that are still fresh."""
+
+    @pytest.mark.unit
+    def test_fresh_entries_are_renewed(self):
+        from tools.cache import get_cache
+        from tools.prewarm import prewarm
+        from tools.price_store import get_ohlcv
+
+        dates = pd.bdate_range(end=datetime.now().date(), periods=300)
+        prices = np.linspace(100, 200, 300)
+        frame = pd.DataFrame({"Open": prices, "High": prices, "Low": prices, "Close": prices,
+                              "Volume": np.full(300, 1000)}, index=dates)
+        prices_cache, store = get_cache("market_data"), get_cache("ohlcv")
+
+        with patch("tools.price_store.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.history.return_value = frame
+            get_ohlcv("TCS.NS", period="5y")
+        prices_cache.set("price_TCS", {"current_price": 1})
+        for cache, key in ((prices_cache, "price_TCS"), (store, ("TCS.NS", "1d"))):
+            cache._data[key]["timestamp"] -= 600
+        stored_at = store._data[("TCS.NS", "1d")]["timestamp"]
+
+        price_tool = _tool("Get Stock Price")
+        price_tool.run.side_effect = lambda symbol: json.dumps(
+            prices_cache.get_or_load(f"price_{symbol}", lambda: {"current_price": 2})
+        )
+        with patch("tools.prewarm.SYMBOL_TOOLS", [price_tool]), \
+             patch("tools.prewarm.MARKET_TOOLS", []), \
+             patch("tools.price_store.yf.download", return_value=frame) as mock_download:
+            prewarm(["TCS"], news=False)
+
+        mock_download.assert_called_once()
+        assert store._data[("TCS.NS", "1d")]["timestamp"] > stored_at + 599
+        assert prices_cache.get("price_TCS") == {"current_price": 2}
+
+    @pytest.mark.unit
+    def test_news_runs_on_its_own_threads(self):
+        from tools.prewarm import prewarm
+
+        threads = []
+        news = _tool("Get Comprehensive Stock News")
+        news.run.side_effect = lambda symbol: threads.append(threading.current_thread().name) or "{}"
+
+        with patch("tools.prewarm.SYMBOL_TOOLS", []), \
+             patch("tools.prewarm.MARKET_TOOLS", []), \
+             patch("tools.prewarm.get_stock_news", news), \
+             patch("tools.prewarm.get_ohlcv_batch"), \
+             patch.object(settings, "prewarm_news_workers", 2):
+            prewarm(["TCS", "INFY", "SBIN"], news=True)
+
+        assert len(threads) == 3
+        assert all(name.startswith("prewarm-news") for name in threads)
+
+
+class TestRunScheduler:
+    """Tests for run_scheduler()."""
+
+    @pytest.mark.unit
+    def test_runs_when_due_until_stopped(self):
+        from tools.prewarm import run_scheduler
+
+        stop = threading.Event()
+        summaries = []
+
+        def on_run(summary):
+            summaries.append(summary)
+            if len(summaries) == 2:
+                stop.set()
+
+        with patch("tools.prewarm.next_prewarm", return_value=datetime(2026, 1, 1, tzinfo=timezone.utc)), \
+             patch("tools.prewarm.prewarm", return_value={"symbols": 50}):
+            run_scheduler(on_run, stop)
+
+        assert summaries == [{"symbols": 50}, {"symbols": 50}]
+
+    @pytest.mark.unit
+    def test_failed_run_keeps_scheduling(self):
+        from tools.prewarm import run_scheduler
+
+        stop = threading.Event()
+        runs = MagicMock(side_effect=[RuntimeError("boom"), {"symbols": 50}])
+
+        with patch("tools.prewarm.next_prewarm", return_value=datetime(2026, 1, 1, tzinfo=timezone.utc)), \
+             patch("tools.prewarm.prewarm", runs):
+            run_scheduler(lambda summary: stop.set(), stop)
+
+        assert runs.call_count == 2
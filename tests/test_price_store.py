@@ -0,0 +1,443 @@
+"""
+Tests for the Shared OHLCV Store
+
+Tests cover:
+- Period parsing and slicing (including ytd)
+- One download serving multiple periods
+- Widening the stored window on demand
+- Expiry and error propagation
+- Callers sharing the store
+- Parquet persistence and incremental top-up
+- Batched multi-symbol downloads
+"""
+
+import json
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+import pandas as pd
+import numpy as np
+
+
+def _daily_frame(days: int = 300) -> pd.DataFrame:
+    """Business-day OHLCV frame ending today."""
+    dates = pd.bdate_range(end=datetime.now().date(), periods=days)
+    prices = np.linspace(100, 200, days)
+    return pd.DataFrame({
+        'Open': prices,
+        'High': prices + 1,
+        'Low': prices - 1,
+        'Close': prices,
+        'Volume': np.full(days, 1000),
+    }, index=dates)
+
+
+class TestPeriodHelpers:
+    """Tests for period parsing and slicing."""
+
+    @pytest.mark.unit
+    def test_period_ordering(self):
+        from tools.price_store import _period_days
+
+        assert _period_days("2d") < _period_days("3mo") < _period_days("6mo")
+        assert _period_days("6mo") < _period_days("1y") < _period_days("5y")
+        assert _period_days("max") > _period_days("5y")
+
+    @pytest.mark.unit
+    def test_invalid_period_raises(self):
+        from tools.price_store import _period_days
+
+        with pytest.raises(ValueError):
+            _period_days("forever")
+
+    @pytest.mark.unit
+    def test_day_period_counts_sessions(self):
+        from tools.price_store import _slice_period
+
+        df = _daily_frame()
+        sliced = _slice_period(df, "2d")
+        assert len(sliced) == 2
+        assert sliced.index[-1] == df.index[-1]
+
+    @pytest.mark.unit
+    def test_day_period_keeps_all_intraday_bars(self):
+        from tools.price_store import _slice_period
+
+        idx = pd.date_range("2026-01-05 09:15", periods=75 * 3, freq="5min")
+        idx = idx[(idx.hour >= 9) & (idx.hour < 16)]
+        df = pd.DataFrame({'Close': np.arange(len(idx), dtype=float)}, index=idx)
+
+        sliced = _slice_period(df, "1d")
+        assert set(sliced.index.normalize()) == {df.index[-1].normalize()}
+
+    @pytest.mark.unit
+    def test_month_period_slice(self):
+        from tools.price_store import _slice_period
+
+        df = _daily_frame()
+        sliced = _slice_period(df, "3mo")
+        assert sliced.index[0] >= df.index[-1] - pd.DateOffset(months=3)
+        assert sliced.index[-1] == df.index[-1]
+        assert len(sliced) < len(df)
+
+    @pytest.mark.unit
+    def test_ytd_slice_starts_at_new_year(self):
+        from tools.price_store import _slice_period
+
+        df = _daily_frame(600)
+        sliced = _slice_period(df, "ytd")
+        assert sliced.index[0] == df.index[df.index.year == df.index[-1].year][0]
+        assert sliced.index[-1] == df.index[-1]
+
+    @pytest.mark.unit
+    def test_slice_returns_copy(self):
+        from tools.price_store import _slice_period
+
+        df = _daily_frame()
+        sliced = _slice_period(df, "1y")
+        sliced.iloc[-1, sliced.columns.get_loc("Close")] = -1
+        assert df['Close'].iloc[-1] != -1
+
+
+class TestGetOhlcv:
+    """Tests for the shared store."""
+
+    @pytest.mark.unit
+    def test_one_download_serves_shorter_periods(self):
+        from tools.price_store import get_ohlcv
+
+        with patch("tools.price_store.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.history.return_value = _daily_frame()
+
+            get_ohlcv("RELIANCE.NS", period="2d")
+            get_ohlcv("RELIANCE.NS", period="3mo")
+            get_ohlcv("RELIANCE.NS", period="6mo")
+            get_ohlcv("RELIANCE.NS", period="1y")
+
+        assert mock_ticker.return_value.history.call_count == 1
+        _, kwargs = mock_ticker.return_value.history.call_args
+        assert kwargs["period"] == "1y"
+        assert kwargs["interval"] == "1d"
+
+    @pytest.mark.unit
+    def test_wider_period_triggers_wider_download(self):
+        from tools.price_store import get_ohlcv
+
+        with patch("tools.price_store.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.history.return_value = _daily_frame()
+
+            get_ohlcv("TCS.NS", period="6mo")
+            get_ohlcv("TCS.NS", period="5y")
+            get_ohlcv("TCS.NS", period="2y")
+
+        periods = [c.kwargs["period"] for c in mock_ticker.return_value.history.call_args_list]
+        assert periods == ["1y", "5y"]
+
+    @pytest.mark.unit
+    def test_intervals_are_stored_separately(self):
+        from tools.price_store import get_ohlcv
+
+        with patch("tools.price_store.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.history.return_value = _daily_frame()
+
+            get_ohlcv("INFY.NS", period="1mo", interval="30m")
+            get_ohlcv("INFY.NS", period="1mo", interval="1d")
+
+        assert mock_ticker.return_value.history.call_count == 2
+
+    @pytest.mark.unit
+    def test_expired_entry_is_refetched(self):
+        from tools.price_store import get_ohlcv, _store
+
+        with patch("tools.price_store.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.history.return_value = _daily_frame()
+
+            get_ohlcv("SBIN.NS", period="3mo")
+            _store._data[("SBIN.NS", "1d")]["timestamp"] -= _store.ttl + 1
+            get_ohlcv("SBIN.NS", period="3mo")
+
+        assert mock_ticker.return_value.history.call_count == 2
+
+    @pytest.mark.unit
+    def test_empty_result_not_stored(self):
+        from tools.price_store import get_ohlcv, _store
+
+        with patch("tools.price_store.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.history.return_value = pd.DataFrame()
+            result = get_ohlcv("BADSTOCK.NS", period="1y")
+
+        assert result.empty
+        assert ("BADSTOCK.NS", "1d") not in _store
+
+    @pytest.mark.unit
+    def test_download_error_propagates(self):
+        from tools.price_store import get_ohlcv
+
+        with patch("tools.price_store.yf.Ticker", side_effect=Exception("API down")):
+            with pytest.raises(Exception, match="API down"):
+                get_ohlcv("RELIANCE.NS")
+
+
+class TestToolsShareStore:
+    """A full set of price tools should download history once per symbol."""
+
+    @pytest.mark.unit
+    def test_stock_price_refreshes_history_older_than_quote_ttl(self):
+        from tools.market_data import get_stock_price, _cache
+        from tools.price_store import _store
+
+        with patch("yfinance.Ticker") as mock_ticker, patch.object(_store, "ttl", 24 * 3600):
+            mock_ticker.return_value.history.return_value = _daily_frame()
+            mock_ticker.return_value.info = {"marketCap": 1}
+
+            get_stock_price.func("SBIN")
+            _cache.clear()
+            _store._data[("SBIN.NS", "1d")]["timestamp"] -= _cache.ttl + 1
+            get_stock_price.func("SBIN")
+
+        assert mock_ticker.return_value.history.call_count == 2
+
+    @pytest.mark.unit
+    def test_price_history_and_indicators_share_download(self):
+        from tools.market_data import get_stock_price, get_historical_data, _cache
+        from tools.analysis import calculate_technical_indicators, analyze_price_action
+
+        _cache.clear()
+        with patch("yfinance.Ticker") as mock_ticker:
+            mock_ticker.return_value.history.return_value = _daily_frame()
+            mock_ticker.return_value.info = {"marketCap": 1}
+
+            assert "error" not in json.loads(get_stock_price.func("RELIANCE"))
+            assert "error" not in json.loads(get_historical_data.func("RELIANCE", "1y"))
+            assert "error" not in json.loads(calculate_technical_indicators.func("RELIANCE", "6mo"))
+            assert "error" not in json.loads(analyze_price_action.func("RELIANCE"))
+
+        assert mock_ticker.return_value.history.call_count == 1
+
+
+class TestDiskCache:
+    """Tests for Parquet persistence and incremental top-up."""
+
+    @pytest.mark.unit
+    def test_download_is_persisted(self):
+        from tools.price_store import get_ohlcv, _disk_path
+
+        with patch("tools.price_store.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.history.return_value = _daily_frame()
+            get_ohlcv("RELIANCE.NS", period="6mo")
+
+        stored = pd.read_parquet(_disk_path("RELIANCE.NS", "1d"))
+        assert len(stored) == 300
+        assert stored.attrs["period"] == "1y"
+
+    @pytest.mark.unit
+    def test_restart_only_requests_new_bars(self):
+        from tools.price_store import get_ohlcv, clear_ohlcv_store
+
+        full = _daily_frame()
+        with patch("tools.price_store.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.history.return_value = full.iloc[:-1]
+            get_ohlcv("TCS.NS", period="1y")
+
+        clear_ohlcv_store()  # simulate a process restart
+
+        with patch("tools.price_store.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.history.return_value = full.iloc[-2:]
+            result = get_ohlcv("TCS.NS", period="1y")
+
+        _, kwargs = mock_ticker.return_value.history.call_args
+        assert "period" not in kwargs
+        assert kwargs["start"] == full.index[-2].strftime("%Y-%m-%d")
+        assert result.index[-1] == full.index[-1]
+        assert not result.index.duplicated().any()
+
+    @pytest.mark.unit
+    def test_partial_last_bar_is_replaced(self):
+        from tools.price_store import get_ohlcv, clear_ohlcv_store, _store
+
+        full = _daily_frame()
+        stale = full.copy()
+        stale.iloc[-1, stale.columns.get_loc("Close")] = 1.0  # captured mid-session
+
+        with patch("tools.price_store.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.history.return_value = stale
+            get_ohlcv("INFY.NS")
+
+        clear_ohlcv_store()
+
+        with patch("tools.price_store.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.history.return_value = full.iloc[-1:]
+            result = get_ohlcv("INFY.NS")
+
+        assert result['Close'].iloc[-1] == full['Close'].iloc[-1]
+        assert not result.index.duplicated().any()
+        assert len(_store.get_stale(("INFY.NS", "1d"))["df"]) == len(full)
+
+    @pytest.mark.unit
+    def test_corporate_action_forces_full_download(self):
+        from tools.price_store import get_ohlcv, clear_ohlcv_store
+
+        full = _daily_frame()
+        full["Dividends"] = 0.0
+        with patch("tools.price_store.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.history.return_value = full
+            get_ohlcv("ITC.NS")
+
+        clear_ohlcv_store()
+        with_dividend = full.iloc[-1:].copy()
+        with_dividend["Dividends"] = 6.5
+
+        with patch("tools.price_store.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.history.side_effect = [with_dividend, full]
+            get_ohlcv("ITC.NS")
+
+        calls = mock_ticker.return_value.history.call_args_list
+        assert len(calls) == 2
+        assert calls[1].kwargs["period"] == "1y"
+
+    @pytest.mark.unit
+    def test_disk_entry_too_short_is_redownloaded(self):
+        from tools.price_store import get_ohlcv, clear_ohlcv_store
+
+        with patch("tools.price_store.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.history.return_value = _daily_frame()
+            get_ohlcv("SBIN.NS", period="1y")
+
+        clear_ohlcv_store()
+
+        with patch("tools.price_store.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.history.return_value = _daily_frame(1200)
+            get_ohlcv("SBIN.NS", period="5y")
+
+        _, kwargs = mock_ticker.return_value.history.call_args
+        assert kwargs["period"] == "5y"
+
+    @pytest.mark.unit
+    def test_disabled_by_setting(self):
+        from tools.price_store import get_ohlcv, _disk_path
+
+        with patch("tools.price_store.settings") as mock_settings, \
+             patch("tools.price_store.yf.Ticker") as mock_ticker:
+            mock_settings.ohlcv_disk_cache = False
+            mock_ticker.return_value.history.return_value = _daily_frame()
+            get_ohlcv("WIPRO.NS")
+
+        assert not _disk_path("WIPRO.NS", "1d").exists()
+
+    @pytest.mark.unit
+    def test_memory_only_without_pyarrow(self):
+        from tools.price_store import get_ohlcv, _disk_path
+
+        with patch.dict("sys.modules", {"pyarrow": None}), \
+             patch("tools.price_store.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.history.return_value = _daily_frame()
+            df = get_ohlcv("WIPRO.NS")
+
+        assert len(df) > 0
+        assert not _disk_path("WIPRO.NS", "1d").exists()
+
+    @pytest.mark.unit
+    def test_intraday_not_persisted(self):
+        from tools.price_store import get_ohlcv, _disk_path
+
+        with patch("tools.price_store.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.history.return_value = _daily_frame()
+            get_ohlcv("WIPRO.NS", period="5d", interval="5m")
+
+        assert not _disk_path("WIPRO.NS", "5m").exists()
+
+    @pytest.mark.unit
+    def test_index_symbols_get_safe_filenames(self):
+        from tools.price_store import _disk_path
+
+        assert _disk_path("^NSEI", "1d").name == "_NSEI_1d.parquet"
+        assert _disk_path("M&M.NS", "1d").name == "M_M.NS_1d.parquet"
+
+    @pytest.mark.unit
+    def test_corrupt_file_is_ignored(self):
+        from tools.price_store import get_ohlcv, _disk_path
+
+        path = _disk_path("HDFCBANK.NS", "1d")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"not parquet")
+
+        with patch("tools.price_store.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.history.return_value = _daily_frame()
+            result = get_ohlcv("HDFCBANK.NS")
+
+        assert len(result) > 0
+        _, kwargs = mock_ticker.return_value.history.call_args
+        assert kwargs["period"] == "1y"
+
+
+def _batch_frame(frames: dict) -> pd.DataFrame:
+    """Shape several per-symbol frames like `yf.download(group_by="ticker")`."""
+    return pd.concat(frames, axis=1)
+
+
+class TestBatchDownload:
+    """Tests for get_ohlcv_batch."""
+
+    @pytest.mark.unit
+    def test_misses_downloaded_in_one_call(self):
+        from tools.price_store import get_ohlcv_batch, get_ohlcv
+
+        raw = _batch_frame({"TCS.NS": _daily_frame(), "INFY.NS": _daily_frame()})
+        with patch("tools.price_store.yf.download", return_value=raw) as mock_download, \
+             patch("tools.price_store.yf.Ticker") as mock_ticker:
+            result = get_ohlcv_batch(["TCS.NS", "INFY.NS"], period="2d")
+            # Stored like a get_ohlcv download: later calls need no request
+            single = get_ohlcv("TCS.NS", period="6mo")
+
+        assert mock_download.call_count == 1
+        assert mock_download.call_args.kwargs["period"] == "1y"
+        assert list(result) == ["TCS.NS", "INFY.NS"]
+        assert len(result["TCS.NS"]) == 2
+        assert not single.empty
+        mock_ticker.assert_not_called()
+
+    @pytest.mark.unit
+    def test_fresh_symbols_not_downloaded(self):
+        from tools.price_store import get_ohlcv_batch, get_ohlcv
+
+        with patch("tools.price_store.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.history.return_value = _daily_frame()
+            get_ohlcv("TCS.NS")
+
+        raw = _batch_frame({"INFY.NS": _daily_frame()})
+        with patch("tools.price_store.yf.download", return_value=raw) as mock_download:
+            result = get_ohlcv_batch(["TCS.NS", "INFY.NS"], period="5d")
+
+        assert mock_download.call_args.args[0] == ["INFY.NS"]
+        assert len(result["TCS.NS"]) == len(result["INFY.NS"]) == 5
+
+    @pytest.mark.unit
+    def test_symbol_without_data_maps_to_empty_frame(self):
+        from tools.price_store import get_ohlcv_batch, _store
+
+        raw = _batch_frame({"TCS.NS": _daily_frame()})
+        with patch("tools.price_store.yf.download", return_value=raw):
+            result = get_ohlcv_batch(["TCS.NS", "BADSTOCK.NS"], period="2d")
+
+        assert result["BADSTOCK.NS"].empty
+        assert ("BADSTOCK.NS", "1d") not in _store
+
+    @pytest.mark.unit
+    def test_persisted_symbols_topped_up_together(self):
+        from tools.price_store import get_ohlcv_batch, get_ohlcv, clear_ohlcv_store
+
+        full = _daily_frame()
+        with patch("tools.price_store.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.history.return_value = full.iloc[:-1]
+            get_ohlcv("TCS.NS")
+            get_ohlcv("INFY.NS")
+        clear_ohlcv_store()  # simulate a process restart
+
+        raw = _batch_frame({"TCS.NS": full.iloc[-2:], "INFY.NS": full.iloc[-2:]})
+        with patch("tools.price_store.yf.download", return_value=raw) as mock_download:
+            result = get_ohlcv_batch(["TCS.NS", "INFY.NS"], period="1y")
+
+        assert mock_download.call_count == 1
+        assert "start" in mock_download.call_args.kwargs
+        assert result["TCS.NS"].index[-1] == full.index[-1]
+        assert not result["INFY.NS"].index.duplicated().any()
@@ -0,0 +1,181 @@
+"""
+Tests for the Report Store
+
+Tests cover:
+- Saving reports with metadata and reading them back
+- Latest-report lookup and the freshness window
+- Index reload across processes
+- Retention and concurrent saves from several processes
+"""
+
+import json
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+
+class TestSaveReport:
+    """Tests for save_report / load_report."""
+
+    @pytest.mark.unit
+    def test_save_and_load(self, tmp_path):
+        from crews.report_store import load_report, save_report
+
+        data = {"symbol": "TCS", "fetched_at": "2026-02-06T09:30:00", "sections": {"market": {"Get Stock Price": "{}"}}}
+        meta = save_report("tcs", "full", "# TCS Report", data=data)
+
+        assert meta["symbol"] == "TCS"
+        assert meta["analysis_type"] == "full"
+        assert meta["model"]
+        assert len(meta["data_hash"]) == 16
+        assert (tmp_path / "reports" / meta["path"]).read_text() == "# TCS Report"
+
+        loaded = load_report(meta["id"])
+        assert loaded["report"] == "# TCS Report"
+        assert loaded["created_at"] == meta["created_at"]
+
+        index = json.loads((tmp_path / "reports" / "index.json").read_text())
+        assert index["latest"]["TCS:full"] == meta["id"]
+
+    @pytest.mark.unit
+    def test_data_hash_ignores_fetch_time(self):
+        from crews.report_store import data_hash
+
+        sections = {"market": {"Get Stock Price": '{"current_price":3456.5}'}}
+
+        assert data_hash({"fetched_at": "09:30", "sections": sections}) == data_hash({"fetched_at": "10:00", "sections": sections})
+        assert data_hash({"sections": {"market": {}}}) != data_hash({"sections": sections})
+        assert data_hash(None) is None
+
+    @pytest.mark.unit
+    def test_unknown_report(self):
+        from crews.report_store import latest_report, load_report
+
+        assert load_report("missing") is None
+        assert latest_report("TCS") is None
+
+
+class TestLatestReport:
+    """Tests for latest_report / list_reports."""
+
+    @pytest.mark.unit
+    def test_latest_per_symbol_and_type(self):
+        from crews.report_store import latest_report, list_reports, save_report
+
+        save_report("TCS", "full", "first")
+        second = save_report("TCS", "full", "second")
+        quick = save_report("TCS", "quick", "quick one")
+        save_report("INFY", "full", "infy")
+
+        assert latest_report("TCS", "full")["report"] == "second"
+        assert latest_report("tcs", "quick")["report"] == "quick one"
+        assert [m["id"] for m in list_reports("TCS", limit=2)] == [quick["id"], second["id"]]
+        assert len(list_reports()) == 4
+        assert {m["symbol"] for m in list_reports("INFY")} == {"INFY"}
+
+    @pytest.mark.unit
+    def test_max_age(self):
+        from crews.report_store import latest_report, save_report
+
+        save_report("TCS", "full", "report")
+        later = datetime.now() + timedelta(minutes=31)
+
+        assert latest_report("TCS", max_age_minutes=30) is not None
+        with patch("crews.report_store.datetime") as mock_datetime:
+            mock_datetime.now.return_value = later
+            mock_datetime.fromisoformat = datetime.fromisoformat
+            assert latest_report("TCS", max_age_minutes=30) is None
+            assert latest_report("TCS")["report"] == "report"
+
+    @pytest.mark.unit
+    def test_index_written_elsewhere_is_reloaded(self, tmp_path):
+        import os
+        from crews.report_store import latest_report, save_report
+
+        meta = save_report("TCS", "full", "ours")
+        # Another process records a newer report
+        other = {**meta, "id": "TCS_full_other", "path": "TCS/other.md"}
+        (tmp_path / "reports" / "TCS" / "other.md").write_text("theirs")
+        index_path = tmp_path / "reports" / "index.json"
+        index = json.loads(index_path.read_text())
+        index["reports"][other["id"]] = other
+        index["latest"]["TCS:full"] = other["id"]
+        index_path.write_text(json.dumps(index))
+        stat = index_path.stat()
+        os.utime(index_path, (stat.st_atime, stat.st_mtime + 5))
+
+        assert latest_report("TCS")["report"] == "theirs"
+
+
+def _save_many(symbol: str, count: int) -> None:
+    from crews.report_store import save_report
+
+    for i in range(count):
+        save_report(symbol, "full", f"{symbol} {i}")
+
+
+class TestIndexMaintenance:
+    """Tests for retention and saves from several processes."""
+
+    @pytest.mark.unit
+    def test_retention_keeps_newest_reports(self, tmp_path):
+        from config import settings
+        from crews.report_store import latest_report, list_reports, save_report
+
+        with patch.object(settings, "report_retention", 2):
+            first = save_report("TCS", "full", "one")
+            save_report("TCS", "full", "two")
+            save_report("TCS", "full", "three")
+            save_report("TCS", "quick", "quick")
+
+        assert [m["analysis_type"] for m in list_reports("TCS")] == ["quick", "full", "full"]
+        assert latest_report("TCS")["report"] == "three"
+        assert not (tmp_path / "reports" / first["path"]).exists()
+
+    @pytest.mark.unit
+    def test_concurrent_processes_keep_every_entry(self):
+        import multiprocessing
+        from crews.report_store import latest_report, list_reports
+
+        ctx = multiprocessing.get_context("fork")
+        workers = [ctx.Process(target=_save_many, args=(symbol, 10)) for symbol in ["TCS", "INFY", "SBIN", "ITC"]]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=30)
+
+        assert len(list_reports(limit=100)) == 40
+        for symbol in ["TCS", "INFY", "SBIN", "ITC"]:
+            assert latest_report(symbol)["report"] == f"{symbol} 9"
+
+
+class TestAnalysisSavesReports:
+    """Tests for storing reports produced by analyze_stock_sync."""
+
+    @pytest.mark.unit
+    def test_new_report_is_stored_with_data_hash(self):
+        with patch.dict('os.environ', {'MISTRAL_API_KEY': 'test_key'}):
+            from crews.report_store import data_hash, latest_report
+            from crews.research_crew import analyze_stock_sync
+
+            data = {"symbol": "TCS", "fetched_at": "2026-02-06T09:30:00", "sections": {"market": {}}}
+            with patch("crews.research_crew.prefetch_data", return_value=data), \
+                 patch("crews.research_crew.create_stock_research_crew") as mock_create:
+                mock_create.return_value.kickoff.return_value = "# TCS"
+                analyze_stock_sync("TCS", "quick")
+
+            stored = latest_report("TCS", "quick")
+            assert stored["report"] == "# TCS"
+            assert stored["data_hash"] == data_hash(data)
+
+    @pytest.mark.unit
+    def test_fresh_stored_report_skips_crew(self):
+        with patch.dict('os.environ', {'MISTRAL_API_KEY': 'test_key'}):
+            from crews.report_store import save_report
+            from crews.research_crew import analyze_stock_sync
+
+            save_report("TCS", "full", "# Saved earlier")
+            with patch("crews.research_crew.create_stock_research_crew") as mock_create:
+                assert analyze_stock_sync("TCS", "full") == "# Saved earlier"
+
+            mock_create.assert_not_called()
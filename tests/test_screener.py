@@ -0,0 +1,147 @@
+"""
+Tests for the Technical Screener
+
+Tests cover:
+- Signal rules evaluated across a universe
+- Criteria filtering and ranking
+- Universe resolution (NIFTY50, sectors, custom lists)
+- Tool error handling
+"""
+
+import json
+import pytest
+from unittest.mock import patch
+import pandas as pd
+import numpy as np
+
+
+def _frame(close: np.ndarray, last_volume_multiple: float = 1.0) -> pd.DataFrame:
+    """OHLCV frame around a close path, optionally spiking the last bar's volume."""
+    volume = np.full(len(close), 1_000_000.0)
+    volume[-1] *= last_volume_multiple
+    return pd.DataFrame({
+        "Open": close,
+        "High": close + 5,
+        "Low": close - 5,
+        "Close": close,
+        "Volume": volume,
+    }, index=pd.bdate_range(end="2026-02-06", periods=len(close)))
+
+
+def _frames(symbols: list[str], period: str = "6mo") -> dict:
+    """Stand-in for get_ohlcv_batch: one falling stock, one rising on heavy
+    volume, and one with too little history."""
+    days = 120
+    frames = {
+        "FALL.NS": _frame(np.linspace(2000, 1000, days)),
+        "RISE.NS": _frame(np.linspace(1000, 2000, days), last_volume_multiple=3),
+        "NEW.NS": _frame(np.linspace(100, 110, 30)),
+    }
+    return {sym: frames.get(sym, pd.DataFrame()) for sym in symbols}
+
+
+class TestSignalFlags:
+    """Tests for signal_flags."""
+
+    @pytest.mark.unit
+    def test_rules_follow_indicator_values(self):
+        from tools.indicators import signal_flags
+
+        table = pd.DataFrame({
+            "price": [100.0, 100.0],
+            "rsi_14": [25.0, 65.0],
+            "macd": [1.0, -1.0],
+            "macd_signal": [0.5, 0.0],
+            "macd_prev": [0.2, 0.1],
+            "macd_signal_prev": [0.4, 0.0],
+            "bb_upper": [120.0, 100.0],
+            "bb_lower": [100.0, 80.0],
+            "volume_ratio": [2.5, 1.0],
+            "sma_20": [105.0, 95.0],
+            "sma_50": [110.0, 90.0],
+        }, index=["A", "B"])
+
+        flags = signal_flags(table)
+
+        assert [r for r in flags.columns if flags.at["A", r]] == [
+            "rsi_oversold", "macd_bullish_cross", "bb_lower_touch", "volume_spike", "ma_downtrend",
+        ]
+        assert [r for r in flags.columns if flags.at["B", r]] == [
+            "rsi_near_overbought", "macd_bearish_cross", "bb_upper_touch", "ma_uptrend",
+        ]
+
+
+class TestScreen:
+    """Tests for screen()."""
+
+    @pytest.mark.unit
+    def test_matches_ranked_by_score(self):
+        from tools.screener import screen
+
+        with patch("tools.indicators.get_ohlcv_batch", side_effect=_frames):
+            result = screen("FALL,RISE,NEW")
+
+        assert result["universe"] == "CUSTOM"
+        assert result["scanned"] == 2
+        assert result["missing"] == ["NEW"]
+        assert [m["symbol"] for m in result["matches"]] == ["RISE", "FALL"]
+        rise = result["matches"][0]
+        assert "volume_spike" in rise["rules"]
+        assert "ma_uptrend" in rise["rules"]
+        assert rise["score"] >= result["matches"][1]["score"]
+
+    @pytest.mark.unit
+    def test_criteria_must_all_match(self):
+        from tools.screener import screen
+
+        with patch("tools.indicators.get_ohlcv_batch", side_effect=_frames):
+            result = screen("FALL,RISE", ["ma_downtrend"])
+            none = screen("FALL,RISE", ["ma_downtrend", "volume_spike"])
+
+        assert [m["symbol"] for m in result["matches"]] == ["FALL"]
+        assert none["matches"] == []
+
+    @pytest.mark.unit
+    def test_sector_universe_uses_one_batch(self):
+        from config import SECTORS
+        from tools.screener import screen
+
+        with patch("tools.indicators.get_ohlcv_batch", return_value={}) as mock_batch:
+            result = screen("it")
+
+        mock_batch.assert_called_once()
+        assert mock_batch.call_args[0][0] == [f"{s}.NS" for s in SECTORS["IT"]]
+        assert result["universe"] == "IT"
+        assert result["missing"] == SECTORS["IT"]
+
+
+class TestScreenStocksTool:
+    """Tests for the Screen Stocks tool."""
+
+    @pytest.mark.unit
+    def test_returns_json(self):
+        from tools.screener import screen_stocks
+
+        with patch("tools.indicators.get_ohlcv_batch", side_effect=_frames):
+            data = json.loads(screen_stocks.func("FALL,RISE", "", 1))
+
+        assert data["matches_count"] == 2
+        assert len(data["matches"]) == 1
+
+    @pytest.mark.unit
+    def test_unknown_criteria(self):
+        from tools.screener import screen_stocks
+
+        data = json.loads(screen_stocks.func("NIFTY50", "rsi_oversold,moon_phase"))
+
+        assert "moon_phase" in data["error"]
+
+    @pytest.mark.unit
+    def test_download_failure(self):
+        from tools.screener import screen_stocks
+
+        with patch("tools.indicators.get_ohlcv_batch", side_effect=ConnectionError("API down")):
+            data = json.loads(screen_stocks.func("NIFTY50"))
+
+        assert data["DATA_UNAVAILABLE"] is True
+        assert "API down" in data["error"]
@@ -58,6 +58,7 @@ class TestStockResearchBotInit:
             "start",
             "help_command",
             "analyze_command",
+            "cancel_command",
             "quick_command",
             "technical_command",
             "fundamental_command",
@@ -156,7 +157,7 @@ class TestAnalyzeCommand:
 
     @pytest.mark.unit
     @pytest.mark.asyncio
-    @patch("bot.telegram_bot.analyze_stock_sync")
+    @patch("crews.research_crew._run_analysis")
     async def test_analyze_success(self, mock_sync, bot_instance, mock_update, mock_context):
         """Test /analyze succeeds and sends the report."""
         from bot.telegram_bot import user_last_request
@@ -170,14 +171,42 @@ class TestAnalyzeCommand:
         mock_update.message.reply_text = AsyncMock(side_effect=[status_msg, None])
         try:
             await bot_instance.analyze_command(mock_update, mock_context)
-            mock_sync.assert_called_once_with("RELIANCE", "full")
+            assert mock_sync.call_args.args[:2] == ("RELIANCE", "full")
             status_msg.delete.assert_awaited_once()
         finally:
             user_last_request.pop(12345, None)
 
     @pytest.mark.unit
     @pytest.mark.asyncio
-    @patch("bot.telegram_bot.analyze_stock_sync", side_effect=RuntimeError("API down"))
+    async def test_analyze_ticks_off_finished_agents(self, bot_instance, mock_update, mock_context):
+        """Test /analyze edits the status message as each agent finishes."""
+        from bot.telegram_bot import user_last_request
+
+        user_last_request.pop(12345, None)
+
+        def run_analysis(symbol, analysis_type, on_task_complete):
+            for done, role in enumerate(["Market Data Analyst", "Technical Analyst"], start=1):
+                on_task_complete(MagicMock(agent=role), done, 6)
+            return "Full analysis report for TCS"
+
+        mock_context.args = ["TCS"]
+        status_msg = AsyncMock()
+        mock_update.message.reply_text = AsyncMock(side_effect=[status_msg, None])
+        try:
+            with patch("crews.research_crew._run_analysis", side_effect=run_analysis):
+                await bot_instance.analyze_command(mock_update, mock_context)
+
+            edits = [c.args[0] for c in status_msg.edit_text.call_args_list]
+            assert len(edits) == 2
+            assert "✅ 📊 Market Data Collection" in edits[0] and "⏳ 📈 Technical Analysis" in edits[0]
+            assert "✅ 📈 Technical Analysis" in edits[1] and "(2/6)" in edits[1]
+            status_msg.delete.assert_awaited_once()
+        finally:
+            user_last_request.pop(12345, None)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    @patch("crews.research_crew._run_analysis", side_effect=RuntimeError("API down"))
     async def test_analyze_handles_error(self, mock_sync, bot_instance, mock_update, mock_context):
         """Test /analyze handles exceptions gracefully."""
         from bot.telegram_bot import user_last_request
@@ -196,6 +225,85 @@ class TestAnalyzeCommand:
             user_last_request.pop(12345, None)
 
 
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_analyze_refuses_second_job(self, bot_instance, mock_update, mock_context):
+        """Test /analyze points to /cancel while the user's job is still active."""
+        mock_context.args = ["TCS"]
+        active = MagicMock(symbol="INFY", state="queued")
+        with patch.object(bot_instance.jobs, "active_job", return_value=active), \
+             patch.object(bot_instance.jobs, "submit") as mock_submit:
+            await bot_instance.analyze_command(mock_update, mock_context)
+
+        text = mock_update.message.reply_text.call_args[0][0]
+        assert "INFY" in text and "/cancel" in text
+        mock_submit.assert_not_called()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_analyze_queue_full(self, bot_instance, mock_update, mock_context):
+        """Test /analyze reports a full queue without touching the cooldown."""
+        import asyncio
+        from bot.telegram_bot import user_last_request
+
+        user_last_request.pop(12345, None)
+        mock_context.args = ["TCS"]
+        with patch.object(bot_instance.jobs, "submit", side_effect=asyncio.QueueFull):
+            await bot_instance.analyze_command(mock_update, mock_context)
+
+        assert "Too many analyses" in mock_update.message.reply_text.call_args[0][0]
+        assert 12345 not in user_last_request
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_analyze_quick_option(self, bot_instance, mock_update, mock_context):
+        """Test `/analyze SYMBOL quick` queues a quick analysis."""
+        from bot.telegram_bot import user_last_request
+
+        user_last_request.pop(12345, None)
+        mock_context.args = ["TCS", "quick"]
+        status_msg = AsyncMock()
+        mock_update.message.reply_text = AsyncMock(side_effect=[status_msg, None])
+        try:
+            with patch("crews.research_crew._run_analysis", return_value="Quick report") as mock_sync:
+                await bot_instance.analyze_command(mock_update, mock_context)
+            assert mock_sync.call_args.args[:2] == ("TCS", "quick")
+        finally:
+            user_last_request.pop(12345, None)
+
+
+# ---------------------------------------------------------------------------
+# /cancel command
+# ---------------------------------------------------------------------------
+class TestCancelCommand:
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cancel_without_job(self, bot_instance, mock_update, mock_context):
+        await bot_instance.cancel_command(mock_update, mock_context)
+        assert "no analysis" in mock_update.message.reply_text.call_args[0][0]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cancel_queued_job(self, bot_instance, mock_update, mock_context):
+        job = MagicMock(symbol="TCS", state="cancelled")
+        with patch.object(bot_instance.jobs, "active_job", return_value=job), \
+             patch.object(bot_instance.jobs, "cancel", return_value=True) as mock_cancel:
+            await bot_instance.cancel_command(mock_update, mock_context)
+
+        mock_cancel.assert_called_once_with(job)
+        assert "Removed TCS from the queue" in mock_update.message.reply_text.call_args[0][0]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_cancel_running_job(self, bot_instance, mock_update, mock_context):
+        job = MagicMock(symbol="TCS", state="running")
+        with patch.object(bot_instance.jobs, "active_job", return_value=job), \
+             patch.object(bot_instance.jobs, "cancel", return_value=True):
+            await bot_instance.cancel_command(mock_update, mock_context)
+
+        assert "after the current agent" in mock_update.message.reply_text.call_args[0][0]
+
+
 # ---------------------------------------------------------------------------
 # /quick command
 # ---------------------------------------------------------------------------
@@ -348,10 +456,10 @@ class TestNewsCommand:
 
     @pytest.mark.unit
     @pytest.mark.asyncio
-    @patch("bot.telegram_bot.get_stock_news")
+    @patch("bot.telegram_bot.get_stock_news_async", new_callable=AsyncMock)
     async def test_news_success_with_articles(self, mock_news, bot_instance, mock_update, mock_context):
         """Test /news returns formatted articles."""
-        mock_news.run.return_value = json.dumps({
+        mock_news.return_value = json.dumps({
             "articles": [
                 {"title": "Reliance Q3 beats estimates", "source": "ET", "url": "https://example.com/1"},
                 {"title": "Jio adds 10M users", "source": "MC", "url": ""},
@@ -365,10 +473,10 @@ class TestNewsCommand:
 
     @pytest.mark.unit
     @pytest.mark.asyncio
-    @patch("bot.telegram_bot.get_stock_news")
+    @patch("bot.telegram_bot.get_stock_news_async", new_callable=AsyncMock)
     async def test_news_no_articles(self, mock_news, bot_instance, mock_update, mock_context):
         """Test /news when no articles are found."""
-        mock_news.run.return_value = json.dumps({"articles": []})
+        mock_news.return_value = json.dumps({"articles": []})
         mock_context.args = ["OBSCURE"]
         await bot_instance.news_command(mock_update, mock_context)
         text = mock_update.message.reply_text.call_args[0][0]
@@ -393,6 +501,67 @@ class TestMarketCommand:
         assert "Market Overview" in text
 
 
+# ---------------------------------------------------------------------------
+# /screen command
+# ---------------------------------------------------------------------------
+class TestScreenCommand:
+    SCREEN_RESULT = {
+        "universe": "IT",
+        "scanned": 8,
+        "matches_count": 1,
+        "matches": [{
+            "symbol": "INFY", "price": 1450.5, "rsi_14": 27.3, "volume_ratio": 2.4,
+            "overall_signal": "NEUTRAL", "score": 4,
+            "rules": ["rsi_oversold", "volume_spike"],
+            "signals": [
+                {"indicator": "RSI", "signal": "OVERSOLD - Potential Buy", "strength": "Strong"},
+                {"indicator": "Volume", "signal": "Unusually High Volume - Confirm Trend", "strength": "Strong"},
+            ],
+        }],
+        "missing": [],
+    }
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    @patch("bot.telegram_bot.screen_stocks")
+    async def test_screen_sector_with_criteria(self, mock_screen, bot_instance, mock_update, mock_context):
+        """Test /screen passes universe and criteria and lists matches."""
+        mock_screen.run.return_value = json.dumps(self.SCREEN_RESULT)
+        mock_context.args = ["it", "rsi_oversold", "volume_spike"]
+        await bot_instance.screen_command(mock_update, mock_context)
+
+        mock_screen.run.assert_called_once_with("IT", "rsi_oversold,volume_spike", 10)
+        text = mock_update.message.reply_text.call_args[0][0]
+        assert "IT Screener" in text
+        assert "INFY" in text
+        assert "OVERSOLD" in text
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    @patch("bot.telegram_bot.screen_stocks")
+    async def test_screen_defaults_to_nifty50(self, mock_screen, bot_instance, mock_update, mock_context):
+        """Test /screen with only rules screens NIFTY 50."""
+        mock_screen.run.return_value = json.dumps({**self.SCREEN_RESULT, "matches": [], "matches_count": 0})
+        mock_context.args = ["macd_bullish_cross"]
+        await bot_instance.screen_command(mock_update, mock_context)
+
+        mock_screen.run.assert_called_once_with("NIFTY50", "macd_bullish_cross", 10)
+        text = mock_update.message.reply_text.call_args[0][0]
+        assert "No stocks match" in text
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    @patch("bot.telegram_bot.screen_stocks")
+    async def test_screen_error(self, mock_screen, bot_instance, mock_update, mock_context):
+        """Test /screen reports tool errors."""
+        mock_screen.run.return_value = json.dumps({"error": "Unknown criteria: foo"})
+        mock_context.args = []
+        await bot_instance.screen_command(mock_update, mock_context)
+
+        text = mock_update.message.reply_text.call_args[0][0]
+        assert "Unknown criteria" in text
+
+
 # ---------------------------------------------------------------------------
 # /nifty50 command
 # ---------------------------------------------------------------------------
@@ -608,7 +777,7 @@ class TestSetupCommands:
         await bot_instance.setup_commands(app)
         app.bot.set_my_commands.assert_awaited_once()
         commands = app.bot.set_my_commands.call_args[0][0]
-        assert len(commands) == 10  # 10 bot commands
+        assert len(commands) == 12  # 12 bot commands
 
 
 # ---------------------------------------------------------------------------
@@ -630,8 +799,47 @@ class TestRunMethod:
             mock_builder.token.assert_called_once_with("test_token_12345678:ABC")
             mock_builder.build.assert_called_once()
             # 10 command handlers + 1 callback + 1 message = 12
-            assert mock_app.add_handler.call_count == 12
+            assert mock_app.add_handler.call_count == 14
             mock_app.run_polling.assert_called_once()
+            mock_app.job_queue.run_once.assert_called_once()
+
+
+# ---------------------------------------------------------------------------
+# Cache pre-warm scheduling
+# ---------------------------------------------------------------------------
+class TestPrewarmJob:
+    @pytest.mark.unit
+    def test_schedule_prewarm_runs_at_next_slot(self, bot_instance):
+        """The next pre-warm is queued as a one-off job at the next schedule slot."""
+        from tools.prewarm import IST
+
+        slot = datetime(2026, 2, 6, 9, 0, tzinfo=IST)
+        bot_instance.application = MagicMock()
+        with patch("bot.telegram_bot.next_prewarm", return_value=slot):
+            bot_instance.schedule_prewarm()
+
+        bot_instance.application.job_queue.run_once.assert_called_once_with(
+            bot_instance.prewarm_job, when=slot, name="prewarm",
+        )
+
+    @pytest.mark.unit
+    def test_schedule_prewarm_without_job_queue(self, bot_instance):
+        """Without the job-queue extra, scheduling is skipped."""
+        bot_instance.application = MagicMock(job_queue=None)
+        bot_instance.schedule_prewarm()  # does not raise
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_prewarm_job_reschedules(self, bot_instance, mock_context):
+        """Each run warms the caches and queues the next one, even after an error."""
+        summary = {"symbols": 50, "calls": 203, "failed": [], "seconds": 12.5}
+        with patch("bot.telegram_bot.prewarm", side_effect=[summary, RuntimeError("down")]) as mock_prewarm, \
+             patch.object(bot_instance, "schedule_prewarm") as mock_schedule:
+            await bot_instance.prewarm_job(mock_context)
+            await bot_instance.prewarm_job(mock_context)
+
+        assert mock_prewarm.call_count == 2
+        assert mock_schedule.call_count == 2
 
 
 # ---------------------------------------------------------------------------
@@ -738,8 +946,8 @@ class TestCommandExceptionHandlers:
     @pytest.mark.asyncio
     async def test_news_command_exception(self, bot_instance, mock_update, mock_context):
         """Test news_command handles exception (lines 548-550)."""
-        with patch("bot.telegram_bot.get_stock_news") as mock_news:
-            mock_news.run = MagicMock(side_effect=ConnectionError("Timeout"))
+        with patch("bot.telegram_bot.get_stock_news_async",
+                   new=AsyncMock(side_effect=ConnectionError("Timeout"))):
             await bot_instance.news_command(mock_update, mock_context)
         reply_text_calls = mock_update.message.reply_text.call_args_list
         assert any("Error" in str(c) or "error" in str(c).lower() for c in reply_text_calls)
@@ -813,7 +1021,7 @@ class TestCallbackEdgeCases:
     async def test_callback_analyze_prefix(self, bot_instance, mock_update, mock_context):
         """Test analyze_ callback prefix dispatches to analyze_command."""
         mock_update.callback_query.data = "analyze_INFY"
-        with patch("bot.telegram_bot.analyze_stock_sync", return_value="## INFY Report\nTest report"):
+        with patch("crews.research_crew._run_analysis", return_value="## INFY Report\nTest report"):
             await bot_instance.handle_callback(mock_update, mock_context)
         mock_update.callback_query.message.reply_text.assert_called()
         call_str = str(mock_update.callback_query.message.reply_text.call_args)
@@ -846,11 +1054,11 @@ class TestCallbackEdgeCases:
     async def test_callback_news_prefix(self, bot_instance, mock_update, mock_context):
         """Test news_ callback prefix (lines 704-707)."""
         mock_update.callback_query.data = "news_TCS"
-        with patch("bot.telegram_bot.get_stock_news") as mock_news:
-            mock_news.run = MagicMock(return_value=json.dumps({
+        with patch("bot.telegram_bot.get_stock_news_async", new_callable=AsyncMock) as mock_news:
+            mock_news.return_value = json.dumps({
                 "articles": [{"title": "TCS wins deal", "source": "ET", "url": "https://example.com"}],
                 "total_articles": 1,
-            }))
+            })
             await bot_instance.handle_callback(mock_update, mock_context)
         assert mock_update.callback_query.answer.called
         assert mock_context.args == ["TCS"]
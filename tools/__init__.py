@@ -8,6 +8,7 @@ from tools.market_data import (
     get_historical_data,
     get_index_data,
     get_nse_stock_quote,
+    get_batch_quotes,
 )
 from tools.news_scraper import (
     scrape_et_rss_news,
@@ -21,6 +22,7 @@ from tools.analysis import (
     get_fundamental_metrics,
     analyze_price_action,
 )
+from tools.screener import screen_stocks
 from tools.institutional import (
     get_fii_dii_data,
     get_bulk_block_deals,
@@ -34,6 +36,7 @@ __all__ = [
     "get_historical_data",
     "get_index_data",
     "get_nse_stock_quote",
+    "get_batch_quotes",
     "scrape_et_rss_news",
     "scrape_economic_times_news",
     "scrape_google_news",
@@ -41,6 +44,7 @@ __all__ = [
     "calculate_technical_indicators",
     "get_fundamental_metrics",
     "analyze_price_action",
+    "screen_stocks",
     "get_fii_dii_data",
     "get_bulk_block_deals",
     "get_market_news_headlines",
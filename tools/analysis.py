@@ -5,12 +5,25 @@ Technical and Fundamental Analysis Tools for Indian Stocks
 import json
 from datetime import datetime
 from typing import Optional
-import yfinance as yf
 import pandas as pd
 import numpy as np
 from crewai.tools import tool
 
 from config import TECHNICAL_CONFIG, FUNDAMENTAL_THRESHOLDS
+from tools.cache import get_cache
+from tools.company_profile import get_company_profile
+from tools.indicators import (
+    latest_indicators,
+    overall_signal,
+    signal_flags,
+    signals_from_flags,
+    swing_highs as find_swing_highs,
+    swing_lows as find_swing_lows,
+)
+from tools.price_store import get_ohlcv
+
+# Shared cache of computed results (TTL/size from Settings)
+_cache = get_cache("analysis")
 
 
 def _safe_json_dumps(data: dict, **kwargs) -> str:
@@ -29,6 +42,16 @@ def _safe_json_dumps(data: dict, **kwargs) -> str:
     return json.dumps(_sanitize(data), **kwargs)
 
 
+def _latest_bar_key(df: pd.DataFrame) -> tuple:
+    """Identity of the newest bar in `df`, for keying results on their input.
+
+    The bar's close and volume are included with its timestamp so a session
+    bar revised intraday counts as new data too.
+    """
+    last = df.iloc[-1]
+    return (df.index[-1].isoformat(), float(last["Close"]), float(last["Volume"]))
+
+
 def _get_nse_symbol(symbol: str) -> str:
     """Convert symbol to NSE Yahoo Finance format."""
     symbol = symbol.upper().strip()
@@ -51,8 +74,7 @@ def calculate_technical_indicators(symbol: str, period: str = "6mo") -> str:
         JSON string with all technical indicators and trading signals.
     """
     try:
-        ticker = yf.Ticker(_get_nse_symbol(symbol))
-        df = ticker.history(period=period)
+        df = get_ohlcv(_get_nse_symbol(symbol), period=period)
         
         if df.empty or len(df) < 50:
             return json.dumps({
@@ -60,82 +82,57 @@ def calculate_technical_indicators(symbol: str, period: str = "6mo") -> str:
                 "DATA_UNAVAILABLE": True,
                 "message": f"Cannot compute technical indicators for {symbol}. Do NOT guess indicator values.",
             })
-        
-        close = df['Close']
-        high = df['High']
-        low = df['Low']
-        volume = df['Volume']
-        
-        # ==========================================
+
+        # Results are reused until a new (or revised) bar arrives
+        cache_key = ("technical", symbol.upper(), period, *_latest_bar_key(df))
+        cached = _cache.get(cache_key)
+        if cached is not None:
+            return _safe_json_dumps(cached, indent=2)
+        
+        # Streamed per-bar state: only bars since the last call are processed
+        ind = latest_indicators((symbol.upper(), period), df)
+
+        current_price = ind["price"]
+
         # Moving Averages
-        # ==========================================
-        sma_20 = close.rolling(window=20).mean().iloc[-1]
-        sma_50 = close.rolling(window=50).mean().iloc[-1]
-        sma_200 = close.rolling(window=200).mean().iloc[-1] if len(close) >= 200 else None
-        ema_12 = close.ewm(span=12, adjust=False).mean().iloc[-1]
-        ema_26 = close.ewm(span=26, adjust=False).mean().iloc[-1]
-        
-        # ==========================================
-        # RSI (Relative Strength Index)
-        # ==========================================
-        delta = close.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        current_rsi = rsi.iloc[-1]
-        
-        # ==========================================
-        # MACD
-        # ==========================================
-        exp1 = close.ewm(span=12, adjust=False).mean()
-        exp2 = close.ewm(span=26, adjust=False).mean()
-        macd = exp1 - exp2
-        signal_line = macd.ewm(span=9, adjust=False).mean()
-        
-        # ==========================================
+        sma_20 = ind["sma_20"]
+        sma_50 = ind["sma_50"]
+        sma_200 = ind["sma_200"] if not pd.isna(ind["sma_200"]) else None
+        ema_12 = ind["ema_12"]
+        ema_26 = ind["ema_26"]
+
+        # RSI, MACD
+        current_rsi = ind["rsi_14"]
+        macd_line = ind["macd"]
+        macd_signal = ind["macd_signal"]
+
         # Bollinger Bands
-        # ==========================================
-        bb_middle = close.rolling(window=20).mean()
-        bb_std = close.rolling(window=20).std()
-        bb_upper = bb_middle + (bb_std * 2)
-        bb_lower = bb_middle - (bb_std * 2)
-        
-        current_price = close.iloc[-1]
-        bb_width = bb_upper.iloc[-1] - bb_lower.iloc[-1]
-        bb_position = (current_price - bb_lower.iloc[-1]) / bb_width if bb_width != 0 else 0.5
-        
-        # ==========================================
+        bb_upper = ind["bb_upper"]
+        bb_middle = ind["bb_middle"]
+        bb_lower = ind["bb_lower"]
+        bb_width = bb_upper - bb_lower
+        bb_position = (current_price - bb_lower) / bb_width if bb_width != 0 else 0.5
+
         # ATR (Average True Range)
-        # ==========================================
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = tr.rolling(window=14).mean().iloc[-1]
+        atr = ind["atr_14"]
         atr_percent = (atr / current_price) * 100
-        
-        # ==========================================
+
         # Volume Analysis
-        # ==========================================
-        avg_volume_20 = volume.rolling(window=20).mean().iloc[-1]
-        current_volume = volume.iloc[-1]
-        volume_ratio = current_volume / avg_volume_20
-        
-        # ==========================================
-        # Momentum Indicators
-        # ==========================================
-        # Rate of Change (ROC)
-        roc_10 = ((current_price - close.iloc[-11]) / close.iloc[-11]) * 100 if len(close) > 10 else 0
-        roc_20 = ((current_price - close.iloc[-21]) / close.iloc[-21]) * 100 if len(close) > 20 else 0
-        
+        avg_volume_20 = ind["avg_volume_20"]
+        current_volume = ind["volume"]
+        volume_ratio = ind["volume_ratio"]
+
+        # Momentum Indicators (Rate of Change)
+        roc_10 = ind["roc_10"]
+        roc_20 = ind["roc_20"]
+
         # ==========================================
         # Support & Resistance Levels (Standard Daily Pivots)
         # ==========================================
         # Use the PREVIOUS completed day's H/L/C for standard pivot points
-        prev_high = high.iloc[-2] if len(high) > 1 else high.iloc[-1]
-        prev_low = low.iloc[-2] if len(low) > 1 else low.iloc[-1]
-        prev_close = close.iloc[-2] if len(close) > 1 else close.iloc[-1]
+        prev_high = ind["prev_high"]
+        prev_low = ind["prev_low"]
+        prev_close = ind["prev_close"]
         pivot = (prev_high + prev_low + prev_close) / 3
         r1 = 2 * pivot - prev_low
         s1 = 2 * pivot - prev_high
@@ -143,8 +140,8 @@ def calculate_technical_indicators(symbol: str, period: str = "6mo") -> str:
         s2 = pivot - (prev_high - prev_low)
 
         # 20-day context levels (not pivot-derived)
-        recent_high = high.tail(20).max()
-        recent_low = low.tail(20).min()
+        recent_high = ind["recent_high"]
+        recent_low = ind["recent_low"]
         
         # ==========================================
         # Trend Analysis
@@ -154,55 +151,15 @@ def calculate_technical_indicators(symbol: str, period: str = "6mo") -> str:
         trend_long = "Bullish" if sma_200 and current_price > sma_200 else ("Bearish" if sma_200 else "N/A")
         
         # Golden/Death Cross
-        golden_cross = sma_50 > sma_200 if sma_200 else None
+        golden_cross = bool(sma_50 > sma_200) if sma_200 else None
         
         # ==========================================
         # Trading Signals
         # ==========================================
-        signals = []
-        
-        # RSI signals
-        if current_rsi < 30:
-            signals.append({"indicator": "RSI", "signal": "OVERSOLD - Potential Buy", "strength": "Strong"})
-        elif current_rsi > 70:
-            signals.append({"indicator": "RSI", "signal": "OVERBOUGHT - Potential Sell", "strength": "Strong"})
-        elif current_rsi < 40:
-            signals.append({"indicator": "RSI", "signal": "Approaching Oversold", "strength": "Moderate"})
-        elif current_rsi > 60:
-            signals.append({"indicator": "RSI", "signal": "Approaching Overbought", "strength": "Moderate"})
-        
-        # MACD signals
-        if macd.iloc[-1] > signal_line.iloc[-1] and macd.iloc[-2] <= signal_line.iloc[-2]:
-            signals.append({"indicator": "MACD", "signal": "Bullish Crossover - Buy", "strength": "Strong"})
-        elif macd.iloc[-1] < signal_line.iloc[-1] and macd.iloc[-2] >= signal_line.iloc[-2]:
-            signals.append({"indicator": "MACD", "signal": "Bearish Crossover - Sell", "strength": "Strong"})
-        
-        # Bollinger Band signals
-        if current_price <= bb_lower.iloc[-1]:
-            signals.append({"indicator": "Bollinger Bands", "signal": "At Lower Band - Potential Reversal", "strength": "Moderate"})
-        elif current_price >= bb_upper.iloc[-1]:
-            signals.append({"indicator": "Bollinger Bands", "signal": "At Upper Band - Potential Pullback", "strength": "Moderate"})
-        
-        # Volume signals
-        if volume_ratio > 2:
-            signals.append({"indicator": "Volume", "signal": "Unusually High Volume - Confirm Trend", "strength": "Strong"})
-        
-        # Moving Average signals
-        if current_price > sma_20 > sma_50:
-            signals.append({"indicator": "Moving Averages", "signal": "Strong Uptrend", "strength": "Moderate"})
-        elif current_price < sma_20 < sma_50:
-            signals.append({"indicator": "Moving Averages", "signal": "Strong Downtrend", "strength": "Moderate"})
-        
-        # Overall recommendation
-        bullish_signals = sum(1 for s in signals if "Buy" in s["signal"] or "Bullish" in s["signal"] or "Uptrend" in s["signal"])
-        bearish_signals = sum(1 for s in signals if "Sell" in s["signal"] or "Bearish" in s["signal"] or "Downtrend" in s["signal"])
-        
-        if bullish_signals > bearish_signals + 1:
-            overall_signal = "BULLISH"
-        elif bearish_signals > bullish_signals + 1:
-            overall_signal = "BEARISH"
-        else:
-            overall_signal = "NEUTRAL"
+        # RSI bands, MACD crossover, Bollinger touches, volume spike and MA
+        # stacking (rules shared with the screener, see tools.indicators)
+        signals = signals_from_flags(signal_flags(ind.to_frame().T).iloc[0])
+        overall, bullish_signals, bearish_signals = overall_signal(signals)
         
         result = {
             "symbol": symbol.upper(),
@@ -222,17 +179,17 @@ def calculate_technical_indicators(symbol: str, period: str = "6mo") -> str:
             "momentum": {
                 "rsi_14": round(current_rsi, 2),
                 "rsi_interpretation": "Oversold" if current_rsi < 30 else ("Overbought" if current_rsi > 70 else "Neutral"),
-                "macd_line": round(macd.iloc[-1], 2),
-                "macd_signal": round(signal_line.iloc[-1], 2),
-                "macd_histogram": round(macd.iloc[-1] - signal_line.iloc[-1], 2),
+                "macd_line": round(macd_line, 2),
+                "macd_signal": round(macd_signal, 2),
+                "macd_histogram": round(macd_line - macd_signal, 2),
                 "roc_10_day": round(roc_10, 2),
                 "roc_20_day": round(roc_20, 2),
             },
             
             "volatility": {
-                "bollinger_upper": round(bb_upper.iloc[-1], 2),
-                "bollinger_middle": round(bb_middle.iloc[-1], 2),
-                "bollinger_lower": round(bb_lower.iloc[-1], 2),
+                "bollinger_upper": round(bb_upper, 2),
+                "bollinger_middle": round(bb_middle, 2),
+                "bollinger_lower": round(bb_lower, 2),
                 "bb_position": f"{bb_position * 100:.1f}%",
                 "atr_14": round(atr, 2),
                 "atr_percent": f"{atr_percent:.2f}%",
@@ -263,10 +220,11 @@ def calculate_technical_indicators(symbol: str, period: str = "6mo") -> str:
             },
             
             "signals": signals,
-            "overall_signal": overall_signal,
+            "overall_signal": overall,
             "signal_strength": f"{max(bullish_signals, bearish_signals)}/{len(signals)}",
         }
         
+        _cache.set(cache_key, result)
         return _safe_json_dumps(result, indent=2)
     
     except Exception as e:
@@ -291,8 +249,13 @@ def get_fundamental_metrics(symbol: str) -> str:
         JSON string with fundamental metrics and investment rating.
     """
     try:
-        ticker = yf.Ticker(_get_nse_symbol(symbol))
-        info = ticker.info
+        info = get_company_profile(_get_nse_symbol(symbol))
+
+        # Results are reused until the profile carries a newer quote
+        cache_key = ("fundamentals", symbol.upper(), info.get("regularMarketTime"))
+        cached = _cache.get(cache_key)
+        if cached is not None:
+            return _safe_json_dumps(cached, indent=2)
         
         # ==========================================
         # Valuation Metrics
@@ -502,6 +465,7 @@ def get_fundamental_metrics(symbol: str) -> str:
             "rating_percentage": f"{rating_pct:.0f}%",
         }
         
+        _cache.set(cache_key, result)
         return _safe_json_dumps(result, indent=2)
     
     except Exception as e:
@@ -525,8 +489,7 @@ def analyze_price_action(symbol: str) -> str:
         JSON string with price action analysis including patterns and levels.
     """
     try:
-        ticker = yf.Ticker(_get_nse_symbol(symbol))
-        df = ticker.history(period="3mo")
+        df = get_ohlcv(_get_nse_symbol(symbol), period="3mo")
         
         if df.empty:
             return json.dumps({
@@ -534,6 +497,12 @@ def analyze_price_action(symbol: str) -> str:
                 "DATA_UNAVAILABLE": True,
                 "message": f"No price data returned for {symbol}. Do NOT guess price levels.",
             })
+
+        # Results are reused until a new (or revised) bar arrives
+        cache_key = ("price_action", symbol.upper(), "3mo", *_latest_bar_key(df))
+        cached = _cache.get(cache_key)
+        if cached is not None:
+            return _safe_json_dumps(cached, indent=2)
         
         close = df['Close']
         high = df['High']
@@ -552,19 +521,11 @@ def analyze_price_action(symbol: str) -> str:
         change_5d = ((current_price - price_5d_ago) / price_5d_ago) * 100
         change_20d = ((current_price - price_20d_ago) / price_20d_ago) * 100
         
-        # Identify swing highs and lows (simplified)
-        swing_highs = []
-        swing_lows = []
-        
-        for i in range(2, len(df) - 2):
-            if high.iloc[i] > high.iloc[i-1] and high.iloc[i] > high.iloc[i-2] and \
-               high.iloc[i] > high.iloc[i+1] and high.iloc[i] > high.iloc[i+2]:
-                swing_highs.append(round(high.iloc[i], 2))
-            
-            if low.iloc[i] < low.iloc[i-1] and low.iloc[i] < low.iloc[i-2] and \
-               low.iloc[i] < low.iloc[i+1] and low.iloc[i] < low.iloc[i+2]:
-                swing_lows.append(round(low.iloc[i], 2))
-        
+        # Identify swing highs and lows
+        left, right = TECHNICAL_CONFIG["swing_left_bars"], TECHNICAL_CONFIG["swing_right_bars"]
+        swing_highs = [round(v, 2) for v in high[find_swing_highs(high, left, right)]]
+        swing_lows = [round(v, 2) for v in low[find_swing_lows(low, left, right)]]
+
         # Distance from key levels
         distance_from_high = ((all_time_high - current_price) / current_price) * 100
         distance_from_low = ((current_price - period_low) / period_low) * 100
@@ -604,6 +565,7 @@ def analyze_price_action(symbol: str) -> str:
             "analysis_date": datetime.now().isoformat(),
         }
         
+        _cache.set(cache_key, result)
         return _safe_json_dumps(result, indent=2)
 
     except Exception as e:
@@ -0,0 +1,147 @@
+"""
+Async Tool Counterparts
+Awaitable versions of the data tools for asyncio callers such as the Telegram
+bot. News scrapers use httpx.AsyncClient natively; yfinance- and NSE-backed
+tools run in a bounded thread pool so a slow symbol never blocks the event loop.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from config import settings
+from tools.analysis import (
+    analyze_price_action,
+    calculate_technical_indicators,
+    get_fundamental_metrics,
+)
+from tools.institutional import (
+    get_bulk_block_deals,
+    get_fii_dii_data,
+    get_mutual_fund_holdings,
+    get_promoter_holdings,
+)
+from tools.market_data import (
+    get_batch_quotes,
+    get_historical_data,
+    get_index_data,
+    get_stock_info,
+    get_stock_price,
+)
+from tools.screener import screen_stocks
+from tools.news_scraper import (
+    get_stock_news_async,
+    scrape_economic_times_news_async,
+    scrape_et_rss_news_async,
+    scrape_google_news_async,
+)
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.tool_worker_threads,
+    thread_name_prefix="tool-worker",
+)
+
+
+async def run_tool_async(tool, *args, **kwargs) -> str:
+    """Run a CrewAI tool's blocking `.run` in the tool thread pool and await it."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(tool.run, *args, **kwargs))
+
+
+# ==========================================
+# Market data
+# ==========================================
+
+async def get_stock_price_async(symbol: str) -> str:
+    """Async `get_stock_price`."""
+    return await run_tool_async(get_stock_price, symbol)
+
+
+async def get_stock_info_async(symbol: str) -> str:
+    """Async `get_stock_info`."""
+    return await run_tool_async(get_stock_info, symbol)
+
+
+async def get_historical_data_async(symbol: str, period: str = "1y") -> str:
+    """Async `get_historical_data`."""
+    return await run_tool_async(get_historical_data, symbol, period)
+
+
+async def get_index_data_async(index_name: str = "NIFTY50") -> str:
+    """Async `get_index_data`."""
+    return await run_tool_async(get_index_data, index_name)
+
+
+async def get_batch_quotes_async(symbols: str = "NIFTY50") -> str:
+    """Async `get_batch_quotes`."""
+    return await run_tool_async(get_batch_quotes, symbols)
+
+
+# ==========================================
+# Analysis
+# ==========================================
+
+async def calculate_technical_indicators_async(symbol: str, period: str = "6mo") -> str:
+    """Async `calculate_technical_indicators`."""
+    return await run_tool_async(calculate_technical_indicators, symbol, period)
+
+
+async def get_fundamental_metrics_async(symbol: str) -> str:
+    """Async `get_fundamental_metrics`."""
+    return await run_tool_async(get_fundamental_metrics, symbol)
+
+
+async def analyze_price_action_async(symbol: str) -> str:
+    """Async `analyze_price_action`."""
+    return await run_tool_async(analyze_price_action, symbol)
+
+
+async def screen_stocks_async(universe: str = "NIFTY50", criteria: str = "", limit: int = 10) -> str:
+    """Async `screen_stocks`."""
+    return await run_tool_async(screen_stocks, universe, criteria, limit)
+
+
+# ==========================================
+# Institutional
+# ==========================================
+
+async def get_fii_dii_data_async() -> str:
+    """Async `get_fii_dii_data`."""
+    return await run_tool_async(get_fii_dii_data)
+
+
+async def get_bulk_block_deals_async(symbol: str = None) -> str:
+    """Async `get_bulk_block_deals`."""
+    return await run_tool_async(get_bulk_block_deals, symbol)
+
+
+async def get_promoter_holdings_async(symbol: str) -> str:
+    """Async `get_promoter_holdings`."""
+    return await run_tool_async(get_promoter_holdings, symbol)
+
+
+async def get_mutual_fund_holdings_async(symbol: str) -> str:
+    """Async `get_mutual_fund_holdings`."""
+    return await run_tool_async(get_mutual_fund_holdings, symbol)
+
+
+__all__ = [
+    "run_tool_async",
+    "get_stock_price_async",
+    "get_stock_info_async",
+    "get_historical_data_async",
+    "get_index_data_async",
+    "get_batch_quotes_async",
+    "calculate_technical_indicators_async",
+    "get_fundamental_metrics_async",
+    "analyze_price_action_async",
+    "screen_stocks_async",
+    "get_fii_dii_data_async",
+    "get_bulk_block_deals_async",
+    "get_promoter_holdings_async",
+    "get_mutual_fund_holdings_async",
+    "scrape_et_rss_news_async",
+    "scrape_economic_times_news_async",
+    "scrape_google_news_async",
+    "get_stock_news_async",
+]
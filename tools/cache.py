@@ -0,0 +1,242 @@
+"""
+Unified Tool Cache
+Thread-safe LRU caches with per-entry TTL, one per namespace. TTLs and size
+limits come from Settings, so deployments can trade memory for freshness
+without patching module globals.
+
+Concurrent misses for the same key are coalesced: one caller loads the value
+while the others wait for it, so a burst of requests for one symbol makes a
+single upstream call.
+
+`refreshing` lets a caller such as the cache pre-warm reload entries that are
+still fresh, renewing their timestamps, while other callers keep being served
+from the existing entries.
+"""
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Callable, Hashable, Optional
+
+from config import settings
+
+
+# Per-context refresh: namespace -> timestamp before which entries count as expired
+_refresh_since: ContextVar[dict[str, float]] = ContextVar("cache_refresh_since", default={})
+
+
+@contextmanager
+def refreshing(*namespaces: str):
+    """Treat entries of `namespaces` stored before entering as expired, in this context.
+
+    Lookups made here (or in threads run with a copy of this context) miss and
+    reload, storing the values with a new timestamp; once a key has been
+    reloaded, later lookups in the context hit it. Other callers are unaffected.
+    """
+    now = datetime.now().timestamp()
+    token = _refresh_since.set({**_refresh_since.get(), **{ns: now for ns in namespaces}})
+    try:
+        yield
+    finally:
+        _refresh_since.reset(token)
+
+
+class _Flight:
+    """A load in progress that other callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after `ttl` seconds.
+
+    Expired entries are not returned by `get` but stay in place until they are
+    overwritten or evicted, so callers that can refresh incrementally may still
+    read them with `get_stale`.
+    """
+
+    def __init__(self, namespace: str, ttl: float, max_size: int):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._data: OrderedDict = OrderedDict()
+        self._inflight: dict[Hashable, _Flight] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.coalesced = 0
+
+    def _fresh(self, key: Hashable, max_age: Optional[float] = None) -> Optional[Any]:
+        """Fresh value or None, without touching counters. Caller holds the lock."""
+        entry = self._data.get(key)
+        ttl = self.ttl if max_age is None else min(self.ttl, max_age)
+        if entry is None or (datetime.now().timestamp() - entry["timestamp"]) >= ttl:
+            return None
+        since = _refresh_since.get().get(self.namespace)
+        if since is not None and entry["timestamp"] < since:
+            return None
+        self._data.move_to_end(key)
+        return entry["data"]
+
+    def get(self, key: Hashable, max_age: Optional[float] = None) -> Optional[Any]:
+        """Return the cached value if present and fresh, else None.
+
+        `max_age` (seconds) tightens the TTL for this lookup only.
+        """
+        with self._lock:
+            value = self._fresh(key, max_age)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def peek(self, key: Hashable, max_age: Optional[float] = None) -> Optional[Any]:
+        """Like `get`, but not counted in stats. Used to re-check after a wait."""
+        with self._lock:
+            return self._fresh(key, max_age)
+
+    def get_stale(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value regardless of age, else None. Not counted in stats."""
+        with self._lock:
+            entry = self._data.get(key)
+            return entry["data"] if entry is not None else None
+
+    def set(self, key: Hashable, data: Any) -> None:
+        """Store a value, evicting least recently used entries over `max_size`."""
+        with self._lock:
+            self._data[key] = {"data": data, "timestamp": datetime.now().timestamp()}
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def single_flight(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run `fn` once for all concurrent callers using the same key.
+
+        The first caller runs `fn`; callers arriving while it is in progress
+        wait and receive the same result, or the same exception. Nothing is
+        cached here; once the call finishes the next caller runs `fn` again.
+        """
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        should_cache: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """Return the fresh cached value, or load it once for all concurrent callers.
+
+        The loaded value is stored unless `should_cache` rejects it (e.g. error
+        results), but waiting callers receive it either way. Loader exceptions
+        propagate to every waiting caller and nothing is stored.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        def load():
+            # A previous flight may have stored the value after our miss
+            value = self.peek(key)
+            if value is not None:
+                return value
+            value = loader()
+            if value is not None and (should_cache is None or should_cache(value)):
+                self.set(key, value)
+            return value
+
+        return self.single_flight(key, load)
+
+    def delete(self, key: Hashable) -> None:
+        """Remove a key if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = self.coalesced = 0
+
+    def stats(self) -> dict:
+        """Snapshot of size, limits and hit/miss/eviction counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "coalesced": self.coalesced,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+_registry_lock = threading.Lock()
+_registry: dict[str, TTLCache] = {}
+
+
+def get_cache(namespace: str) -> TTLCache:
+    """Get (or create) the shared cache for a namespace, sized from Settings."""
+    with _registry_lock:
+        cache = _registry.get(namespace)
+        if cache is None:
+            ttl_minutes, max_size = settings.cache_settings(namespace)
+            cache = TTLCache(namespace, ttl_minutes * 60, max_size)
+            _registry[namespace] = cache
+        return cache
+
+
+def cache_stats() -> dict[str, dict]:
+    """Stats for every namespace created so far."""
+    with _registry_lock:
+        caches = list(_registry.values())
+    return {cache.namespace: cache.stats() for cache in caches}
+
+
+def clear_all_caches() -> None:
+    """Empty every namespace."""
+    with _registry_lock:
+        caches = list(_registry.values())
+    for cache in caches:
+        cache.clear()
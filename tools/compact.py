@@ -0,0 +1,117 @@
+"""
+Compact Tool Output
+Agent-facing serialization of tool results: no indentation, no empty fields,
+abbreviated keys and consistently rounded numbers, so every tool observation
+costs the LLM fewer prompt tokens. Tools themselves keep returning pretty
+JSON for the dashboard, bot and CLI.
+"""
+
+import json
+import math
+from typing import Any
+
+from crewai.tools import BaseTool
+
+from config import settings
+
+# Key words shortened in compact output (applied per snake_case word)
+KEY_ABBREVIATIONS = {
+    "average": "avg",
+    "averages": "avgs",
+    "change": "chg",
+    "current": "cur",
+    "description": "desc",
+    "exchange": "exch",
+    "information": "info",
+    "institutional": "inst",
+    "interpretation": "interp",
+    "market": "mkt",
+    "moving": "mov",
+    "percent": "pct",
+    "percentage": "pct",
+    "previous": "prev",
+    "quantity": "qty",
+    "recommendation": "rec",
+    "resistance": "res",
+    "support": "sup",
+    "timestamp": "ts",
+    "volume": "vol",
+}
+
+# Values that only say "no data"; the key is dropped instead
+_EMPTY_VALUES = (None, "N/A", "")
+
+
+def _short_key(key: str) -> str:
+    return "_".join(KEY_ABBREVIATIONS.get(word, word) for word in key.split("_"))
+
+
+def _round_number(value: float) -> Any:
+    """Whole floats become ints; others keep 2 decimals, or 3 significant digits below 1."""
+    if value.is_integer():
+        return int(value)
+    if abs(value) >= 1:
+        return round(value, 2)
+    return float(f"{value:.3g}")
+
+
+def _is_empty(value: Any) -> bool:
+    if isinstance(value, float):
+        return math.isnan(value)
+    return isinstance(value, (str, type(None))) and value in _EMPTY_VALUES
+
+
+def compact_data(data: Any) -> Any:
+    """Compact a decoded tool result (see module docstring).
+
+    Dict keys that would collide once shortened keep their original name.
+    Empty lists and dicts are kept, since "no signals" is information.
+    """
+    if isinstance(data, dict):
+        out = {}
+        for key, value in data.items():
+            if _is_empty(value):
+                continue
+            short = _short_key(key) if isinstance(key, str) else key
+            if short in out or (short != key and short in data):
+                short = key
+            out[short] = compact_data(value)
+        return out
+    if isinstance(data, list):
+        return [compact_data(item) for item in data if not _is_empty(item)]
+    if isinstance(data, float) and math.isfinite(data):
+        return _round_number(data)
+    return data
+
+
+def compact_output(output: str) -> str:
+    """Re-serialize a JSON tool output compactly; other text is returned as is."""
+    try:
+        data = json.loads(output)
+    except (TypeError, ValueError):
+        return output
+    return json.dumps(compact_data(data), separators=(",", ":"), ensure_ascii=False)
+
+
+def agent_output(output: str) -> str:
+    """Tool output as it should reach an agent (compact unless COMPACT_TOOL_OUTPUT is off)."""
+    return compact_output(output) if settings.compact_tool_output else output
+
+
+def agent_tool(tool: BaseTool) -> BaseTool:
+    """Copy of a tool whose results reach the agent through `agent_output`.
+
+    The name, description and argument schema are unchanged; the original
+    tool keeps returning pretty JSON to other callers.
+    """
+    func = tool.func
+
+    def run(*args, **kwargs):
+        return agent_output(func(*args, **kwargs))
+
+    return tool.model_copy(update={"func": run})
+
+
+def agent_tools(*tools: BaseTool) -> list[BaseTool]:
+    """`agent_tool` for each tool, for an Agent's `tools` list."""
+    return [agent_tool(tool) for tool in tools]
@@ -0,0 +1,34 @@
+"""
+Shared Company Profile
+Fetches Yahoo Finance `ticker.info` once per symbol and shares it between the
+price, info, fundamentals and peer-comparison tools.
+"""
+
+import yfinance as yf
+
+from tools.cache import get_cache
+
+# Raw info dicts, keyed by Yahoo Finance symbol (TTL/size from Settings)
+_profiles = get_cache("profile")
+
+
+def get_company_profile(yahoo_symbol: str) -> dict:
+    """Get the raw `ticker.info` dict for a Yahoo Finance symbol.
+
+    Served from memory while fresh; otherwise fetched and stored, with
+    concurrent callers for the same symbol sharing one request. Empty
+    responses are not stored so a transient failure is retried on the next
+    call. Download errors propagate to the caller. Returns a shallow copy so
+    callers cannot modify the shared entry.
+    """
+    info = _profiles.get_or_load(
+        yahoo_symbol,
+        lambda: yf.Ticker(yahoo_symbol).info or {},
+        should_cache=bool,
+    )
+    return dict(info)
+
+
+def clear_company_profiles() -> None:
+    """Drop all stored profiles."""
+    _profiles.clear()
@@ -0,0 +1,592 @@
+"""
+Vectorized Indicator Engine
+Computes the technical indicators of `calculate_technical_indicators` for many
+symbols at once from dates x symbols price matrices, with NumPy operations
+across all columns instead of one pandas pass per symbol. `IndicatorState`
+keeps the same indicators for one symbol up to date bar by bar.
+"""
+
+from collections import deque
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from tools.cache import get_cache
+from tools.market_data import _get_nse_symbol
+from tools.price_store import get_ohlcv_batch
+
+# Streaming states, keyed by (symbol, period)
+_states = get_cache("indicator_state")
+
+FIELDS = ("Close", "High", "Low", "Volume")
+
+# Columns of the table returned by compute_indicators
+INDICATOR_COLUMNS = [
+    "bars", "price", "prev_close", "prev_high", "prev_low",
+    "sma_20", "sma_50", "sma_200", "ema_12", "ema_26",
+    "rsi_14", "macd", "macd_signal", "macd_prev", "macd_signal_prev",
+    "bb_upper", "bb_middle", "bb_lower", "atr_14",
+    "volume", "avg_volume_20", "volume_ratio",
+    "roc_10", "roc_20", "recent_high", "recent_low",
+]
+
+
+# Trading-signal rules shared by calculate_technical_indicators and the
+# screener, in report order: name -> (indicator, signal, strength)
+SIGNAL_RULES = {
+    "rsi_oversold": ("RSI", "OVERSOLD - Potential Buy", "Strong"),
+    "rsi_overbought": ("RSI", "OVERBOUGHT - Potential Sell", "Strong"),
+    "rsi_near_oversold": ("RSI", "Approaching Oversold", "Moderate"),
+    "rsi_near_overbought": ("RSI", "Approaching Overbought", "Moderate"),
+    "macd_bullish_cross": ("MACD", "Bullish Crossover - Buy", "Strong"),
+    "macd_bearish_cross": ("MACD", "Bearish Crossover - Sell", "Strong"),
+    "bb_lower_touch": ("Bollinger Bands", "At Lower Band - Potential Reversal", "Moderate"),
+    "bb_upper_touch": ("Bollinger Bands", "At Upper Band - Potential Pullback", "Moderate"),
+    "volume_spike": ("Volume", "Unusually High Volume - Confirm Trend", "Strong"),
+    "ma_uptrend": ("Moving Averages", "Strong Uptrend", "Moderate"),
+    "ma_downtrend": ("Moving Averages", "Strong Downtrend", "Moderate"),
+}
+
+
+def price_matrices(frames: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:
+    """Turn per-symbol OHLCV frames into one dates x symbols matrix per field.
+
+    Dates are the union across symbols; a symbol without a bar on a date
+    holds NaN there.
+    """
+    frames = {sym: df for sym, df in frames.items() if not df.empty}
+    return {
+        field: pd.DataFrame({sym: df[field] for sym, df in frames.items()})
+        for field in FIELDS
+    }
+
+
+def _right_align(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """Move each column's valid rows to the bottom, keeping their order.
+
+    Symbols with different listing dates or missing sessions then share the
+    same "last N bars" rows, and every rolling window reads the last rows.
+    """
+    order = np.argsort(valid, axis=0, kind="stable")
+    aligned = np.take_along_axis(values, order, axis=0)
+    aligned[~np.take_along_axis(valid, order, axis=0)] = np.nan
+    return aligned
+
+
+def _rolling_last(values: np.ndarray, window: int, reducer) -> np.ndarray:
+    """Reduce the trailing `window` rows of every column; NaN where the history is too short."""
+    if len(values) < window:
+        return np.full(values.shape[1], np.nan)
+    return reducer(values[-window:])
+
+
+def _mean(rows: np.ndarray) -> np.ndarray:
+    return rows.mean(axis=0)
+
+
+def _std(rows: np.ndarray) -> np.ndarray:
+    return rows.std(axis=0, ddof=1)
+
+
+def _ema(values: np.ndarray, span: int) -> np.ndarray:
+    """Exponential moving average down every column (pandas `ewm(span, adjust=False)`).
+
+    Each column starts at its first valid value.
+    """
+    alpha = 2.0 / (span + 1.0)
+    out = np.empty_like(values)
+    prev = np.full(values.shape[1], np.nan)
+    for t in range(len(values)):
+        x = values[t]
+        prev = np.where(np.isnan(prev), x, alpha * x + (1 - alpha) * prev)
+        out[t] = prev
+    return out
+
+
+def _shifted(values: np.ndarray, n: int) -> np.ndarray:
+    """Value `n` bars before the last in every column."""
+    if len(values) <= n:
+        return np.full(values.shape[1], np.nan)
+    return values[-1 - n]
+
+
+def compute_indicators(
+    close: pd.DataFrame,
+    high: pd.DataFrame,
+    low: pd.DataFrame,
+    volume: pd.DataFrame,
+) -> pd.DataFrame:
+    """Compute the latest technical indicators for every symbol column.
+
+    Args:
+        close, high, low, volume: dates x symbols matrices with matching
+            columns (see `price_matrices`).
+
+    Returns:
+        DataFrame indexed by symbol with INDICATOR_COLUMNS. Indicators that
+        need more history than a symbol has are NaN.
+    """
+    symbols = list(close.columns)
+    high, low, volume = (m.reindex(index=close.index, columns=symbols) for m in (high, low, volume))
+
+    valid = close.notna().to_numpy()
+    c, h, low, v = (
+        _right_align(m.to_numpy(dtype=float), valid) for m in (close, high, low, volume)
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        price = _shifted(c, 0)
+
+        # Moving averages
+        sma_20 = _rolling_last(c, 20, _mean)
+        sma_50 = _rolling_last(c, 50, _mean)
+        sma_200 = _rolling_last(c, 200, _mean)
+        ema_12_series = _ema(c, 12)
+        ema_26_series = _ema(c, 26)
+
+        # RSI (simple 14-bar average of gains and losses)
+        delta = np.diff(c, axis=0, prepend=np.nan)
+        gains = np.where(delta > 0, delta, 0.0)
+        losses = np.where(delta < 0, -delta, 0.0)
+        gains[np.isnan(delta)] = np.nan
+        losses[np.isnan(delta)] = np.nan
+        gain = _rolling_last(gains, 14, _mean)
+        loss = _rolling_last(losses, 14, _mean)
+        rsi = 100 - (100 / (1 + gain / loss))
+
+        # MACD
+        macd_series = ema_12_series - ema_26_series
+        signal_series = _ema(macd_series, 9)
+
+        # Bollinger Bands
+        bb_std = _rolling_last(c, 20, _std)
+        bb_upper = sma_20 + 2 * bb_std
+        bb_lower = sma_20 - 2 * bb_std
+
+        # ATR
+        prev_c = np.vstack([np.full((1, c.shape[1]), np.nan), c[:-1]])
+        tr = np.fmax(np.fmax(h - low, np.abs(h - prev_c)), np.abs(low - prev_c))
+        atr = _rolling_last(tr, 14, _mean)
+
+        # Volume
+        avg_volume_20 = _rolling_last(v, 20, _mean)
+        current_volume = _shifted(v, 0)
+
+        # Momentum
+        close_10 = _shifted(c, 10)
+        close_20 = _shifted(c, 20)
+
+        # 20-day context levels (up to the last 20 bars, ignoring gaps)
+        recent_high = np.fmax.reduce(h[-20:], axis=0, initial=np.nan)
+        recent_low = np.fmin.reduce(low[-20:], axis=0, initial=np.nan)
+
+        table = pd.DataFrame({
+            "bars": valid.sum(axis=0),
+            "price": price,
+            "prev_close": _shifted(c, 1),
+            "prev_high": _shifted(h, 1),
+            "prev_low": _shifted(low, 1),
+            "sma_20": sma_20,
+            "sma_50": sma_50,
+            "sma_200": sma_200,
+            "ema_12": _shifted(ema_12_series, 0),
+            "ema_26": _shifted(ema_26_series, 0),
+            "rsi_14": rsi,
+            "macd": _shifted(macd_series, 0),
+            "macd_signal": _shifted(signal_series, 0),
+            "macd_prev": _shifted(macd_series, 1),
+            "macd_signal_prev": _shifted(signal_series, 1),
+            "bb_upper": bb_upper,
+            "bb_middle": sma_20,
+            "bb_lower": bb_lower,
+            "atr_14": atr,
+            "volume": current_volume,
+            "avg_volume_20": avg_volume_20,
+            "volume_ratio": current_volume / avg_volume_20,
+            "roc_10": (price - close_10) / close_10 * 100,
+            "roc_20": (price - close_20) / close_20 * 100,
+            "recent_high": recent_high,
+            "recent_low": recent_low,
+        }, index=pd.Index(symbols, name="symbol"))
+
+    return table[INDICATOR_COLUMNS]
+
+
+def get_indicator_table(symbols: list[str], period: str = "6mo") -> pd.DataFrame:
+    """Indicator table for NSE symbols from one batched price download.
+
+    Symbols may carry the .NS suffix or not. Symbols without price data are
+    left out. The index holds the plain symbols (without the .NS suffix).
+    """
+    yahoo_symbols = {nse: nse.removesuffix(".NS") for nse in map(_get_nse_symbol, symbols)}
+    frames = get_ohlcv_batch(list(yahoo_symbols), period=period)
+    matrices = price_matrices({yahoo_symbols[sym]: df for sym, df in frames.items()})
+    if matrices["Close"].empty:
+        return pd.DataFrame(columns=INDICATOR_COLUMNS, index=pd.Index([], name="symbol"))
+    return compute_indicators(*(matrices[field] for field in FIELDS))
+
+
+def signal_flags(table: pd.DataFrame) -> pd.DataFrame:
+    """Evaluate every SIGNAL_RULES rule for every symbol of an indicator table.
+
+    Returns a boolean DataFrame (symbols x rule names). Rules on the same
+    indicator are mutually exclusive, checked in SIGNAL_RULES order.
+    """
+    rsi = table["rsi_14"]
+    price = table["price"]
+    macd, signal = table["macd"], table["macd_signal"]
+    macd_prev, signal_prev = table["macd_prev"], table["macd_signal_prev"]
+
+    bb_lower_touch = price <= table["bb_lower"]
+    flags = {
+        "rsi_oversold": rsi < 30,
+        "rsi_overbought": rsi > 70,
+        "rsi_near_oversold": (rsi >= 30) & (rsi < 40),
+        "rsi_near_overbought": (rsi > 60) & (rsi <= 70),
+        "macd_bullish_cross": (macd > signal) & (macd_prev <= signal_prev),
+        "macd_bearish_cross": (macd < signal) & (macd_prev >= signal_prev),
+        "bb_lower_touch": bb_lower_touch,
+        "bb_upper_touch": (price >= table["bb_upper"]) & ~bb_lower_touch,
+        "volume_spike": table["volume_ratio"] > 2,
+        "ma_uptrend": (price > table["sma_20"]) & (table["sma_20"] > table["sma_50"]),
+        "ma_downtrend": (price < table["sma_20"]) & (table["sma_20"] < table["sma_50"]),
+    }
+    return pd.DataFrame(flags, index=table.index)[list(SIGNAL_RULES)]
+
+
+def signals_from_flags(flags: pd.Series) -> list[dict]:
+    """Signal dicts for the rules set in one symbol's row of `signal_flags`."""
+    return [
+        {"indicator": indicator, "signal": signal, "strength": strength}
+        for rule, (indicator, signal, strength) in SIGNAL_RULES.items()
+        if flags[rule]
+    ]
+
+
+def overall_signal(signals: list[dict]) -> tuple[str, int, int]:
+    """Overall BULLISH/BEARISH/NEUTRAL call with the bullish and bearish signal counts."""
+    bullish = sum(1 for s in signals if "Buy" in s["signal"] or "Bullish" in s["signal"] or "Uptrend" in s["signal"])
+    bearish = sum(1 for s in signals if "Sell" in s["signal"] or "Bearish" in s["signal"] or "Downtrend" in s["signal"])
+
+    if bullish > bearish + 1:
+        overall = "BULLISH"
+    elif bearish > bullish + 1:
+        overall = "BEARISH"
+    else:
+        overall = "NEUTRAL"
+    return overall, bullish, bearish
+
+
+# ==========================================
+# Swing points
+# ==========================================
+
+def _shift_rows(values: np.ndarray, n: int) -> np.ndarray:
+    """Rows moved down by `n` (up when negative), padding with NaN."""
+    out = np.full_like(values, np.nan)
+    if n > 0:
+        out[n:] = values[:-n]
+    elif n < 0:
+        out[:n] = values[-n:]
+    else:
+        out[:] = values
+    return out
+
+
+def _swing_mask(values, left: int, right: int, sign: float):
+    """Mask of rows strictly above (sign=1) or below (sign=-1) every neighbour
+    within `left` bars before and `right` bars after."""
+    frame = values.to_frame() if isinstance(values, pd.Series) else values
+    raw = frame.to_numpy(dtype=float)
+    valid = ~np.isnan(raw)
+
+    # Compare each symbol against its own bars, skipping dates it has no data for
+    order = np.argsort(valid, axis=0, kind="stable")
+    aligned = _right_align(raw, valid) * sign
+
+    mask = np.ones_like(aligned, dtype=bool)
+    with np.errstate(invalid="ignore"):
+        for n in [*range(1, left + 1), *range(-1, -right - 1, -1)]:
+            mask &= aligned > _shift_rows(aligned, n)
+
+    out = np.zeros_like(mask)
+    np.put_along_axis(out, order, mask, axis=0)
+    result = pd.DataFrame(out, index=frame.index, columns=frame.columns)
+    return result.iloc[:, 0].rename(values.name) if isinstance(values, pd.Series) else result
+
+
+def swing_highs(high, left: int = 2, right: int = 2):
+    """Swing highs: bars whose high exceeds the `left` bars before and the
+    `right` bars after.
+
+    Args:
+        high: Highs of one symbol (Series) or a dates x symbols matrix.
+        left, right: Bars compared on each side; the first `left` and last
+            `right` bars of each symbol can never be swings.
+
+    Returns:
+        Boolean mask shaped like `high`.
+    """
+    return _swing_mask(high, left, right, 1.0)
+
+
+def swing_lows(low, left: int = 2, right: int = 2):
+    """Swing lows: bars whose low is below the `left` bars before and the
+    `right` bars after. See `swing_highs`."""
+    return _swing_mask(low, left, right, -1.0)
+
+
+# ==========================================
+# Streaming (per-bar) indicators
+# ==========================================
+
+class RollingWindow:
+    """The last `size` values with running sums, updated in O(1) per value."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._values: deque[float] = deque(maxlen=size)
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._pushes = 0
+
+    def push(self, value: float) -> None:
+        """Add a value, dropping the oldest once the window is full."""
+        if len(self._values) == self.size:
+            old = self._values[0]
+            self._sum -= old
+            self._sum_sq -= old * old
+        self._values.append(value)
+        self._sum += value
+        self._sum_sq += value * value
+        self._pushes += 1
+        if self._pushes % self.size == 0:
+            # Re-add from the buffer once per cycle so rounding never accumulates
+            self._sum = float(sum(self._values))
+            self._sum_sq = float(sum(v * v for v in self._values))
+
+    def replace_last(self, value: float) -> None:
+        """Replace the newest value (a bar revised within its session)."""
+        old = self._values[-1]
+        self._values[-1] = value
+        self._sum += value - old
+        self._sum_sq += value * value - old * old
+
+    @property
+    def full(self) -> bool:
+        return len(self._values) == self.size
+
+    def mean(self) -> float:
+        """Mean of a full window (NaN until then)."""
+        return self._sum / self.size if self.full else np.nan
+
+    def std(self) -> float:
+        """Sample standard deviation of a full window (NaN until then)."""
+        if not self.full:
+            return np.nan
+        variance = (self._sum_sq - self._sum * self._sum / self.size) / (self.size - 1)
+        return float(np.sqrt(max(variance, 0.0)))
+
+    def max(self) -> float:
+        """Largest value held, even before the window is full."""
+        return max(self._values) if self._values else np.nan
+
+    def min(self) -> float:
+        """Smallest value held, even before the window is full."""
+        return min(self._values) if self._values else np.nan
+
+    def back(self, n: int) -> float:
+        """Value `n` pushes before the newest (NaN if not held)."""
+        return self._values[-1 - n] if len(self._values) > n else np.nan
+
+
+def _ema_step(prev: float, value: float, span: int) -> float:
+    """One `ewm(span, adjust=False)` step, starting at the first value."""
+    if np.isnan(prev):
+        return value
+    alpha = 2.0 / (span + 1.0)
+    return alpha * value + (1 - alpha) * prev
+
+
+class IndicatorState:
+    """Indicators for one symbol, updated in constant time per bar.
+
+    Produces the same values as `compute_indicators` over the bars it has
+    seen: running EMAs for MACD, and ring buffers with running sums for the
+    SMAs, Bollinger Bands, RSI averages, ATR, volume and 20-day range.
+    Sending a bar with the same timestamp as the last one replaces that bar,
+    so a session can be refreshed intraday.
+    """
+
+    def __init__(self):
+        self.bars = 0
+        self.first_timestamp: Optional[pd.Timestamp] = None
+        self.last_timestamp: Optional[pd.Timestamp] = None
+        self.prev_timestamp: Optional[pd.Timestamp] = None
+        self.prev_close = self.prev_high = self.prev_low = np.nan
+
+        self._closes = RollingWindow(200)
+        self._highs = RollingWindow(20)
+        self._lows = RollingWindow(20)
+        self._volumes = RollingWindow(20)
+        self._gains = RollingWindow(14)
+        self._losses = RollingWindow(14)
+        self._true_ranges = RollingWindow(14)
+        self._sma_20 = RollingWindow(20)
+        self._sma_50 = RollingWindow(50)
+
+        # Running EMAs: values after the last bar and before it (for revisions)
+        self._ema = {"ema_12": np.nan, "ema_26": np.nan, "signal": np.nan}
+        self._ema_before = dict(self._ema)
+        self._macd_prev = self._signal_prev = np.nan
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "IndicatorState":
+        """Seed a state by streaming every bar of an OHLCV frame."""
+        state = cls()
+        state.update_frame(df)
+        return state
+
+    def update_frame(self, df: pd.DataFrame) -> None:
+        """Stream the bars of `df` from the state's last bar onward."""
+        if self.last_timestamp is not None:
+            df = df[df.index >= self.last_timestamp]
+        for timestamp, high, low, close, volume in zip(
+            df.index, df["High"].to_numpy(float), df["Low"].to_numpy(float),
+            df["Close"].to_numpy(float), df["Volume"].to_numpy(float),
+        ):
+            self.update(timestamp, high, low, close, volume)
+
+    def update(self, timestamp: pd.Timestamp, high: float, low: float, close: float, volume: float) -> None:
+        """Add a bar, or replace the last one if `timestamp` matches it.
+
+        Raises:
+            ValueError: If the bar is older than the last one.
+        """
+        revise = timestamp == self.last_timestamp
+        if self.last_timestamp is not None and timestamp < self.last_timestamp:
+            raise ValueError(f"Bar at {timestamp} is older than the last bar at {self.last_timestamp}")
+
+        if revise:
+            self._ema = dict(self._ema_before)
+        else:
+            if self.last_timestamp is not None:
+                self.prev_timestamp = self.last_timestamp
+                self.prev_close = self._closes.back(0)
+                self.prev_high = self._highs.back(0)
+                self.prev_low = self._lows.back(0)
+                self._macd_prev = self._ema["ema_12"] - self._ema["ema_26"]
+                self._signal_prev = self._ema["signal"]
+            self._ema_before = dict(self._ema)
+            if self.first_timestamp is None:
+                self.first_timestamp = timestamp
+            self.last_timestamp = timestamp
+            self.bars += 1
+
+        has_prev = not np.isnan(self.prev_close)
+        delta = close - self.prev_close
+        true_range = high - low
+        if has_prev:
+            true_range = max(true_range, abs(high - self.prev_close), abs(low - self.prev_close))
+
+        windows = [
+            (self._closes, close), (self._sma_20, close), (self._sma_50, close),
+            (self._highs, high), (self._lows, low), (self._volumes, volume),
+            (self._true_ranges, true_range),
+        ]
+        if has_prev:
+            windows += [(self._gains, max(delta, 0.0)), (self._losses, max(-delta, 0.0))]
+        for window, value in windows:
+            if revise:
+                window.replace_last(value)
+            else:
+                window.push(value)
+
+        self._ema["ema_12"] = _ema_step(self._ema["ema_12"], close, 12)
+        self._ema["ema_26"] = _ema_step(self._ema["ema_26"], close, 26)
+        macd = self._ema["ema_12"] - self._ema["ema_26"]
+        self._ema["signal"] = _ema_step(self._ema["signal"], macd, 9)
+
+    def snapshot(self) -> pd.Series:
+        """Current indicators as one row of `compute_indicators` (INDICATOR_COLUMNS)."""
+        price = self._closes.back(0)
+        sma_20 = self._sma_20.mean()
+        bb_std = self._sma_20.std()
+        avg_volume_20 = self._volumes.mean()
+        current_volume = self._volumes.back(0)
+        close_10 = self._closes.back(10)
+        close_20 = self._closes.back(20)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            gain, loss = np.float64(self._gains.mean()), np.float64(self._losses.mean())
+            row = {
+                "bars": self.bars,
+                "price": price,
+                "prev_close": self.prev_close,
+                "prev_high": self.prev_high,
+                "prev_low": self.prev_low,
+                "sma_20": sma_20,
+                "sma_50": self._sma_50.mean(),
+                "sma_200": self._closes.mean(),
+                "ema_12": self._ema["ema_12"],
+                "ema_26": self._ema["ema_26"],
+                "rsi_14": 100 - (100 / (1 + gain / loss)),
+                "macd": self._ema["ema_12"] - self._ema["ema_26"],
+                "macd_signal": self._ema["signal"],
+                "macd_prev": self._macd_prev,
+                "macd_signal_prev": self._signal_prev,
+                "bb_upper": sma_20 + 2 * bb_std,
+                "bb_middle": sma_20,
+                "bb_lower": sma_20 - 2 * bb_std,
+                "atr_14": self._true_ranges.mean(),
+                "volume": current_volume,
+                "avg_volume_20": avg_volume_20,
+                "volume_ratio": np.float64(current_volume) / avg_volume_20,
+                "roc_10": (price - close_10) / close_10 * 100,
+                "roc_20": (price - close_20) / close_20 * 100,
+                "recent_high": self._highs.max(),
+                "recent_low": self._lows.min(),
+            }
+        return pd.Series(row, index=INDICATOR_COLUMNS, dtype=float)
+
+    def follows(self, df: pd.DataFrame) -> bool:
+        """Whether `df` continues the bars this state has seen.
+
+        `df` must start at the state's first bar, so the windows and EMAs
+        cover the same bars as `compute_indicators` over `df`. The last bar
+        may have been revised, but the one before it (and so the history
+        behind the running values) must still be there unchanged; split or
+        dividend adjustments rewrite it.
+        """
+        if self.last_timestamp is None or self.last_timestamp not in df.index:
+            return False
+        if df.index[0] != self.first_timestamp:
+            return False
+        if self.prev_timestamp is None:
+            return True
+        if self.prev_timestamp not in df.index:
+            return False
+        return bool(np.isclose(df.at[self.prev_timestamp, "Close"], self.prev_close))
+
+
+def latest_indicators(key, df: pd.DataFrame) -> pd.Series:
+    """Indicators for the last bar of `df`, updated incrementally.
+
+    A state is kept per `key` (e.g. symbol and period). Calls whose history
+    continues the state's bars only stream the new (or revised last) bars
+    into it; otherwise, including when the window start has moved, the state
+    is seeded from the whole frame. The result always matches
+    `compute_indicators` over `df`, whatever earlier calls streamed.
+    """
+    def advance() -> pd.Series:
+        state = _states.get(key)
+        if state is not None and state.follows(df):
+            state.update_frame(df)
+        else:
+            state = IndicatorState.from_frame(df)
+            _states.set(key, state)
+        return state.snapshot()
+
+    # Concurrent callers for a key share one update instead of interleaving bars
+    return _states.single_flight(key, advance)
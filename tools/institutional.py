@@ -5,32 +5,99 @@ Track FII/DII flows, bulk/block deals, and institutional holdings
 
 import json
 import re
+import threading
+import time
 from datetime import datetime, timedelta
 import httpx
 from bs4 import BeautifulSoup
 from crewai.tools import tool
 
+from config import settings
+from tools.cache import get_cache
+
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
 }
 
+# Shared institutional-data cache (TTL/size from Settings)
+_cache = get_cache("institutional")
+
+
+NSE_HOMEPAGE = "https://www.nseindia.com"
 
-def _get_nse_session() -> httpx.Client:
-    """Create an httpx client with NSE session cookies.
+NSE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Referer": "https://www.nseindia.com/reports/fii-dii",
+}
+
+
+class NSESession:
+    """Long-lived httpx client holding NSE session cookies.
 
     NSE requires a valid session cookie obtained by first visiting the homepage.
+    The homepage is visited once, and again only when the cookies are older
+    than the configured TTL, one of them has expired, or an API call is
+    rejected with 401/403. Connections are pooled across calls, and one
+    session is safe to share between threads.
     """
-    nse_headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "application/json, text/plain, */*",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Referer": "https://www.nseindia.com/reports/fii-dii",
-    }
-    client = httpx.Client(headers=nse_headers, timeout=30.0, follow_redirects=True)
-    # Visit homepage to get session cookies
-    client.get("https://www.nseindia.com")
-    return client
+
+    def __init__(self, cookie_ttl: float = None):
+        self.cookie_ttl = (
+            cookie_ttl if cookie_ttl is not None else settings.nse_cookie_ttl_minutes * 60
+        )
+        self._client = None
+        self._cookies_at = None
+        self._lock = threading.Lock()
+
+    def _cookies_valid(self) -> bool:
+        if self._cookies_at is None or time.time() - self._cookies_at >= self.cookie_ttl:
+            return False
+        return not any(cookie.is_expired() for cookie in self._client.cookies.jar)
+
+    def _ensure_cookies(self, force: bool = False, seen_at: float = None) -> tuple:
+        """Return (client, cookie time), visiting the homepage first if the cookies need refreshing.
+
+        `seen_at` is the cookie time a caller's rejected request was made
+        with; if another thread has refreshed since, that refresh is reused.
+        """
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(headers=NSE_HEADERS, timeout=30.0, follow_redirects=True)
+            stale = force and self._cookies_at == seen_at
+            if stale or not self._cookies_valid():
+                self._client.cookies.clear()
+                self._client.get(NSE_HOMEPAGE)
+                self._cookies_at = time.time()
+            return self._client, self._cookies_at
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        """GET an NSE URL, refreshing the cookies and retrying once on 401/403."""
+        client, seen_at = self._ensure_cookies()
+        response = client.get(url, **kwargs)
+        if response.status_code in (401, 403):
+            client, _ = self._ensure_cookies(force=True, seen_at=seen_at)
+            response = client.get(url, **kwargs)
+        return response
+
+    def close(self) -> None:
+        """Close the pooled connections; the next call starts a new session."""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+            self._client = None
+            self._cookies_at = None
+
+
+# Shared by every NSE-backed tool
+_nse_session = NSESession()
+
+
+def _get_nse_session() -> NSESession:
+    """The shared NSE session."""
+    return _nse_session
 
 
 @tool("Get FII DII Data")
@@ -42,12 +109,12 @@ def get_fii_dii_data() -> str:
     Returns:
         JSON string with FII/DII buy/sell data in cash segment.
     """
+    cached = _cache.get("fii_dii")
+    if cached is not None:
+        return json.dumps(cached, indent=2)
+
     try:
-        client = _get_nse_session()
-        try:
-            response = client.get("https://www.nseindia.com/api/fiidiiTradeReact")
-        finally:
-            client.close()
+        response = _get_nse_session().get("https://www.nseindia.com/api/fiidiiTradeReact")
 
         if response.status_code != 200:
             return json.dumps({
@@ -86,7 +153,7 @@ def get_fii_dii_data() -> str:
         else:
             sentiment = "Strong Bearish (Heavy Selling)"
 
-        return json.dumps({
+        result = {
             "date": data_date,
             "fii": {
                 "buy_value_cr": fii_data["buy"],
@@ -107,7 +174,10 @@ def get_fii_dii_data() -> str:
             "note": "Values in Indian Rupees Crores. Positive net = buying, Negative = selling.",
             "source": "NSE India",
             "fetched_at": datetime.now().isoformat(),
-        }, indent=2)
+        }
+
+        _cache.set("fii_dii", result)
+        return json.dumps(result, indent=2)
 
     except Exception as e:
         return json.dumps({
@@ -133,34 +203,32 @@ def get_bulk_block_deals(symbol: str = None) -> str:
         JSON string with bulk and block deal information.
     """
     try:
-        client = _get_nse_session()
-        deals = []
-
-        try:
+        # The NSE snapshot covers every stock, so fetch it once and filter per call
+        all_deals = _cache.get("bulk_block_deals")
+        if all_deals is None:
+            all_deals = []
             # NSE bulk deals API
-            response = client.get("https://www.nseindia.com/api/snapshot-capital-market-largedeal")
-        finally:
-            client.close()
-
-        if response.status_code == 200:
-            api_data = response.json()
-            # API returns {"BLOCK_DEALS_DATA": [...], "BULK_DEALS_DATA": [...]}
-            for deal_type_key in ["BLOCK_DEALS_DATA", "BULK_DEALS_DATA"]:
-                for entry in api_data.get(deal_type_key, []):
-                    deal = {
-                        "stock": entry.get("symbol", "N/A"),
-                        "client": entry.get("clientName", "N/A"),
-                        "deal_type": "Block" if "BLOCK" in deal_type_key else "Bulk",
-                        "buy_sell": entry.get("buySell", "N/A"),
-                        "quantity": entry.get("quantityTraded", "N/A"),
-                        "price": entry.get("tradedPrice", "N/A"),
-                    }
-
-                    if symbol:
-                        if symbol.upper() in deal["stock"].upper():
-                            deals.append(deal)
-                    else:
-                        deals.append(deal)
+            response = _get_nse_session().get("https://www.nseindia.com/api/snapshot-capital-market-largedeal")
+
+            if response.status_code == 200:
+                api_data = response.json()
+                # API returns {"BLOCK_DEALS_DATA": [...], "BULK_DEALS_DATA": [...]}
+                for deal_type_key in ["BLOCK_DEALS_DATA", "BULK_DEALS_DATA"]:
+                    for entry in api_data.get(deal_type_key, []):
+                        all_deals.append({
+                            "stock": entry.get("symbol", "N/A"),
+                            "client": entry.get("clientName", "N/A"),
+                            "deal_type": "Block" if "BLOCK" in deal_type_key else "Bulk",
+                            "buy_sell": entry.get("buySell", "N/A"),
+                            "quantity": entry.get("quantityTraded", "N/A"),
+                            "price": entry.get("tradedPrice", "N/A"),
+                        })
+                _cache.set("bulk_block_deals", all_deals)
+
+        if symbol:
+            deals = [d for d in all_deals if symbol.upper() in d["stock"].upper()]
+        else:
+            deals = list(all_deals)
 
         return json.dumps({
             "filter_symbol": symbol or "All Stocks",
@@ -193,6 +261,11 @@ def get_promoter_holdings(symbol: str) -> str:
     Returns:
         JSON string with shareholding pattern breakdown.
     """
+    cache_key = f"promoter_{symbol.upper()}"
+    cached = _cache.get(cache_key)
+    if cached is not None:
+        return json.dumps(cached, indent=2)
+
     try:
         import yfinance as yf
         
@@ -245,6 +318,9 @@ def get_promoter_holdings(symbol: str) -> str:
         
         result["fetched_at"] = datetime.now().isoformat()
         
+        # Only cache when holder data came back; a bare template is retried next time
+        if "major_holders" in result or "top_institutional_holders" in result:
+            _cache.set(cache_key, result)
         return json.dumps(result, indent=2)
     
     except Exception as e:
@@ -268,6 +344,11 @@ def get_mutual_fund_holdings(symbol: str) -> str:
     Returns:
         JSON string with mutual fund holding information.
     """
+    cache_key = f"mf_{symbol.upper()}"
+    cached = _cache.get(cache_key)
+    if cached is not None:
+        return json.dumps(cached, indent=2)
+
     try:
         url = f"https://www.screener.in/company/{symbol.upper()}/"
         
@@ -306,6 +387,8 @@ def get_mutual_fund_holdings(symbol: str) -> str:
             
             mf_info["fetched_at"] = datetime.now().isoformat()
             
+            if response.status_code == 200:
+                _cache.set(cache_key, mf_info)
             return json.dumps(mf_info, indent=2)
     
     except Exception as e:
@@ -4,21 +4,29 @@ Fetches real-time and historical data from NSE, BSE, and Yahoo Finance
 """
 
 import json
-import threading
-from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
 import httpx
-import yfinance as yf
 from crewai.tools import tool
 from tenacity import retry, stop_after_attempt, wait_exponential
 import pandas as pd
 
-# Thread-safe LRU cache for stock data
-_cache_lock = threading.Lock()
-_cache: OrderedDict = OrderedDict()
-_cache_ttl = 900  # 15 minutes
-_cache_max_size = 200
+from config import INDIAN_INDICES, NIFTY50_STOCKS, SECTORS
+from tools.cache import get_cache
+from tools.company_profile import get_company_profile
+from tools.price_store import get_ohlcv, get_ohlcv_batch
+
+# Shared cache for price, info and trending data (TTL/size from Settings).
+# Concurrent misses for one key share a single fetch via get_or_load.
+_cache = get_cache("market_data")
+
+# Index levels move all day, so they get their own short-TTL cache
+_index_cache = get_cache("index")
+
+
+def _is_ok(data: dict) -> bool:
+    """Only successful results are cached; errors are retried on the next call."""
+    return "error" not in data
 
 
 def _get_nse_symbol(symbol: str) -> str:
@@ -29,33 +37,6 @@ def _get_nse_symbol(symbol: str) -> str:
     return symbol
 
 
-def _is_cache_valid(key: str) -> bool:
-    """Check if cached data is still valid (thread-safe)."""
-    with _cache_lock:
-        if key not in _cache:
-            return False
-        cached_time = _cache[key].get("timestamp", 0)
-        return (datetime.now().timestamp() - cached_time) < _cache_ttl
-
-
-def _cache_get(key: str) -> dict | None:
-    """Thread-safe cache read."""
-    with _cache_lock:
-        entry = _cache.get(key)
-        if entry:
-            _cache.move_to_end(key)
-        return entry
-
-
-def _cache_set(key: str, data: dict) -> None:
-    """Thread-safe cache write with LRU eviction."""
-    with _cache_lock:
-        _cache[key] = {"data": data, "timestamp": datetime.now().timestamp()}
-        _cache.move_to_end(key)
-        while len(_cache) > _cache_max_size:
-            _cache.popitem(last=False)
-
-
 @tool("Get Stock Price")
 def get_stock_price(symbol: str) -> str:
     """
@@ -67,30 +48,31 @@ def get_stock_price(symbol: str) -> str:
     Returns:
         JSON string with current price, change, volume, and other trading data.
     """
-    cache_key = f"price_{symbol}"
-    if _is_cache_valid(cache_key):
-        return json.dumps(_cache_get(cache_key)["data"], indent=2)
+    data = _cache.get_or_load(f"price_{symbol}", lambda: _fetch_price(symbol), should_cache=_is_ok)
+    return json.dumps(data, indent=2)
 
+
+def _fetch_price(symbol: str) -> dict:
+    """Build the price snapshot for `get_stock_price`."""
     try:
-        ticker = yf.Ticker(_get_nse_symbol(symbol))
-        info = ticker.info
+        info = get_company_profile(_get_nse_symbol(symbol))
         
-        # Get today's data
-        hist = ticker.history(period="2d")
+        # Get today's data; history older than the quote cache TTL is topped up, not reused
+        hist = get_ohlcv(_get_nse_symbol(symbol), period="2d", max_age=_cache.ttl)
         
         if hist.empty:
-            return json.dumps({
+            return {
                 "error": f"No data found for {symbol}",
                 "DATA_UNAVAILABLE": True,
                 "message": f"No price data returned for {symbol}. The symbol may be invalid. Do NOT guess the price.",
-            })
+            }
         
         current_price = hist['Close'].iloc[-1]
         prev_close = hist['Close'].iloc[-2] if len(hist) > 1 else current_price
         change = current_price - prev_close
         change_pct = (change / prev_close) * 100
         
-        data = {
+        return {
             "symbol": symbol.upper(),
             "current_price": round(current_price, 2),
             "previous_close": round(prev_close, 2),
@@ -106,18 +88,14 @@ def get_stock_price(symbol: str) -> str:
             "avg_volume": info.get("averageVolume", "N/A"),
             "timestamp": datetime.now().isoformat(),
         }
-        
-        _cache_set(cache_key, data)
-
-        return json.dumps(data, indent=2)
 
     except Exception as e:
-        return json.dumps({
+        return {
             "error": str(e),
             "symbol": symbol,
             "DATA_UNAVAILABLE": True,
             "message": f"FAILED to fetch price for {symbol}. Do NOT guess the price.",
-        })
+        }
 
 
 @tool("Get Stock Info")
@@ -131,15 +109,16 @@ def get_stock_info(symbol: str) -> str:
     Returns:
         JSON string with company info including sector, industry, financials.
     """
-    cache_key = f"info_{symbol}"
-    if _is_cache_valid(cache_key):
-        return json.dumps(_cache_get(cache_key)["data"], indent=2)
+    data = _cache.get_or_load(f"info_{symbol}", lambda: _fetch_info(symbol), should_cache=_is_ok)
+    return json.dumps(data, indent=2)
+
 
+def _fetch_info(symbol: str) -> dict:
+    """Build the company summary for `get_stock_info`."""
     try:
-        ticker = yf.Ticker(_get_nse_symbol(symbol))
-        info = ticker.info
+        info = get_company_profile(_get_nse_symbol(symbol))
         
-        data = {
+        return {
             "symbol": symbol.upper(),
             "company_name": info.get("longName", info.get("shortName", "N/A")),
             "sector": info.get("sector", "N/A"),
@@ -163,18 +142,14 @@ def get_stock_info(symbol: str) -> str:
             "beta": info.get("beta", "N/A"),
             "timestamp": datetime.now().isoformat(),
         }
-        
-        _cache_set(cache_key, data)
-
-        return json.dumps(data, indent=2)
 
     except Exception as e:
-        return json.dumps({
+        return {
             "error": str(e),
             "symbol": symbol,
             "DATA_UNAVAILABLE": True,
             "message": f"FAILED to fetch info for {symbol}. Do NOT guess company details.",
-        })
+        }
 
 
 @tool("Get Historical Data")
@@ -194,8 +169,7 @@ def get_historical_data(symbol: str, period: str = "1y") -> str:
         period = "1y"
     
     try:
-        ticker = yf.Ticker(_get_nse_symbol(symbol))
-        hist = ticker.history(period=period)
+        hist = get_ohlcv(_get_nse_symbol(symbol), period=period)
         
         if hist.empty:
             return json.dumps({
@@ -261,23 +235,29 @@ def get_index_data(index_name: str = "NIFTY50") -> str:
     Returns:
         JSON string with index levels, changes, and key metrics.
     """
-    index_symbols = {
-        "NIFTY50": "^NSEI",
-        "BANKNIFTY": "^NSEBANK",
-        "NIFTYIT": "^CNXIT",
-        "SENSEX": "^BSESN",
-    }
-    
+    index_name = index_name.upper()
+    data = _index_cache.get_or_load(
+        f"index_{index_name}", lambda: _fetch_indices(index_name), should_cache=_is_ok
+    )
+    return json.dumps(data, indent=2)
+
+
+def _fetch_indices(index_name: str) -> dict:
+    """Build index levels for `get_index_data`. 'ALL' is one batched download."""
     try:
-        if index_name.upper() == "ALL":
-            indices_to_fetch = index_symbols
+        # History older than the index cache TTL is topped up, not reused
+        max_age = _index_cache.ttl
+        if index_name == "ALL":
+            indices_to_fetch = INDIAN_INDICES
+            histories = get_ohlcv_batch(list(INDIAN_INDICES.values()), period="2d", max_age=max_age)
         else:
-            indices_to_fetch = {index_name.upper(): index_symbols.get(index_name.upper(), "^NSEI")}
+            symbol = INDIAN_INDICES.get(index_name, "^NSEI")
+            indices_to_fetch = {index_name: symbol}
+            histories = {symbol: get_ohlcv(symbol, period="2d", max_age=max_age)}
         
         results = {}
         for name, symbol in indices_to_fetch.items():
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period="2d")
+            hist = histories[symbol]
             
             if not hist.empty:
                 current = hist['Close'].iloc[-1]
@@ -295,10 +275,88 @@ def get_index_data(index_name: str = "NIFTY50") -> str:
                 }
         
         results["timestamp"] = datetime.now().isoformat()
-        return json.dumps(results, indent=2)
+        return results
     
     except Exception as e:
-        return json.dumps({"error": str(e)})
+        return {"error": str(e)}
+
+
+def get_quotes(symbols: list[str]) -> dict[str, dict]:
+    """Get last price and day change for many stocks with one batched download.
+
+    Fills the shared OHLCV store, so later price and technical lookups for
+    these symbols need no history request. Symbols without data are left out.
+    Returns {symbol: {"price", "previous_close", "change", "change_percent",
+    "volume"}} in input order.
+    """
+    yahoo_symbols = {s.upper().strip(): _get_nse_symbol(s) for s in symbols}
+    histories = get_ohlcv_batch(list(yahoo_symbols.values()), period="2d")
+
+    quotes = {}
+    for symbol, yahoo_symbol in yahoo_symbols.items():
+        hist = histories.get(yahoo_symbol)
+        if hist is None or hist.empty:
+            continue
+        current = hist['Close'].iloc[-1]
+        prev = hist['Close'].iloc[-2] if len(hist) > 1 else current
+        change = current - prev
+        quotes[symbol] = {
+            "price": round(float(current), 2),
+            "previous_close": round(float(prev), 2),
+            "change": round(float(change), 2),
+            "change_percent": round(float(change / prev) * 100, 2) if prev else 0.0,
+            "volume": int(hist['Volume'].iloc[-1]),
+        }
+    return quotes
+
+
+def resolve_universe(symbols: str) -> tuple[str, list[str]]:
+    """Resolve 'NIFTY50', a SECTORS key or a comma-separated list to (name, symbols).
+
+    Comma-separated lists are named 'CUSTOM'.
+    """
+    universe = symbols.upper().strip()
+    if universe == "NIFTY50":
+        return universe, list(NIFTY50_STOCKS)
+    if universe in SECTORS:
+        return universe, list(SECTORS[universe])
+    return "CUSTOM", [s.strip() for s in universe.split(",") if s.strip()]
+
+
+@tool("Get Batch Quotes")
+def get_batch_quotes(symbols: str = "NIFTY50") -> str:
+    """
+    Get last price and day change for many Indian stocks in one request.
+    
+    Args:
+        symbols: 'NIFTY50', a sector name ('IT', 'BANKING', 'PHARMA', ...),
+            or comma-separated stock symbols (e.g., 'TCS,INFY,WIPRO')
+        
+    Returns:
+        JSON string with a compact quote table (one row per symbol).
+    """
+    universe, symbol_list = resolve_universe(symbols)
+    if not symbol_list:
+        return json.dumps({"error": "No symbols given", "DATA_UNAVAILABLE": True})
+
+    try:
+        quotes = get_quotes(symbol_list)
+    except Exception as e:
+        return json.dumps({
+            "error": str(e),
+            "symbols": symbols,
+            "DATA_UNAVAILABLE": True,
+            "message": "FAILED to fetch batch quotes. Do NOT guess prices.",
+        })
+
+    columns = ["symbol", "price", "change", "change_percent", "volume"]
+    return json.dumps({
+        "universe": universe,
+        "columns": columns,
+        "rows": [[sym] + [q[c] for c in columns[1:]] for sym, q in quotes.items()],
+        "missing": [s.upper() for s in symbol_list if s.upper() not in quotes],
+        "timestamp": datetime.now().isoformat(),
+    })
 
 
 @tool("Get NSE Stock Quote")
@@ -371,42 +429,46 @@ def get_trending_stocks() -> dict:
     Each entry has 'symbol', 'ltp', 'net_price' (change %).
     Falls back to empty lists on failure.
     """
-    cache_key = "trending_stocks"
-    if _is_cache_valid(cache_key):
-        return _cache_get(cache_key)["data"]
-
     try:
-        from nsetools import Nse
-        nse = Nse()
-
-        gainers = nse.get_top_gainers()
-        losers = nse.get_top_losers()
-
-        data = {
-            "gainers": gainers if isinstance(gainers, list) else [],
-            "losers": losers if isinstance(losers, list) else [],
-        }
-        _cache_set(cache_key, data)
-        return data
+        return _cache.get_or_load("trending_stocks", _fetch_trending)
     except Exception:
         return {"gainers": [], "losers": []}
 
 
+def _fetch_trending() -> dict:
+    """Fetch top gainers and losers from NSE. Errors propagate (nothing cached)."""
+    from nsetools import Nse
+    nse = Nse()
+
+    gainers = nse.get_top_gainers()
+    losers = nse.get_top_losers()
+
+    return {
+        "gainers": gainers if isinstance(gainers, list) else [],
+        "losers": losers if isinstance(losers, list) else [],
+    }
+
+
 def get_peer_comparison(symbol: str, sector: str) -> dict:
     """Get comparison with sector peers (helper function, not a tool)."""
-    from config import SECTORS
-    
     peers = SECTORS.get(sector, [])[:5]  # Get top 5 peers
     if symbol.upper() in peers:
         peers.remove(symbol.upper())
-    
+    peers = peers[:4]  # Compare with 4 peers
+
+    # Price every peer in one batched download; ratios come from the profile
+    try:
+        quotes = get_quotes(peers) if peers else {}
+    except Exception:
+        quotes = {}
+
     comparison = {}
-    for peer in peers[:4]:  # Compare with 4 peers
+    for peer in peers:
         try:
-            ticker = yf.Ticker(_get_nse_symbol(peer))
-            info = ticker.info
+            info = get_company_profile(_get_nse_symbol(peer))
+            quote = quotes.get(peer)
             comparison[peer] = {
-                "price": info.get("currentPrice", "N/A"),
+                "price": quote["price"] if quote else info.get("currentPrice", "N/A"),
                 "pe_ratio": info.get("trailingPE", "N/A"),
                 "market_cap": info.get("marketCap", "N/A"),
             }
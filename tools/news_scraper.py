@@ -3,11 +3,12 @@ News Scraping Tools for Indian Stock Market
 Uses RSS feeds (Economic Times, Google News) and ET HTML scraping for reliable news data.
 """
 
+import asyncio
+import contextvars
 import json
 import re
-import threading
 import xml.etree.ElementTree as ET
-from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 from typing import Optional
 import httpx
@@ -15,6 +16,9 @@ from bs4 import BeautifulSoup
 from crewai.tools import tool
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from config import settings
+from tools.cache import get_cache
+
 # Common headers for web scraping
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -25,34 +29,8 @@ HEADERS = {
     "Upgrade-Insecure-Requests": "1",
 }
 
-# Thread-safe news cache with LRU eviction
-_news_cache_lock = threading.Lock()
-_news_cache: OrderedDict = OrderedDict()
-_cache_ttl = 600  # 10 minutes
-_cache_max_size = 100
-
-
-def _news_cache_get(key: str) -> dict | None:
-    """Thread-safe cache read."""
-    with _news_cache_lock:
-        if key not in _news_cache:
-            return None
-        entry = _news_cache[key]
-        if (datetime.now().timestamp() - entry["timestamp"]) >= _cache_ttl:
-            del _news_cache[key]
-            return None
-        _news_cache.move_to_end(key)
-        return entry
-
-
-def _news_cache_set(key: str, data: dict) -> None:
-    """Thread-safe cache write with LRU eviction."""
-    with _news_cache_lock:
-        _news_cache[key] = {"data": data, "timestamp": datetime.now().timestamp()}
-        _news_cache.move_to_end(key)
-        while len(_news_cache) > _cache_max_size:
-            _news_cache.popitem(last=False)
-
+# Shared news cache (TTL/size from Settings)
+_news_cache = get_cache("news")
 
 def _clean_text(text: str) -> str:
     """Clean and normalize text content."""
@@ -130,337 +108,412 @@ def _parse_rss_date(date_str: str) -> str:
     return date_str
 
 
-@tool("Scrape ET RSS News")
-def scrape_et_rss_news(symbol: str, limit: int = 10) -> str:
+# ==========================================
+# Sources
+# Each source is a URL builder plus a parser, shared by the sync tools
+# (httpx.Client) and their async counterparts (httpx.AsyncClient).
+# ==========================================
+
+ET_RSS_URL = "https://economictimes.indiatimes.com/markets/stocks/rssfeeds/1977021502.cms"
+ET_RSS_SOURCE = "Economic Times RSS"
+
+
+def _rss_items(text: str) -> list:
+    """Return the <item> elements of an RSS document."""
+    root = ET.fromstring(text)
+    # RSS structure: <rss><channel><item>...</item></channel></rss>
+    channel = root.find("channel")
+    if channel is not None:
+        return channel.findall("item")
+    return root.findall(".//item")
+
+
+def _name_variations(symbol: str) -> list[str]:
+    """Lowercase strings an article may use for a symbol.
+
+    Besides the symbol itself, common name variations are tried
+    (e.g., GOLDBEES -> "gold bees", NIFTY50 -> "nifty 50").
     """
-    Fetch latest stock news from Economic Times RSS feed.
+    symbol_parts = re.split(r'(?<=[a-z])(?=[A-Z])|(?<=\D)(?=\d)|(?<=\d)(?=\D)', symbol)
+    variations = [symbol.lower(), " ".join(p.lower() for p in symbol_parts if p)]
+    return [var for var in dict.fromkeys(variations) if var]
 
-    Args:
-        symbol: Stock symbol (e.g., 'RELIANCE', 'TCS')
-        limit: Maximum number of news articles to fetch (default: 10)
 
-    Returns:
-        JSON string with list of news articles including title, summary, date, and URL.
+class _ArticleIndex:
+    """The parsed ET RSS feed, shared by every symbol until the news TTL expires.
+
+    Matches are looked up per name variation and remembered, so repeated
+    queries for a symbol do not rescan the feed.
     """
-    cache_key = f"et_rss_{symbol}"
-    cached = _news_cache_get(cache_key)
-    if cached:
-        return json.dumps(cached["data"], indent=2)
 
-    symbol = symbol.upper().strip()
-    news_articles = []
+    def __init__(self, entries: list[tuple[str, dict]], fetched_at: str):
+        # (lowercased title + description, article) per feed item
+        self._search_text = [text for text, _ in entries]
+        self.articles = [article for _, article in entries]
+        self.fetched_at = fetched_at
+        self._matches: dict[str, list[int]] = {}
 
-    try:
-        rss_url = "https://economictimes.indiatimes.com/markets/stocks/rssfeeds/1977021502.cms"
+    def _positions(self, variation: str) -> list[int]:
+        positions = self._matches.get(variation)
+        if positions is None:
+            positions = [i for i, text in enumerate(self._search_text) if variation in text]
+            self._matches[variation] = positions
+        return positions
 
-        with httpx.Client(headers=HEADERS, timeout=30.0, follow_redirects=True) as client:
-            response = client.get(rss_url)
+    def lookup(self, symbol: str, limit: int) -> list[dict]:
+        """Articles mentioning the symbol or one of its name variations, in feed order."""
+        positions = set()
+        for variation in _name_variations(symbol):
+            positions.update(self._positions(variation))
+        return [self.articles[i] for i in sorted(positions)[:limit]]
 
-            if response.status_code == 200:
-                root = ET.fromstring(response.text)
 
-                # RSS structure: <rss><channel><item>...</item></channel></rss>
-                channel = root.find("channel")
-                if channel is not None:
-                    items = channel.findall("item")
-                else:
-                    items = root.findall(".//item")
+def _parse_et_rss(text: str) -> _ArticleIndex:
+    """Parse every ET RSS item into an article index."""
+    entries = []
 
-                for item in items:
-                    if len(news_articles) >= limit:
-                        break
+    for item in _rss_items(text):
+        title_elem = item.find("title")
+        link_elem = item.find("link")
+        desc_elem = item.find("description")
+        pub_date_elem = item.find("pubDate")
 
-                    title_elem = item.find("title")
-                    link_elem = item.find("link")
-                    desc_elem = item.find("description")
-                    pub_date_elem = item.find("pubDate")
+        title = title_elem.text if title_elem is not None and title_elem.text else ""
+        link = link_elem.text if link_elem is not None and link_elem.text else ""
+        description = desc_elem.text if desc_elem is not None and desc_elem.text else ""
+        pub_date = pub_date_elem.text if pub_date_elem is not None and pub_date_elem.text else ""
 
-                    title = title_elem.text if title_elem is not None and title_elem.text else ""
-                    link = link_elem.text if link_elem is not None and link_elem.text else ""
-                    description = desc_elem.text if desc_elem is not None and desc_elem.text else ""
-                    pub_date = pub_date_elem.text if pub_date_elem is not None and pub_date_elem.text else ""
+        title = _clean_text(title)
+        description = _clean_text(description)
 
-                    title = _clean_text(title)
-                    description = _clean_text(description)
-
-                    # Filter: include items mentioning the symbol or company
-                    search_text = (title + " " + description).lower()
-                    symbol_lower = symbol.lower()
-                    # Also try common name variations (e.g., GOLDBEES -> "gold bees", "gold bee")
-                    symbol_parts = re.split(r'(?<=[a-z])(?=[A-Z])|(?<=\D)(?=\d)|(?<=\d)(?=\D)', symbol)
-                    name_variations = [symbol_lower, " ".join(p.lower() for p in symbol_parts if p)]
-                    if not any(var in search_text for var in name_variations if var):
-                        continue
+        entries.append(((title + " " + description).lower(), {
+            "title": title,
+            "summary": description[:200],
+            "url": link,
+            "published": _parse_rss_date(pub_date),
+            "source": ET_RSS_SOURCE,
+        }))
 
-                    news_articles.append({
-                        "title": title,
-                        "summary": description[:200] if description else "",
-                        "url": link,
-                        "published": _parse_rss_date(pub_date),
-                        "source": "Economic Times RSS",
-                    })
+    return _ArticleIndex(entries, datetime.now().isoformat())
 
-        result = {
-            "symbol": symbol,
-            "source": "Economic Times RSS",
-            "articles_count": len(news_articles),
-            "articles": news_articles[:limit],
-            "fetched_at": datetime.now().isoformat(),
-        }
 
-        _news_cache_set(cache_key, result)
-        return json.dumps(result, indent=2)
+def _et_topic_url(symbol: str) -> str:
+    """ET topic page for a symbol."""
+    return f"https://economictimes.indiatimes.com/topic/{symbol.lower()}"
 
-    except ET.ParseError as e:
-        return json.dumps({
-            "symbol": symbol,
-            "source": "Economic Times RSS",
-            "error": f"RSS parse error: {e}",
-            "articles": [],
-        }, indent=2)
-    except Exception as e:
-        return json.dumps({
-            "symbol": symbol,
-            "source": "Economic Times RSS",
-            "error": str(e),
-            "articles": [],
-        }, indent=2)
 
+def _parse_et_html(text: str, symbol: str, limit: int) -> list[dict]:
+    """Extract article links from an ET topic page."""
+    news_articles = []
+    soup = BeautifulSoup(text, 'lxml')
 
-@tool("Scrape Economic Times News")
-def scrape_economic_times_news(symbol: str, limit: int = 10) -> str:
-    """
-    Scrape latest news for a stock from Economic Times.
+    # Find all articleshow links (ET's article URL pattern)
+    seen_titles = set()
+    article_links = soup.find_all('a', href=re.compile(r'articleshow'))
 
-    Args:
-        symbol: Stock symbol (e.g., 'RELIANCE', 'TCS')
-        limit: Maximum number of news articles to fetch (default: 10)
+    for link_elem in article_links:
+        if len(news_articles) >= limit:
+            break
+        try:
+            title = _clean_text(link_elem.get_text())
 
-    Returns:
-        JSON string with list of news articles.
-    """
-    cache_key = f"et_news_{symbol}"
-    cached = _news_cache_get(cache_key)
-    if cached:
-        return json.dumps(cached["data"], indent=2)
+            # Skip short titles, duplicates, or non-article links
+            if not title or len(title) < 25 or title in seen_titles:
+                continue
 
-    symbol = symbol.upper().strip()
+            # Skip common non-news items
+            skip_keywords = ['horoscope', 'weather', 'cricket', 'ipl', 'match']
+            if any(kw in title.lower() for kw in skip_keywords):
+                continue
+
+            seen_titles.add(title)
+
+            link = link_elem.get('href', '')
+            if link and not link.startswith('http'):
+                link = f"https://economictimes.indiatimes.com{link}"
+
+            # Try to get date from parent element
+            parent = link_elem.find_parent(['div', 'li', 'article'])
+            published = ""
+            if parent:
+                date_elem = parent.find('time') or parent.find('span', class_=re.compile(r'date|time'))
+                if date_elem:
+                    published = _parse_relative_time(date_elem.get_text())
+
+            news_articles.append({
+                "title": title,
+                "summary": "",
+                "url": link,
+                "published": published,
+                "source": "Economic Times",
+            })
+
+        except Exception:
+            continue
+
+    return news_articles
+
+
+def _google_news_url(symbol: str) -> str:
+    """Google News RSS search for the stock symbol on NSE."""
+    return f"https://news.google.com/rss/search?q={symbol}+NSE+stock&hl=en-IN&gl=IN&ceid=IN:en"
+
+
+def _parse_google_news(text: str, symbol: str, limit: int) -> list[dict]:
+    """Read articles from a Google News RSS search."""
     news_articles = []
 
-    try:
-        # Search for the company
-        search_term = symbol.lower()
-        url = f"https://economictimes.indiatimes.com/topic/{search_term}"
+    for item in _rss_items(text):
+        if len(news_articles) >= limit:
+            break
 
-        with httpx.Client(headers=HEADERS, timeout=30.0, follow_redirects=True) as client:
-            response = client.get(url)
+        title_elem = item.find("title")
+        link_elem = item.find("link")
+        pub_date_elem = item.find("pubDate")
+        source_elem = item.find("source")
 
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'lxml')
+        title = title_elem.text if title_elem is not None and title_elem.text else ""
+        link = link_elem.text if link_elem is not None and link_elem.text else ""
+        pub_date = pub_date_elem.text if pub_date_elem is not None and pub_date_elem.text else ""
+        source_name = source_elem.text if source_elem is not None and source_elem.text else "Google News"
+
+        title = _clean_text(title)
+        if not title:
+            continue
 
-                # Find all articleshow links (ET's article URL pattern)
-                seen_titles = set()
-                article_links = soup.find_all('a', href=re.compile(r'articleshow'))
+        news_articles.append({
+            "title": title,
+            "summary": "",
+            "url": link,
+            "published": _parse_rss_date(pub_date),
+            "source": f"Google News ({source_name})",
+        })
 
-                for link_elem in article_links:
-                    if len(news_articles) >= limit:
-                        break
-                    try:
-                        title = _clean_text(link_elem.get_text())
-
-                        # Skip short titles, duplicates, or non-article links
-                        if not title or len(title) < 25 or title in seen_titles:
-                            continue
-
-                        # Skip common non-news items
-                        skip_keywords = ['horoscope', 'weather', 'cricket', 'ipl', 'match']
-                        if any(kw in title.lower() for kw in skip_keywords):
-                            continue
-
-                        seen_titles.add(title)
-
-                        link = link_elem.get('href', '')
-                        if link and not link.startswith('http'):
-                            link = f"https://economictimes.indiatimes.com{link}"
-
-                        # Try to get date from parent element
-                        parent = link_elem.find_parent(['div', 'li', 'article'])
-                        published = ""
-                        if parent:
-                            date_elem = parent.find('time') or parent.find('span', class_=re.compile(r'date|time'))
-                            if date_elem:
-                                published = _parse_relative_time(date_elem.get_text())
-
-                        news_articles.append({
-                            "title": title,
-                            "summary": "",
-                            "url": link,
-                            "published": published,
-                            "source": "Economic Times",
-                        })
-
-                    except Exception:
-                        continue
+    return news_articles
 
-        result = {
-            "symbol": symbol,
-            "source": "Economic Times",
-            "articles_count": len(news_articles),
-            "articles": news_articles[:limit],
-            "fetched_at": datetime.now().isoformat(),
-        }
 
-        _news_cache_set(cache_key, result)
+# Per-symbol sources: (cache prefix, source name, URL builder, parser)
+_SOURCES = {
+    "economic_times": ("et_news", "Economic Times", _et_topic_url, _parse_et_html),
+    "google_news": ("google_news", "Google News", _google_news_url, _parse_google_news),
+}
+
+# Cache key of the shared ET RSS article index
+_ET_RSS_INDEX_KEY = "et_rss_index"
+
+
+def _news_result(source_key: str, symbol: str, limit: int, response) -> dict:
+    """Parse a source response into the tool result."""
+    _, source_name, _, parse = _SOURCES[source_key]
+    news_articles = parse(response.text, symbol, limit) if response.status_code == 200 else []
+
+    return {
+        "symbol": symbol,
+        "source": source_name,
+        "articles_count": len(news_articles),
+        "articles": news_articles[:limit],
+        "fetched_at": datetime.now().isoformat(),
+    }
+
+
+def _news_error(source_name: str, symbol: str, e: Exception) -> dict:
+    """Error result for a failed source."""
+    return {
+        "symbol": symbol,
+        "source": source_name,
+        "error": f"RSS parse error: {e}" if isinstance(e, ET.ParseError) else str(e),
+        "articles": [],
+    }
+
+
+def _scrape(source_key: str, symbol: str, limit: int) -> str:
+    """Fetch one news source with a blocking client."""
+    cache_prefix, source_name, build_url, _ = _SOURCES[source_key]
+    cache_key = f"{cache_prefix}_{symbol}"
+    cached = _news_cache.get(cache_key)
+    if cached is not None:
+        return json.dumps(cached, indent=2)
+
+    symbol = symbol.upper().strip()
+
+    try:
+        with httpx.Client(headers=HEADERS, timeout=30.0, follow_redirects=True) as client:
+            response = client.get(build_url(symbol))
+
+        result = _news_result(source_key, symbol, limit, response)
+        _news_cache.set(cache_key, result)
         return json.dumps(result, indent=2)
 
     except Exception as e:
-        return json.dumps({
-            "symbol": symbol,
-            "source": "Economic Times",
-            "error": str(e),
-            "articles": [],
-        }, indent=2)
-
+        return json.dumps(_news_error(source_name, symbol, e), indent=2)
 
-@tool("Scrape Google News")
-def scrape_google_news(symbol: str, limit: int = 10) -> str:
-    """
-    Fetch latest stock news from Google News RSS feed.
-    Searches for stock-specific news from Indian financial publications.
 
-    Args:
-        symbol: Stock symbol (e.g., 'RELIANCE', 'TCS')
-        limit: Maximum number of news articles to fetch (default: 10)
+async def _scrape_async(
+    source_key: str, symbol: str, limit: int, client: Optional[httpx.AsyncClient] = None
+) -> str:
+    """Fetch one news source without blocking the event loop.
 
-    Returns:
-        JSON string with list of news articles.
+    Pass `client` to share one connection pool across several sources.
     """
-    cache_key = f"google_news_{symbol}"
-    cached = _news_cache_get(cache_key)
-    if cached:
-        return json.dumps(cached["data"], indent=2)
+    cache_prefix, source_name, build_url, _ = _SOURCES[source_key]
+    cache_key = f"{cache_prefix}_{symbol}"
+    cached = _news_cache.get(cache_key)
+    if cached is not None:
+        return json.dumps(cached, indent=2)
 
     symbol = symbol.upper().strip()
-    news_articles = []
 
     try:
-        # Google News RSS search for the stock symbol on NSE
-        rss_url = f"https://news.google.com/rss/search?q={symbol}+NSE+stock&hl=en-IN&gl=IN&ceid=IN:en"
+        if client is None:
+            async with httpx.AsyncClient(headers=HEADERS, timeout=30.0, follow_redirects=True) as own_client:
+                response = await own_client.get(build_url(symbol))
+        else:
+            response = await client.get(build_url(symbol))
 
-        with httpx.Client(headers=HEADERS, timeout=30.0, follow_redirects=True) as client:
-            response = client.get(rss_url)
+        result = _news_result(source_key, symbol, limit, response)
+        _news_cache.set(cache_key, result)
+        return json.dumps(result, indent=2)
 
-            if response.status_code == 200:
-                root = ET.fromstring(response.text)
+    except Exception as e:
+        return json.dumps(_news_error(source_name, symbol, e), indent=2)
 
-                channel = root.find("channel")
-                if channel is not None:
-                    items = channel.findall("item")
-                else:
-                    items = root.findall(".//item")
 
-                for item in items:
-                    if len(news_articles) >= limit:
-                        break
+# The ET RSS feed is the same for every symbol: it is downloaded and parsed
+# once per news TTL into an _ArticleIndex, and each symbol is a lookup.
 
-                    title_elem = item.find("title")
-                    link_elem = item.find("link")
-                    pub_date_elem = item.find("pubDate")
-                    source_elem = item.find("source")
+def _index_from_response(response) -> Optional[_ArticleIndex]:
+    """Article index for a feed response; None (not cached) on an HTTP error."""
+    if response.status_code != 200:
+        return None
+    return _parse_et_rss(response.text)
 
-                    title = title_elem.text if title_elem is not None and title_elem.text else ""
-                    link = link_elem.text if link_elem is not None and link_elem.text else ""
-                    pub_date = pub_date_elem.text if pub_date_elem is not None and pub_date_elem.text else ""
-                    source_name = source_elem.text if source_elem is not None and source_elem.text else "Google News"
 
-                    title = _clean_text(title)
-                    if not title:
-                        continue
+def _fetch_et_rss_index() -> Optional[_ArticleIndex]:
+    with httpx.Client(headers=HEADERS, timeout=30.0, follow_redirects=True) as client:
+        return _index_from_response(client.get(ET_RSS_URL))
 
-                    news_articles.append({
-                        "title": title,
-                        "summary": "",
-                        "url": link,
-                        "published": _parse_rss_date(pub_date),
-                        "source": f"Google News ({source_name})",
-                    })
 
-        result = {
-            "symbol": symbol,
-            "source": "Google News",
-            "articles_count": len(news_articles),
-            "articles": news_articles[:limit],
-            "fetched_at": datetime.now().isoformat(),
-        }
+def _et_rss_result(index: Optional[_ArticleIndex], symbol: str, limit: int) -> dict:
+    """Tool result for one symbol, looked up in the shared index."""
+    news_articles = index.lookup(symbol, limit) if index is not None else []
+    return {
+        "symbol": symbol,
+        "source": ET_RSS_SOURCE,
+        "articles_count": len(news_articles),
+        "articles": news_articles,
+        "fetched_at": index.fetched_at if index is not None else datetime.now().isoformat(),
+    }
 
-        _news_cache_set(cache_key, result)
-        return json.dumps(result, indent=2)
 
-    except ET.ParseError as e:
-        return json.dumps({
-            "symbol": symbol,
-            "source": "Google News",
-            "error": f"RSS parse error: {e}",
-            "articles": [],
-        }, indent=2)
+def _scrape_et_rss(symbol: str, limit: int) -> str:
+    """ET RSS articles for a symbol; concurrent callers share one feed download."""
+    symbol = symbol.upper().strip()
+    try:
+        index = _news_cache.get_or_load(_ET_RSS_INDEX_KEY, _fetch_et_rss_index)
+        return json.dumps(_et_rss_result(index, symbol, limit), indent=2)
     except Exception as e:
-        return json.dumps({
-            "symbol": symbol,
-            "source": "Google News",
-            "error": str(e),
-            "articles": [],
-        }, indent=2)
+        return json.dumps(_news_error(ET_RSS_SOURCE, symbol, e), indent=2)
 
 
-@tool("Get Comprehensive Stock News")
-def get_stock_news(symbol: str, limit_per_source: int = 5) -> str:
+async def _scrape_et_rss_async(symbol: str, limit: int) -> str:
+    """Async `_scrape_et_rss`.
+
+    A miss waits in a thread on the same coalesced load as the sync path, so
+    async and sync callers together make one feed download.
     """
-    Get comprehensive news from multiple sources for a stock.
-    Aggregates news from Economic Times RSS, Economic Times, and Google News.
+    symbol = symbol.upper().strip()
+    try:
+        index = _news_cache.get(_ET_RSS_INDEX_KEY)
+        if index is None:
+            index = await asyncio.to_thread(_news_cache.get_or_load, _ET_RSS_INDEX_KEY, _fetch_et_rss_index)
+        return json.dumps(_et_rss_result(index, symbol, limit), indent=2)
+    except Exception as e:
+        return json.dumps(_news_error(ET_RSS_SOURCE, symbol, e), indent=2)
+
+
+# ==========================================
+# Tools
+# ==========================================
+
+@tool("Scrape ET RSS News")
+def scrape_et_rss_news(symbol: str, limit: int = 10) -> str:
+    """
+    Fetch latest stock news from Economic Times RSS feed.
 
     Args:
         symbol: Stock symbol (e.g., 'RELIANCE', 'TCS')
-        limit_per_source: Number of articles to fetch per source (default: 5)
+        limit: Maximum number of news articles to fetch (default: 10)
 
     Returns:
-        JSON string with aggregated news from all sources, sorted by relevance.
+        JSON string with list of news articles including title, summary, date, and URL.
     """
-    symbol = symbol.upper().strip()
-    all_articles = []
-    sources_status = {}
+    return _scrape_et_rss(symbol, limit)
 
-    # Fetch from ET RSS
-    try:
-        et_rss_result = json.loads(scrape_et_rss_news.run(symbol, limit_per_source))
-        if "articles" in et_rss_result:
-            all_articles.extend(et_rss_result["articles"])
-            sources_status["et_rss"] = "success"
-        else:
-            sources_status["et_rss"] = et_rss_result.get("error", "no articles")
-    except Exception as e:
-        sources_status["et_rss"] = str(e)
 
-    # Fetch from Economic Times HTML
-    try:
-        et_result = json.loads(scrape_economic_times_news.run(symbol, limit_per_source))
-        if "articles" in et_result:
-            all_articles.extend(et_result["articles"])
-            sources_status["economic_times"] = "success"
-        else:
-            sources_status["economic_times"] = et_result.get("error", "no articles")
-    except Exception as e:
-        sources_status["economic_times"] = str(e)
+@tool("Scrape Economic Times News")
+def scrape_economic_times_news(symbol: str, limit: int = 10) -> str:
+    """
+    Scrape latest news for a stock from Economic Times.
 
-    # Fetch from Google News
-    try:
-        gn_result = json.loads(scrape_google_news.run(symbol, limit_per_source))
-        if "articles" in gn_result:
-            all_articles.extend(gn_result["articles"])
-            sources_status["google_news"] = "success"
+    Args:
+        symbol: Stock symbol (e.g., 'RELIANCE', 'TCS')
+        limit: Maximum number of news articles to fetch (default: 10)
+
+    Returns:
+        JSON string with list of news articles.
+    """
+    return _scrape("economic_times", symbol, limit)
+
+
+@tool("Scrape Google News")
+def scrape_google_news(symbol: str, limit: int = 10) -> str:
+    """
+    Fetch latest stock news from Google News RSS feed.
+    Searches for stock-specific news from Indian financial publications.
+
+    Args:
+        symbol: Stock symbol (e.g., 'RELIANCE', 'TCS')
+        limit: Maximum number of news articles to fetch (default: 10)
+
+    Returns:
+        JSON string with list of news articles.
+    """
+    return _scrape("google_news", symbol, limit)
+
+
+def _source_results(futures: dict, done: set, deadline: float) -> dict:
+    """Collect finished sources; those still running at the deadline become TimeoutErrors.
+
+    Works for both concurrent.futures futures and asyncio tasks.
+    """
+    results = {}
+    for source_key, future in futures.items():
+        if future not in done:
+            results[source_key] = TimeoutError(f"timed out after {deadline:g}s")
+        elif future.exception() is not None:
+            results[source_key] = future.exception()
         else:
-            sources_status["google_news"] = gn_result.get("error", "no articles")
-    except Exception as e:
-        sources_status["google_news"] = str(e)
+            results[source_key] = future.result()
+    return results
+
+
+def _aggregate_news(symbol: str, source_results: dict) -> dict:
+    """Merge per-source results (JSON strings or exceptions) into one ranked list."""
+    all_articles = []
+    sources_status = {}
+
+    for source_key, raw in source_results.items():
+        try:
+            if isinstance(raw, BaseException):
+                raise raw
+            result = json.loads(raw)
+            if "articles" in result:
+                all_articles.extend(result["articles"])
+                sources_status[source_key] = "success"
+            else:
+                sources_status[source_key] = result.get("error", "no articles")
+        except Exception as e:
+            sources_status[source_key] = str(e)
 
     # Remove duplicates based on title similarity
     unique_articles = []
@@ -485,13 +538,94 @@ def get_stock_news(symbol: str, limit_per_source: int = 5) -> str:
 
     unique_articles.sort(key=relevance_score)
 
-    return json.dumps({
+    return {
         "symbol": symbol,
         "total_articles": len(unique_articles),
         "sources_status": sources_status,
         "articles": unique_articles,
         "fetched_at": datetime.now().isoformat(),
-    }, indent=2)
+    }
+
+
+@tool("Get Comprehensive Stock News")
+def get_stock_news(symbol: str, limit_per_source: int = 5) -> str:
+    """
+    Get comprehensive news from multiple sources for a stock.
+    Aggregates news from Economic Times RSS, Economic Times, and Google News,
+    fetched in parallel. Sources that miss the deadline are reported in
+    sources_status and the articles from the others are returned.
+
+    Args:
+        symbol: Stock symbol (e.g., 'RELIANCE', 'TCS')
+        limit_per_source: Number of articles to fetch per source (default: 5)
+
+    Returns:
+        JSON string with aggregated news from all sources, sorted by relevance.
+    """
+    symbol = symbol.upper().strip()
+    source_tools = {
+        "et_rss": scrape_et_rss_news,
+        "economic_times": scrape_economic_times_news,
+        "google_news": scrape_google_news,
+    }
+
+    # Each call gets a thread per source, so the deadline never counts time
+    # spent waiting for a busy shared pool. A source that misses the deadline
+    # keeps its thread until its own request timeout, and still fills the
+    # cache for the next call. Sources run in a copy of the caller's context
+    # (see tools.cache.refreshing).
+    deadline = settings.news_deadline_seconds
+    executor = ThreadPoolExecutor(max_workers=len(source_tools), thread_name_prefix="news-source")
+    futures = {
+        source_key: executor.submit(contextvars.copy_context().run, source_tool.run, symbol, limit_per_source)
+        for source_key, source_tool in source_tools.items()
+    }
+    done, _ = wait(futures.values(), timeout=deadline)
+    executor.shutdown(wait=False)
+    source_results = _source_results(futures, done, deadline)
+
+    return json.dumps(_aggregate_news(symbol, source_results), indent=2)
+
+
+# ==========================================
+# Async counterparts (httpx.AsyncClient)
+# ==========================================
+
+async def scrape_et_rss_news_async(symbol: str, limit: int = 10, client: Optional[httpx.AsyncClient] = None) -> str:
+    """Async `scrape_et_rss_news`. `client` is accepted for symmetry with the
+    other sources; the shared feed is downloaded once through the news cache."""
+    return await _scrape_et_rss_async(symbol, limit)
+
+
+async def scrape_economic_times_news_async(symbol: str, limit: int = 10, client: Optional[httpx.AsyncClient] = None) -> str:
+    """Async `scrape_economic_times_news`."""
+    return await _scrape_async("economic_times", symbol, limit, client)
+
+
+async def scrape_google_news_async(symbol: str, limit: int = 10, client: Optional[httpx.AsyncClient] = None) -> str:
+    """Async `scrape_google_news`."""
+    return await _scrape_async("google_news", symbol, limit, client)
+
+
+async def get_stock_news_async(symbol: str, limit_per_source: int = 5) -> str:
+    """Async `get_stock_news`: all sources are fetched concurrently over one client.
+
+    Sources still running at the deadline are cancelled.
+    """
+    symbol = symbol.upper().strip()
+    deadline = settings.news_deadline_seconds
+
+    async with httpx.AsyncClient(headers=HEADERS, timeout=30.0, follow_redirects=True) as client:
+        tasks = {"et_rss": asyncio.ensure_future(_scrape_et_rss_async(symbol, limit_per_source))}
+        for key in _SOURCES:
+            tasks[key] = asyncio.ensure_future(_scrape_async(key, symbol, limit_per_source, client))
+
+        done, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+        for task in pending:
+            task.cancel()
+        source_results = _source_results(tasks, done, deadline)
+
+    return json.dumps(_aggregate_news(symbol, source_results), indent=2)
 
 
 @tool("Get Market News Headlines")
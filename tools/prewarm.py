@@ -0,0 +1,156 @@
+"""
+Cache Pre-warm
+Refreshes the tool caches for the NIFTY 50 before the market opens and at a
+fixed interval while it is open, so the first requests of the day (and the
+prefetch step of each analysis) are served from memory. Runs inside the bot
+on the PTB job queue, or standalone via `run_analysis.py --prewarm`.
+"""
+
+import contextvars
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from datetime import time as dtime
+from typing import Callable, Optional
+from zoneinfo import ZoneInfo
+
+from config import settings, NIFTY50_STOCKS
+from tools.analysis import calculate_technical_indicators
+from tools.cache import refreshing
+from tools.institutional import get_fii_dii_data
+from tools.market_data import get_index_data, get_stock_info, get_stock_price
+from tools.news_scraper import get_stock_news
+from tools.price_store import get_ohlcv_batch
+
+logger = logging.getLogger(__name__)
+
+# NSE regular session; the schedule is in IST whatever the host timezone
+IST = ZoneInfo("Asia/Kolkata")
+MARKET_OPEN = dtime(9, 15)
+MARKET_CLOSE = dtime(15, 30)
+
+# Tools refreshed per symbol and once per run
+SYMBOL_TOOLS = [get_stock_price, get_stock_info, calculate_technical_indicators]
+MARKET_TOOLS = [get_index_data, get_fii_dii_data]
+
+# Cache namespaces reloaded even when their entries are still fresh, so each
+# run renews them for a full TTL. Company profiles rarely change and are left
+# to expire on their own.
+REFRESH_NAMESPACES = ("ohlcv", "market_data", "analysis", "index", "institutional", "news")
+
+# History window downloaded in one batch; covers every tool's period
+HISTORY_PERIOD = "1y"
+
+
+def _failed(output: str) -> bool:
+    try:
+        data = json.loads(output)
+    except (TypeError, ValueError):
+        return True
+    return isinstance(data, dict) and "error" in data
+
+
+def prewarm(symbols: Optional[list[str]] = None, news: Optional[bool] = None) -> dict:
+    """Refresh cached prices, info, indicators, index data, FII/DII and news.
+
+    Entries are reloaded even if still fresh (see tools.cache.refreshing),
+    while other callers keep reading the current ones. Per-stock news runs on
+    its own `prewarm_news_workers` threads so it cannot crowd out live requests.
+
+    Args:
+        symbols: Stock symbols to warm (default: NIFTY 50)
+        news: Include per-stock news (default: settings.prewarm_news)
+
+    Returns:
+        Dict with 'symbols' and 'calls' (counts), 'failed' (tool calls that
+        returned an error, e.g. 'Get Stock Price(TCS)') and 'seconds'.
+    """
+    symbols = [s.upper().strip() for s in (symbols or NIFTY50_STOCKS)]
+    news = settings.prewarm_news if news is None else news
+    start = time.monotonic()
+
+    with refreshing(*REFRESH_NAMESPACES):
+        # One download seeds the price store for every per-symbol tool below
+        try:
+            get_ohlcv_batch([f"{s}.NS" for s in symbols], period=HISTORY_PERIOD)
+        except Exception as e:
+            logger.warning(f"Pre-warm history download failed: {e}")
+
+        calls = [(tool, (symbol,)) for symbol in symbols for tool in SYMBOL_TOOLS]
+        calls += [(tool, ()) for tool in MARKET_TOOLS]
+        news_calls = [(get_stock_news, (symbol,)) for symbol in symbols] if news else []
+
+        with ThreadPoolExecutor(max_workers=settings.tool_worker_threads, thread_name_prefix="prewarm") as pool, \
+             ThreadPoolExecutor(max_workers=settings.prewarm_news_workers, thread_name_prefix="prewarm-news") as news_pool:
+            futures = [pool.submit(contextvars.copy_context().run, tool.run, *args) for tool, args in calls]
+            futures += [news_pool.submit(contextvars.copy_context().run, tool.run, *args) for tool, args in news_calls]
+
+    failed = []
+    for (tool, args), future in zip(calls + news_calls, futures):
+        try:
+            output = future.result()
+        except Exception:
+            output = None
+        if _failed(output):
+            failed.append(f"{tool.name}({args[0]})" if args else tool.name)
+
+    return {
+        "symbols": len(symbols),
+        "calls": len(calls) + len(news_calls),
+        "failed": failed,
+        "seconds": round(time.monotonic() - start, 1),
+    }
+
+
+def prewarm_times(day: date) -> list[datetime]:
+    """Pre-warm times (IST) on `day`: the pre-open run, then every
+    `prewarm_interval_minutes` from market open to close. Empty on weekends."""
+    if day.weekday() >= 5:
+        return []
+    hour, minute = map(int, settings.prewarm_preopen_time.split(":"))
+    times = [datetime.combine(day, dtime(hour, minute), tzinfo=IST)]
+    interval = settings.prewarm_interval_minutes
+    if interval > 0:
+        slot = datetime.combine(day, MARKET_OPEN, tzinfo=IST)
+        close = datetime.combine(day, MARKET_CLOSE, tzinfo=IST)
+        while slot <= close:
+            if slot > times[0]:
+                times.append(slot)
+            slot += timedelta(minutes=interval)
+    return times
+
+
+def next_prewarm(now: Optional[datetime] = None) -> datetime:
+    """The first pre-warm time (IST) after `now` (an aware datetime; default: current time)."""
+    now = (now or datetime.now(IST)).astimezone(IST)
+    day = now.date()
+    while True:
+        for slot in prewarm_times(day):
+            if slot > now:
+                return slot
+        day += timedelta(days=1)
+
+
+def run_scheduler(
+    on_run: Optional[Callable[[dict], None]] = None,
+    stop: Optional[threading.Event] = None,
+) -> None:
+    """Pre-warm at every scheduled time until `stop` is set (blocking).
+
+    `on_run` receives each run's summary (see `prewarm`).
+    """
+    stop = stop or threading.Event()
+    while True:
+        delay = (next_prewarm() - datetime.now(IST)).total_seconds()
+        if stop.wait(max(delay, 0)):
+            return
+        try:
+            summary = prewarm()
+        except Exception as e:
+            logger.error(f"Pre-warm failed: {e}")
+            continue
+        if on_run:
+            on_run(summary)
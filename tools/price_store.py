@@ -0,0 +1,334 @@
+"""
+Shared OHLCV Store
+Downloads price history once per (symbol, interval) and serves period slices
+to every tool, so one analysis run makes a single history request per symbol.
+
+Daily bars are also persisted under data/cache/ohlcv as Parquet. After a restart
+the stored bars are reused and only bars newer than the last stored one are
+requested from Yahoo Finance.
+
+`get_ohlcv_batch` fills the store for many symbols with one `yf.download` call,
+so a board of 50 stocks costs one request instead of 50.
+"""
+
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+import yfinance as yf
+
+from config import settings
+from tools.cache import get_cache
+
+# Downloaded history as {"df", "period"}, keyed by (yahoo_symbol, interval)
+_store = get_cache("ohlcv")
+
+# Smallest window downloaded per interval. Daily callers ask for anything
+# between 2d and 1y, so fetching a year up front lets one download serve all.
+_MIN_WINDOW = {
+    "1d": "1y",
+}
+
+# Intervals persisted to disk. Yahoo only keeps a few weeks of intraday bars,
+# so caching those across restarts buys little.
+_DISK_INTERVALS = {"1d"}
+_disk_dir: Path = settings.cache_dir / "ohlcv"
+
+_PERIOD_RE = re.compile(r"^(\d+)(d|wk|mo|y)$")
+_PERIOD_DAYS = {"d": 1, "wk": 7, "mo": 31, "y": 366}
+
+
+def _period_days(period: str) -> float:
+    """Approximate calendar length of a yfinance period string."""
+    if period == "max":
+        return float("inf")
+    if period == "ytd":
+        return 366
+    match = _PERIOD_RE.match(period)
+    if not match:
+        raise ValueError(f"Unsupported period: {period}")
+    return int(match.group(1)) * _PERIOD_DAYS[match.group(2)]
+
+
+def _wider(a: str, b: str) -> str:
+    """Return whichever of two periods covers more history."""
+    return a if _period_days(a) >= _period_days(b) else b
+
+
+def _slice_period(df: pd.DataFrame, period: str) -> pd.DataFrame:
+    """Trim a history frame to the trailing window yfinance would return for `period`."""
+    if df.empty or period == "max":
+        return df.copy()
+    if period == "ytd":
+        # Bars since 1 January of the last bar's year
+        return df[df.index >= df.index[-1].normalize().replace(month=1, day=1)].copy()
+
+    match = _PERIOD_RE.match(period)
+    count, unit = int(match.group(1)), match.group(2)
+
+    if unit == "d":
+        # "Nd" means the last N trading sessions, for daily and intraday bars alike
+        sessions = df.index.normalize()
+        keep = sessions.unique()[-count:]
+        return df[sessions.isin(keep)].copy()
+
+    if unit == "wk":
+        offset = pd.DateOffset(weeks=count)
+    elif unit == "mo":
+        offset = pd.DateOffset(months=count)
+    else:
+        offset = pd.DateOffset(years=count)
+    return df[df.index >= df.index[-1] - offset].copy()
+
+
+# ==========================================
+# Disk persistence
+# ==========================================
+
+def _disk_enabled(interval: str) -> bool:
+    """Check whether bars for this interval should be persisted."""
+    if not settings.ohlcv_disk_cache or interval not in _DISK_INTERVALS:
+        return False
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _disk_path(yahoo_symbol: str, interval: str) -> Path:
+    """File holding the persisted bars for a symbol (e.g. '^NSEI' -> '_NSEI_1d.parquet')."""
+    safe_symbol = re.sub(r"[^A-Za-z0-9._-]", "_", yahoo_symbol)
+    return _disk_dir / f"{safe_symbol}_{interval}.parquet"
+
+
+def _load_disk(yahoo_symbol: str, interval: str) -> Optional[dict]:
+    """Load persisted bars as a store entry, or None if absent/unreadable."""
+    if not _disk_enabled(interval):
+        return None
+    path = _disk_path(yahoo_symbol, interval)
+    if not path.exists():
+        return None
+    try:
+        df = pd.read_parquet(path)
+    except Exception:
+        return None
+    period = df.attrs.get("period")
+    if df.empty or not period:
+        return None
+    return {"df": df, "period": period}
+
+
+def _save_disk(yahoo_symbol: str, interval: str, df: pd.DataFrame, period: str) -> None:
+    """Persist bars atomically. Failures are ignored; the disk cache is best-effort."""
+    if not _disk_enabled(interval):
+        return
+    path = _disk_path(yahoo_symbol, interval)
+    tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        out = df.copy()
+        out.attrs = {"period": period}
+        out.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _append_new_bars(yahoo_symbol: str, interval: str, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """Fetch bars from the last stored session onward and merge them in.
+
+    The last stored bar is re-requested because it may have been captured
+    mid-session. Returns None when the new bars carry a split or dividend,
+    since Yahoo's adjusted history before that date no longer matches ours.
+    """
+    last_session = df.index[-1].strftime("%Y-%m-%d")
+    new = yf.Ticker(yahoo_symbol).history(start=last_session, interval=interval)
+    return _merge_new_bars(df, new)
+
+
+def _merge_new_bars(df: pd.DataFrame, new: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """Merge freshly downloaded bars into stored ones (None if adjustments changed)."""
+    if new.empty:
+        return df
+
+    for column in ("Dividends", "Stock Splits"):
+        if column in new.columns and (new[column].fillna(0) != 0).any():
+            return None
+
+    combined = pd.concat([df, new])
+    combined = combined[~combined.index.duplicated(keep="last")].sort_index()
+    return combined
+
+
+def _refresh(yahoo_symbol: str, period: str, interval: str, max_age: Optional[float] = None) -> dict:
+    """Bring the stored entry up to date and wide enough for `period`.
+
+    Returns the entry as {"df", "period"}. Empty downloads are returned but
+    not stored.
+    """
+    key = (yahoo_symbol, interval)
+
+    # Another flight may have finished since our miss
+    entry = _store.peek(key, max_age)
+    if entry and _period_days(entry["period"]) >= _period_days(period):
+        return entry
+
+    if entry is None:
+        entry = _store.get_stale(key)
+    if entry is None:
+        entry = _load_disk(yahoo_symbol, interval)
+
+    df = None
+    fetch_period = _wider(period, _MIN_WINDOW.get(interval, period))
+
+    if entry and _period_days(entry["period"]) >= _period_days(fetch_period):
+        fetch_period = entry["period"]
+        df = _append_new_bars(yahoo_symbol, interval, entry["df"])
+
+    if df is None:
+        if entry:
+            fetch_period = _wider(fetch_period, entry["period"])
+        df = yf.Ticker(yahoo_symbol).history(period=fetch_period, interval=interval)
+
+    entry = {"df": df, "period": fetch_period}
+    if not df.empty:
+        _store.set(key, entry)
+        _save_disk(yahoo_symbol, interval, df, fetch_period)
+
+    return entry
+
+
+def _download_batch(yahoo_symbols: list[str], interval: str, **kwargs) -> dict[str, pd.DataFrame]:
+    """Download several symbols in one `yf.download` call and split per symbol.
+
+    Arguments mirror `Ticker.history` (adjusted prices, dividends and splits,
+    exchange-local timestamps) so the frames can be mixed with stored ones.
+    Symbols Yahoo returned nothing for are left out.
+    """
+    raw = yf.download(
+        yahoo_symbols,
+        interval=interval,
+        group_by="ticker",
+        auto_adjust=True,
+        actions=True,
+        ignore_tz=False,
+        threads=True,
+        progress=False,
+        **kwargs,
+    )
+    if raw is None or raw.empty:
+        return {}
+
+    frames = {}
+    for symbol in yahoo_symbols:
+        if isinstance(raw.columns, pd.MultiIndex):
+            if symbol not in raw.columns.get_level_values(0):
+                continue
+            df = raw[symbol]
+        else:
+            df = raw
+        df = df.dropna(how="all")
+        df.columns.name = None
+        if not df.empty:
+            frames[symbol] = df
+    return frames
+
+
+# ==========================================
+# Public API
+# ==========================================
+
+def get_ohlcv(
+    yahoo_symbol: str, period: str = "1y", interval: str = "1d", max_age: Optional[float] = None
+) -> pd.DataFrame:
+    """Get OHLCV history for a Yahoo Finance symbol, sliced to `period`.
+
+    The first call for a (symbol, interval) downloads the widest useful window;
+    later calls for the same or shorter periods are served from memory until the
+    entry expires (or is older than `max_age` seconds, for callers that need
+    fresher bars than the store TTL). Expired or restarted entries that still
+    cover the period are topped up with only the bars since the last stored
+    one. Concurrent misses for the same (symbol, interval) share one download.
+    Returns a copy the caller is free to modify. Download errors propagate to
+    the caller.
+    """
+    key = (yahoo_symbol, interval)
+
+    entry = _store.get(key, max_age)
+    if entry and _period_days(entry["period"]) >= _period_days(period):
+        return _slice_period(entry["df"], period)
+
+    entry = _store.single_flight(key, lambda: _refresh(yahoo_symbol, period, interval, max_age))
+    if _period_days(entry["period"]) < _period_days(period):
+        # We waited on a narrower download than we need; widen it ourselves
+        entry = _store.single_flight(key, lambda: _refresh(yahoo_symbol, period, interval, max_age))
+
+    return _slice_period(entry["df"], period)
+
+
+def get_ohlcv_batch(
+    yahoo_symbols: list[str],
+    period: str = "1y",
+    interval: str = "1d",
+    max_age: Optional[float] = None,
+) -> dict[str, pd.DataFrame]:
+    """Get OHLCV history for many symbols, downloading all misses together.
+
+    Symbols already fresh in the store (see `get_ohlcv` for `max_age`) are
+    served from memory. Stale or restarted entries are topped up with one
+    batched request from the oldest last bar among them; the rest share one
+    full download. Every symbol is stored as if fetched by `get_ohlcv`.
+    Symbols with no data map to an empty frame. Download errors propagate to
+    the caller.
+    """
+    symbols = list(dict.fromkeys(yahoo_symbols))
+    fetch_period = _wider(period, _MIN_WINDOW.get(interval, period))
+    entries: dict[str, dict] = {}
+    top_up: dict[str, dict] = {}
+    full: list[str] = []
+
+    for symbol in symbols:
+        key = (symbol, interval)
+        entry = _store.get(key, max_age)
+        if entry and _period_days(entry["period"]) >= _period_days(period):
+            entries[symbol] = entry
+            continue
+        if entry is None:
+            entry = _store.get_stale(key) or _load_disk(symbol, interval)
+        if entry and _period_days(entry["period"]) >= _period_days(fetch_period):
+            top_up[symbol] = entry
+        else:
+            full.append(symbol)
+
+    def store(symbol: str, df: pd.DataFrame, entry_period: str) -> None:
+        entries[symbol] = {"df": df, "period": entry_period}
+        _store.set((symbol, interval), entries[symbol])
+        _save_disk(symbol, interval, df, entry_period)
+
+    if top_up:
+        start = min(entry["df"].index[-1] for entry in top_up.values()).strftime("%Y-%m-%d")
+        new_frames = _download_batch(list(top_up), interval, start=start)
+        for symbol, entry in top_up.items():
+            merged = _merge_new_bars(entry["df"], new_frames.get(symbol, pd.DataFrame()))
+            if merged is None:
+                full.append(symbol)
+            else:
+                store(symbol, merged, entry["period"])
+
+    if full:
+        for symbol, df in _download_batch(full, interval, period=fetch_period).items():
+            store(symbol, df, fetch_period)
+
+    return {
+        symbol: _slice_period(entries[symbol]["df"], period) if symbol in entries else pd.DataFrame()
+        for symbol in symbols
+    }
+
+
+def clear_ohlcv_store() -> None:
+    """Drop all history held in memory. Persisted bars are left on disk."""
+    _store.clear()
@@ -0,0 +1,132 @@
+"""
+Technical Screener
+Evaluates the technical signal rules across NIFTY 50, a sector or a custom
+list in one vectorized pass over batched price data, and ranks the matches.
+"""
+
+import json
+from datetime import datetime
+from typing import Optional
+
+import pandas as pd
+from crewai.tools import tool
+
+from tools.indicators import SIGNAL_RULES, get_indicator_table, overall_signal, signal_flags, signals_from_flags
+from tools.market_data import resolve_universe
+
+# Bars needed before a symbol is screened (same floor as calculate_technical_indicators)
+MIN_BARS = 50
+
+_STRENGTH_SCORE = {"Strong": 2, "Moderate": 1}
+
+
+def _round(value, digits: int = 2) -> Optional[float]:
+    return None if pd.isna(value) else round(float(value), digits)
+
+
+def parse_criteria(criteria: str) -> list[str]:
+    """Split a comma/space separated list of SIGNAL_RULES names.
+
+    Raises:
+        ValueError: If a name is not a known rule.
+    """
+    names = [c.strip().lower() for c in criteria.replace(",", " ").split() if c.strip()]
+    unknown = [c for c in names if c not in SIGNAL_RULES]
+    if unknown:
+        raise ValueError(f"Unknown criteria: {', '.join(unknown)}. Valid: {', '.join(SIGNAL_RULES)}")
+    return names
+
+
+def screen(universe: str = "NIFTY50", criteria: Optional[list[str]] = None,
+           period: str = "6mo", limit: Optional[int] = None) -> dict:
+    """Screen a universe for technical signals.
+
+    Args:
+        universe: 'NIFTY50', a SECTORS key, or comma-separated symbols.
+        criteria: SIGNAL_RULES names a symbol must all match. When empty,
+            any symbol with at least one signal matches.
+        period: Price history used for the indicators.
+        limit: Maximum number of matches returned (all when None).
+
+    Returns:
+        Dict with the ranked matches. Matches are ordered by signal score
+        (Strong = 2, Moderate = 1), then by volume ratio.
+
+    Raises:
+        ValueError: If the universe has no symbols.
+    """
+    criteria = criteria or []
+    universe_name, symbols = resolve_universe(universe)
+    if not symbols:
+        raise ValueError("No symbols given")
+
+    table = get_indicator_table(symbols, period=period)
+    table = table[table["bars"] >= MIN_BARS]
+    flags = signal_flags(table)
+
+    if criteria:
+        selected = flags[criteria].all(axis=1)
+    else:
+        selected = flags.any(axis=1)
+
+    matches = []
+    for symbol in table.index[selected.to_numpy()]:
+        row = table.loc[symbol]
+        signals = signals_from_flags(flags.loc[symbol])
+        overall, _, _ = overall_signal(signals)
+        matches.append({
+            "symbol": symbol,
+            "price": _round(row["price"]),
+            "rsi_14": _round(row["rsi_14"]),
+            "volume_ratio": _round(row["volume_ratio"]),
+            "overall_signal": overall,
+            "score": sum(_STRENGTH_SCORE[s["strength"]] for s in signals),
+            "rules": [rule for rule in SIGNAL_RULES if flags.at[symbol, rule]],
+            "signals": signals,
+        })
+
+    matches.sort(key=lambda m: (m["score"], m["volume_ratio"] or 0), reverse=True)
+
+    return {
+        "universe": universe_name,
+        "criteria": criteria or "any signal",
+        "scanned": len(table),
+        "matches_count": len(matches),
+        "matches": matches[:limit] if limit else matches,
+        "missing": [s.upper() for s in symbols if s.upper() not in table.index],
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
+@tool("Screen Stocks")
+def screen_stocks(universe: str = "NIFTY50", criteria: str = "", limit: int = 10) -> str:
+    """
+    Scan many Indian stocks for technical signals and return the ranked matches.
+    Uses the same rules as Calculate Technical Indicators: RSI bands, MACD
+    crossovers, Bollinger Band touches, volume spikes (over 2x average) and
+    moving-average stacking.
+
+    Args:
+        universe: 'NIFTY50', a sector name ('IT', 'BANKING', 'PHARMA', ...),
+            or comma-separated stock symbols (e.g., 'TCS,INFY,WIPRO')
+        criteria: Optional comma-separated rules that must all match, from:
+            rsi_oversold, rsi_overbought, rsi_near_oversold, rsi_near_overbought,
+            macd_bullish_cross, macd_bearish_cross, bb_lower_touch, bb_upper_touch,
+            volume_spike, ma_uptrend, ma_downtrend. Empty means any signal.
+        limit: Maximum number of matches to return (default: 10)
+
+    Returns:
+        JSON string with matches ranked by signal strength.
+    """
+    try:
+        result = screen(universe, parse_criteria(criteria), limit=limit)
+        return json.dumps(result, indent=2)
+    except ValueError as e:
+        return json.dumps({"error": str(e)})
+    except Exception as e:
+        return json.dumps({
+            "error": str(e),
+            "universe": universe,
+            "DATA_UNAVAILABLE": True,
+            "message": f"FAILED to screen {universe}. Do NOT guess which stocks match.",
+        })